@@ -0,0 +1,114 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Micro-benchmark for computing the query cache keys of all the charts of dashboards,
+as done when loading them from a warm cache.
+
+Each dashboard is loaded in a single request, keys being computed chart after chart,
+which is timed along with the canonical hashing of the keys, compared to hashing
+them with `md5_sha_from_dict`.
+
+Usage: python scripts/benchmark_cache_key.py --dashboard-id 1 --repeat 10
+"""
+import time
+from typing import Any, Dict, List, Tuple
+
+import click
+from flask import current_app, g
+
+from superset import db, security_manager
+from superset.common.query_context import QueryContext
+from superset.models.dashboard import Dashboard
+from superset.utils.core import json_int_dttm_ser
+from superset.utils.hashing import canonical_md5_sha_from_dict, md5_sha_from_dict
+
+
+def get_query_contexts(dashboard: Dashboard) -> List[QueryContext]:
+    query_contexts = []
+    for chart in dashboard.slices:
+        query_context = chart.get_query_context()
+        if query_context:
+            query_contexts.append(query_context)
+    return query_contexts
+
+
+def compute_keys(query_contexts: List[QueryContext]) -> float:
+    start = time.perf_counter()
+    for query_context in query_contexts:
+        for query_obj in query_context.queries:
+            query_context.query_cache_key(query_obj)
+    return time.perf_counter() - start
+
+
+def compute_hashes(cache_dicts: List[Dict[str, Any]]) -> Tuple[float, float]:
+    start = time.perf_counter()
+    for cache_dict in cache_dicts:
+        md5_sha_from_dict(cache_dict, default=json_int_dttm_ser, ignore_nan=True)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for cache_dict in cache_dicts:
+        canonical_md5_sha_from_dict(cache_dict, default=json_int_dttm_ser)
+    return legacy, time.perf_counter() - start
+
+
+@click.command()
+@click.option(
+    "--dashboard-id",
+    "dashboard_ids",
+    multiple=True,
+    type=int,
+    help="Dashboards to benchmark (default: all).",
+)
+@click.option("--repeat", default=10, help="Number of runs per dashboard.")
+@click.option("--username", default="admin", help="User computing the keys.")
+def main(dashboard_ids: Tuple[int, ...], repeat: int, username: str) -> None:
+    query = db.session.query(Dashboard)
+    if dashboard_ids:
+        query = query.filter(Dashboard.id.in_(dashboard_ids))
+
+    print(f"Computing the cache keys of dashboards, best of {repeat} runs\n")
+    for dashboard in query.all():
+        durations: List[float] = []
+        for _ in range(repeat):
+            # a new request, and therefore nothing memoized, for each run
+            with current_app.test_request_context():
+                g.user = security_manager.find_user(username=username)
+                query_contexts = get_query_contexts(dashboard)
+                durations.append(compute_keys(query_contexts))
+
+        cache_dicts = [
+            query_obj.to_dict()
+            for query_context in query_contexts
+            for query_obj in query_context.queries
+        ]
+        legacy, canonical = compute_hashes(cache_dicts * repeat)
+        print(
+            f"{dashboard.dashboard_title}: {min(durations) * 1000:.2f} ms "
+            f"({len(query_contexts)} charts, {len(cache_dicts)} query objects), "
+            f"hashing {legacy * 1000 / repeat:.2f} ms -> "
+            f"{canonical * 1000 / repeat:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    from superset.app import create_app
+
+    app = create_app()
+    with app.app_context():
+        # pylint: disable=no-value-for-parameter
+        main()
@@ -0,0 +1,94 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark of the CSV injection escaping of `df_to_escaped_csv`, comparing the
+column-wise escaping to the former cell after cell one.
+
+Usage: python scripts/benchmark_csv_escape.py --rows 100000 --columns 50 --repeat 3
+"""
+import time
+from typing import Any, Callable, List
+
+import click
+import numpy as np
+import pandas as pd
+
+from superset.utils.csv import df_to_escaped_csv, escape_value
+
+
+def df_to_escaped_csv_per_cell(df: pd.DataFrame, **kwargs: Any) -> Any:
+    """Former implementation, escaping each cell with `escape_value`"""
+    escape_values = lambda v: escape_value(v) if isinstance(v, str) else v
+    df = df.rename(columns=escape_values)
+    df = df.applymap(escape_values)
+    return df.to_csv(**kwargs)
+
+
+def build_df(rows: int, columns: int) -> pd.DataFrame:
+    """
+    A frame with string, numeric and temporal columns, some strings of which need
+    escaping
+    """
+    strings = np.array(["name", "=SUM(A1)", "-1.5", "@cmd|calc", "plain text"])
+    data = {}
+    for idx in range(columns):
+        kind = idx % 3
+        if kind == 0:
+            data[f"str_{idx}"] = strings[np.arange(rows) % len(strings)]
+        elif kind == 1:
+            data[f"num_{idx}"] = np.arange(rows) * 0.5
+        else:
+            data[f"ts_{idx}"] = pd.date_range("2021-01-01", periods=rows, freq="s")
+    df = pd.DataFrame(data)
+    for column in df.columns:
+        if column.startswith("str_"):
+            df[column] = df[column].astype(object)
+    return df
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    durations: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+@click.command()
+@click.option("--rows", default=100000, help="Number of rows of the frame.")
+@click.option("--columns", default=50, help="Number of columns of the frame.")
+@click.option("--repeat", default=3, help="Number of runs per implementation.")
+def main(rows: int, columns: int, repeat: int) -> None:
+    df = build_df(rows, columns)
+    print(f"Escaping a {rows} x {columns} frame to CSV, best of {repeat} runs\n")
+
+    assert df_to_escaped_csv(df, index=False) == df_to_escaped_csv_per_cell(
+        df, index=False
+    ), "Both implementations should export the same CSV"
+
+    to_csv = best_of(lambda: df.to_csv(index=False), repeat)
+    per_cell = best_of(lambda: df_to_escaped_csv_per_cell(df, index=False), repeat)
+    column_wise = best_of(lambda: df_to_escaped_csv(df, index=False), repeat)
+    print(f"to_csv without escaping: {to_csv:.3f} s")
+    print(f"escaping per cell: {per_cell:.3f} s (+{per_cell - to_csv:.3f} s)")
+    print(f"escaping column-wise: {column_wise:.3f} s (+{column_wise - to_csv:.3f} s)")
+
+
+if __name__ == "__main__":
+    # pylint: disable=no-value-for-parameter
+    main()
@@ -0,0 +1,129 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Micro-benchmark for building a `SupersetResultSet` out of DB-API rows.
+
+Usage: python scripts/benchmark_result_set.py --rows 100000 --repeat 3
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+import click
+
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.result_set import SupersetResultSet
+from superset.typing import DbapiDescription
+
+Rows = List[Tuple[Any, ...]]
+
+
+def narrow(rows: int) -> Tuple[Rows, DbapiDescription]:
+    data = [(i, f"name_{i % 100}", i * 0.5) for i in range(rows)]
+    description = [
+        ("id", "INTEGER", None, None, None, None, True),
+        ("name", "VARCHAR", None, None, None, None, True),
+        ("value", "DOUBLE", None, None, None, None, True),
+    ]
+    return data, description
+
+
+def wide(rows: int, columns: int = 200) -> Tuple[Rows, DbapiDescription]:
+    rows = max(rows // 20, 1)
+    data = [
+        tuple(i * j if j % 2 else f"{i}_{j}" for j in range(columns))
+        for i in range(rows)
+    ]
+    description = [
+        (f"col_{j}", "INTEGER" if j % 2 else "VARCHAR", None, None, None, None, True)
+        for j in range(columns)
+    ]
+    return data, description
+
+
+def nested(rows: int) -> Tuple[Rows, DbapiDescription]:
+    data = [
+        (i, [i, i + 1, i + 2], {"key": f"value_{i}", "nested": {"id": i}})
+        for i in range(rows)
+    ]
+    description = [
+        ("id", "INTEGER", None, None, None, None, True),
+        ("array_col", "ARRAY", None, None, None, None, True),
+        ("map_col", "MAP", None, None, None, None, True),
+    ]
+    return data, description
+
+
+def timestamps(rows: int) -> Tuple[Rows, DbapiDescription]:
+    start = datetime(2021, 1, 1)
+    start_tz = datetime(2021, 1, 1, tzinfo=timezone(timedelta(hours=2)))
+    data = [
+        (
+            start + timedelta(minutes=i),
+            start_tz + timedelta(minutes=i),
+            (start + timedelta(days=i % 365)).date(),
+        )
+        for i in range(rows)
+    ]
+    description = [
+        ("ts", "TIMESTAMP", None, None, None, None, True),
+        ("ts_tz", "TIMESTAMP WITH TIME ZONE", None, None, None, None, True),
+        ("ds", "DATE", None, None, None, None, True),
+    ]
+    return data, description
+
+
+CASES: Dict[str, Callable[[int], Tuple[Rows, DbapiDescription]]] = {
+    "narrow": narrow,
+    "wide": wide,
+    "nested": nested,
+    "timestamps": timestamps,
+}
+
+
+@click.command()
+@click.option("--rows", default=100000, help="Number of rows per result set.")
+@click.option("--repeat", default=3, help="Number of runs per result set.")
+@click.option(
+    "--case",
+    "cases",
+    multiple=True,
+    type=click.Choice(list(CASES)),
+    help="Result sets to benchmark (default: all).",
+)
+def main(rows: int, repeat: int, cases: Tuple[str, ...]) -> None:
+    print(f"Building result sets of {rows} rows, best of {repeat} runs\n")
+    for name in cases or CASES:
+        data, description = CASES[name](rows)
+        durations: List[float] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result_set = SupersetResultSet(data, description, BaseEngineSpec)
+            durations.append(time.perf_counter() - start)
+        print(
+            f"{name}: {min(durations):.3f} s "
+            f"({result_set.size} rows x {len(result_set.columns)} columns)"
+        )
+
+
+if __name__ == "__main__":
+    from superset.app import create_app
+
+    app = create_app()
+    with app.app_context():
+        # pylint: disable=no-value-for-parameter
+        main()
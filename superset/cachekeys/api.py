@@ -28,6 +28,7 @@ from superset.cachekeys.schemas import CacheInvalidationRequestSchema
 from superset.connectors.connector_registry import ConnectorRegistry
 from superset.extensions import cache_manager, db, event_logger
 from superset.models.cache import CacheKey
+from superset.utils.local_cache import local_data_cache
 from superset.views.base_api import BaseSupersetModelRestApi, statsd_metrics
 
 logger = logging.getLogger(__name__)
@@ -93,6 +94,9 @@ class CacheRestApi(BaseSupersetModelRestApi):
             if ds_obj:
                 datasource_uids.add(ds_obj.uid)
 
+        for datasource_uid in datasource_uids:
+            local_data_cache.delete_tag(datasource_uid)
+
         cache_key_objs = (
             db.session.query(CacheKey)
             .filter(CacheKey.datasource_uid.in_(datasource_uids))
@@ -31,7 +31,6 @@ from superset.charts.dao import ChartDAO
 from superset.commands.base import BaseCommand
 from superset.dao.exceptions import DAODeleteFailedError
 from superset.exceptions import SupersetSecurityException
-from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.reports.dao import ReportScheduleDAO
 from superset.views.base import check_ownership
@@ -48,7 +47,6 @@ class DeleteChartCommand(BaseCommand):
     def run(self) -> Model:
         self.validate()
         try:
-            Dashboard.clear_cache_for_slice(slice_id=self._model_id)
             chart = ChartDAO.delete(self._model)
         except DAODeleteFailedError as ex:
             logger.exception(ex.exception)
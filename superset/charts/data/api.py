@@ -18,10 +18,17 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
 import simplejson
-from flask import current_app, g, make_response, request, Response
+from flask import (
+    current_app,
+    g,
+    make_response,
+    request,
+    Response,
+    stream_with_context,
+)
 from flask_appbuilder.api import expose, protect
 from flask_babel import gettext as _
 from marshmallow import ValidationError
@@ -38,14 +45,24 @@ from superset.charts.data.commands.create_async_job_command import (
 from superset.charts.data.commands.get_data_command import ChartDataCommand
 from superset.charts.data.query_context_cache_loader import QueryContextCacheLoader
 from superset.charts.post_processing import apply_post_process
-from superset.charts.schemas import ChartDataQueryContextSchema
+from superset.charts.schemas import (
+    ChartDataBatchRequestSchema,
+    ChartDataQueryContextSchema,
+)
 from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
+from superset.common.utils.query_cache_manager import QueryCacheManager
 from superset.connectors.base.models import BaseDatasource
-from superset.exceptions import QueryObjectValidationError
+from superset.constants import CacheRegion
+from superset.exceptions import (
+    QueryObjectValidationError,
+    SupersetSecurityException,
+)
 from superset.extensions import event_logger
 from superset.utils.async_query_manager import AsyncQueryTokenException
+from superset.utils.concurrency import iter_concurrently
 from superset.utils.core import create_zip, json_int_dttm_ser
-from superset.views.base import CsvResponse, generate_download_headers
+from superset.utils.export import export_df
+from superset.views.base import generate_download_headers, stream_export_response
 from superset.views.base_api import statsd_metrics
 
 if TYPE_CHECKING:
@@ -55,7 +72,7 @@ logger = logging.getLogger(__name__)
 
 
 class ChartDataRestApi(ChartRestApi):
-    include_route_methods = {"get_data", "data", "data_from_cache"}
+    include_route_methods = {"get_data", "data", "data_from_cache", "data_batch"}
 
     @expose("/<int:pk>/data/", methods=["GET"])
     @protect()
@@ -299,6 +316,222 @@ class ChartDataRestApi(ChartRestApi):
 
         return self._get_data_response(command, True)
 
+    @expose("/data/batch", methods=["POST"])
+    @protect()
+    @statsd_metrics
+    @event_logger.log_this_with_context(
+        action=lambda self, *args, **kwargs: f"{self.__class__.__name__}"
+        f".data_batch",
+        log_to_statsd=False,
+    )
+    def data_batch(self) -> Response:
+        """
+        Takes the query contexts of many charts, typically those of a dashboard, and
+        streams their payload data responses as newline-delimited JSON.
+        ---
+        post:
+          description: >-
+            Takes the query contexts of many charts and streams their payload data
+            responses as newline-delimited JSON, one line per query context in the
+            order their results are available. Cached results are returned first,
+            the queries of the other charts run concurrently.
+          requestBody:
+            description: >-
+              The query contexts of the charts, as accepted by `/api/v1/chart/data`.
+            required: true
+            content:
+              application/json:
+                schema:
+                  $ref: "#/components/schemas/ChartDataBatchRequestSchema"
+          responses:
+            200:
+              description: One result per line
+              content:
+                application/x-ndjson:
+                  schema:
+                    $ref: "#/components/schemas/ChartDataBatchResponseSchema"
+            400:
+              $ref: '#/components/responses/400'
+            401:
+              $ref: '#/components/responses/401'
+            500:
+              $ref: '#/components/responses/500'
+        """
+        if not request.is_json:
+            return self.response_400(message=_("Request is not JSON"))
+        try:
+            json_body = ChartDataBatchRequestSchema().load(request.json)
+        except ValidationError as error:
+            return self.response_400(
+                message=_(
+                    "Request is incorrect: %(error)s", error=error.normalized_messages()
+                )
+            )
+
+        form_datas = json_body["query_contexts"]
+        max_query_contexts = current_app.config["CHART_DATA_BATCH_MAX_QUERY_CONTEXTS"]
+        if len(form_datas) > max_query_contexts:
+            return self.response_400(
+                message=_(
+                    "At most %(max)s query contexts can be requested at once",
+                    max=max_query_contexts,
+                )
+            )
+
+        lines: List[Dict[str, Any]] = []
+        commands: List[Tuple[int, ChartDataCommand, Dict[str, Any]]] = []
+        access_errors: Dict[str, Optional[SupersetSecurityException]] = {}
+        for index, form_data in enumerate(form_datas):
+            try:
+                command = self._create_batch_command(form_data, access_errors)
+            except QueryObjectValidationError as error:
+                lines.append({"index": index, "status": 400, "message": error.message})
+            except ValidationError as error:
+                lines.append(
+                    {
+                        "index": index,
+                        "status": 400,
+                        "message": _(
+                            "Request is incorrect: %(error)s",
+                            error=error.normalized_messages(),
+                        ),
+                    }
+                )
+            except SupersetSecurityException as ex:
+                lines.append({"index": index, "status": 403, "message": ex.message})
+            else:
+                commands.append((index, command, form_data))
+
+        # one call to the cache backend for the results of all the charts
+        QueryCacheManager.get_cache_values(
+            [
+                cache_key
+                for _, command, _ in commands
+                if not command.query_context.force
+                for cache_key in command.query_context.get_cache_keys()
+            ],
+            region=CacheRegion.DATA,
+        )
+
+        misses: List[Tuple[int, ChartDataCommand, Dict[str, Any]]] = []
+        for index, command, form_data in commands:
+            try:
+                lines.append(self._run_batch_command(index, command, form_data, True))
+            except ChartDataCacheLoadError:
+                misses.append((index, command, form_data))
+
+        if misses and is_feature_enabled("GLOBAL_ASYNC_QUERIES"):
+            lines.extend(self._run_batch_async(misses))
+            misses = [
+                (index, command, form_data)
+                for index, command, form_data in misses
+                if command.query_context.result_type != ChartDataResultType.FULL
+            ]
+
+        def run(miss: Tuple[int, ChartDataCommand, Dict[str, Any]]) -> Dict[str, Any]:
+            # the datasource is loaded again in the session of the thread running the
+            # command, as the objects of the session of the request can't be shared
+            # across threads. The queries of the command take their database slots.
+            index, form_data = miss[0], miss[2]
+            command = self._create_batch_command(form_data, access_errors)
+            return self._run_batch_command(index, command, form_data)
+
+        def stream() -> Iterator[str]:
+            for line in lines:
+                yield self._serialize_batch_line(line)
+            for position, line, error in iter_concurrently(run, misses):
+                if error is not None:
+                    logger.exception(error)
+                    line = {
+                        "index": misses[position][0],
+                        "status": 500,
+                        "message": str(error),
+                    }
+                yield self._serialize_batch_line(line)  # type: ignore
+
+        return Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+
+    def _create_batch_command(
+        self,
+        form_data: Dict[str, Any],
+        access_errors: Dict[str, Optional[SupersetSecurityException]],
+    ) -> ChartDataCommand:
+        """
+        Create the command of a query context of a batch request and validate it,
+        checking the access to each datasource only once per request.
+        """
+        query_context = self._create_query_context_from_form(form_data)
+        if query_context.result_format != ChartDataResultFormat.JSON:
+            raise QueryObjectValidationError(
+                _(
+                    "Unsupported result_format: %(result_format)s",
+                    result_format=query_context.result_format,
+                )
+            )
+        for query in query_context.queries:
+            query.validate()
+
+        datasource = query_context.datasource
+        if datasource.uid not in access_errors:
+            try:
+                security_manager.raise_for_access(datasource=datasource)
+                access_errors[datasource.uid] = None
+            except SupersetSecurityException as ex:
+                access_errors[datasource.uid] = ex
+        error = access_errors[datasource.uid]
+        if error is not None:
+            raise error
+        return ChartDataCommand(query_context)
+
+    @staticmethod
+    def _run_batch_command(
+        index: int,
+        command: ChartDataCommand,
+        form_data: Dict[str, Any],
+        force_cached: bool = False,
+    ) -> Dict[str, Any]:
+        try:
+            result = command.run(force_cached=force_cached)
+        except ChartDataQueryFailedError as exc:
+            return {"index": index, "status": 400, "message": exc.message}
+
+        if result["query_context"].result_type == ChartDataResultType.POST_PROCESSED:
+            result = apply_post_process(
+                result, form_data.get("form_data"), command.query_context.datasource
+            )
+        return {"index": index, "status": 200, "result": result["queries"]}
+
+    @staticmethod
+    def _run_batch_async(
+        misses: List[Tuple[int, ChartDataCommand, Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Kick off background jobs for the query contexts of a batch request that
+        would also run asynchronously on their own.
+        """
+        async_command = CreateAsyncChartDataJobCommand()
+        try:
+            async_command.validate(request)
+        except AsyncQueryTokenException:
+            token_error = True
+        else:
+            token_error = False
+
+        lines: List[Dict[str, Any]] = []
+        for index, command, form_data in misses:
+            if command.query_context.result_type != ChartDataResultType.FULL:
+                continue
+            if token_error:
+                lines.append({"index": index, "status": 401, "message": "Unauthorized"})
+            else:
+                job = async_command.run(form_data, g.user.get_id())
+                lines.append({"index": index, "status": 202, "job": job})
+        return lines
+
+    @staticmethod
+    def _serialize_batch_line(line: Dict[str, Any]) -> str:
+        return simplejson.dumps(line, default=json_int_dttm_ser, ignore_nan=True) + "\n"
+
     def _run_async(
         self, form_data: Dict[str, Any], command: ChartDataCommand
     ) -> Response:
@@ -345,23 +578,27 @@ class ChartDataRestApi(ChartRestApi):
         if result_type == ChartDataResultType.POST_PROCESSED:
             result = apply_post_process(result, form_data, datasource)
 
-        if result_format == ChartDataResultFormat.CSV:
-            # Verify user has permission to export CSV file
+        if result_format in ChartDataResultFormat.table_like():
+            # Verify user has permission to export file
             if not security_manager.can_access("can_csv", "Superset"):
                 return self.response_403()
 
             if not result["queries"]:
                 return self.response_400(_("Empty query result"))
 
+            export_format = result_format.value
             if len(result["queries"]) == 1:
-                # return single query results csv format
+                # stream single query results chunk after chunk
                 data = result["queries"][0]["data"]
-                return CsvResponse(data, headers=generate_download_headers("csv"))
+                return stream_export_response(
+                    export_df(data, export_format), export_format
+                )
 
-            # return multi-query csv results bundled as a zip file
-            encoding = current_app.config["CSV_EXPORT"].get("encoding", "utf-8")
+            # return multi-query results bundled as a zip file
             files = {
-                f"query_{idx + 1}.csv": result["data"].encode(encoding)
+                f"query_{idx + 1}.{export_format}": b"".join(
+                    export_df(result["data"], export_format)
+                )
                 for idx, result in enumerate(result["queries"])
             }
             return Response(
@@ -371,11 +608,14 @@ class ChartDataRestApi(ChartRestApi):
             )
 
         if result_format == ChartDataResultFormat.JSON:
-            response_data = simplejson.dumps(
-                {"result": result["queries"]},
-                default=json_int_dttm_ser,
-                ignore_nan=True,
-            )
+            with self.stats_logger.timer(
+                "chart_data.json_encode", result["query_context"].get_stats_tags()
+            ):
+                response_data = simplejson.dumps(
+                    {"result": result["queries"]},
+                    default=json_int_dttm_ser,
+                    ignore_nan=True,
+                )
             resp = make_response(response_data, 200)
             resp.headers["Content-Type"] = "application/json; charset=utf-8"
             return resp
@@ -26,7 +26,6 @@ In order to do that, we reproduce the post-processing in Python
 for these chart types.
 """
 
-from io import StringIO
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 import pandas as pd
@@ -326,8 +325,8 @@ def apply_post_process(
     for query in result["queries"]:
         if query["result_format"] == ChartDataResultFormat.JSON:
             df = pd.DataFrame.from_dict(query["data"])
-        elif query["result_format"] == ChartDataResultFormat.CSV:
-            df = pd.read_csv(StringIO(query["data"]))
+        elif query["result_format"] in ChartDataResultFormat.table_like():
+            df = query["data"]
         else:
             raise Exception(f"Result format {query['result_format']} not supported")
 
@@ -356,10 +355,7 @@ def apply_post_process(
 
         if query["result_format"] == ChartDataResultFormat.JSON:
             query["data"] = processed_df.to_dict()
-        elif query["result_format"] == ChartDataResultFormat.CSV:
-            buf = StringIO()
-            processed_df.to_csv(buf)
-            buf.seek(0)
-            query["data"] = buf.getvalue()
+        elif query["result_format"] in ChartDataResultFormat.table_like():
+            query["data"] = processed_df
 
     return result
@@ -1278,6 +1278,34 @@ class ChartDataAsyncResponseSchema(Schema):
     )
 
 
+class ChartDataBatchRequestSchema(Schema):
+    query_contexts = fields.List(
+        fields.Dict(),
+        description="The query contexts of the charts, each following the "
+        "`ChartDataQueryContextSchema`",
+        required=True,
+    )
+
+
+class ChartDataBatchResponseSchema(Schema):
+    index = fields.Integer(
+        description="Position of the query context in the request", required=True,
+    )
+    status = fields.Integer(
+        description="HTTP status code of the result of the query context",
+        required=True,
+    )
+    message = fields.String(description="Error message, if the query context failed")
+    result = fields.List(
+        fields.Nested(ChartDataResponseResult),
+        description="A list of results for each query of the query context",
+    )
+    job = fields.Nested(
+        ChartDataAsyncResponseSchema,
+        description="Async job details, if the results are loaded asynchronously",
+    )
+
+
 class ChartFavStarResponseResult(Schema):
     id = fields.Integer(description="The Chart id")
     value = fields.Boolean(description="The FaveStar value")
@@ -1305,6 +1333,8 @@ CHART_SCHEMAS = (
     ChartDataQueryContextSchema,
     ChartDataResponseSchema,
     ChartDataAsyncResponseSchema,
+    ChartDataBatchRequestSchema,
+    ChartDataBatchResponseSchema,
     # TODO: These should optimally be included in the QueryContext schema as an `anyOf`
     #  in ChartDataPostPricessingOperation.options, but since `anyOf` is not
     #  by Marshmallow<3, this is not currently possible.
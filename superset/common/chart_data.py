@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 from enum import Enum
+from typing import Set
 
 
 class ChartDataResultFormat(str, Enum):
@@ -24,6 +25,13 @@ class ChartDataResultFormat(str, Enum):
 
     CSV = "csv"
     JSON = "json"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+    @classmethod
+    def table_like(cls) -> Set["ChartDataResultFormat"]:
+        """Formats of the results exported as files"""
+        return {cls.CSV, cls.PARQUET, cls.ARROW}
 
 
 class ChartDataResultType(str, Enum):
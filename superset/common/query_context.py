@@ -81,7 +81,7 @@ class QueryContext:
         self.cache_values = cache_values
         self._processor = QueryContextProcessor(self)
 
-    def get_data(self, df: pd.DataFrame,) -> Union[str, List[Dict[str, Any]]]:
+    def get_data(self, df: pd.DataFrame,) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
         return self._processor.get_data(df)
 
     def get_payload(
@@ -102,6 +102,9 @@ class QueryContext:
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> Optional[str]:
         return self._processor.query_cache_key(query_obj, **kwargs)
 
+    def get_cache_keys(self) -> List[Optional[str]]:
+        return self._processor.get_cache_keys()
+
     def get_df_payload(
         self, query_obj: QueryObject, force_cached: Optional[bool] = False,
     ) -> Dict[str, Any]:
@@ -117,3 +120,6 @@ class QueryContext:
 
     def raise_for_access(self) -> None:
         self._processor.raise_for_access()
+
+    def get_stats_tags(self) -> Dict[str, str]:
+        return self._processor.get_stats_tags()
@@ -18,10 +18,21 @@ from __future__ import annotations
 
 import copy
 import logging
-from typing import Any, ClassVar, Dict, List, Optional, TYPE_CHECKING, Union
+from datetime import timedelta
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    TYPE_CHECKING,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
+from flask import g
 from flask_babel import _
 from pandas import DateOffset
 from typing_extensions import TypedDict
@@ -29,7 +40,7 @@ from typing_extensions import TypedDict
 from superset import app, is_feature_enabled
 from superset.annotation_layers.dao import AnnotationLayerDAO
 from superset.charts.dao import ChartDAO
-from superset.common.chart_data import ChartDataResultFormat
+from superset.common.chart_data import ChartDataResultFormat, ChartDataResultType
 from superset.common.db_query_status import QueryStatus
 from superset.common.query_actions import get_query_results
 from superset.common.utils import dataframe_utils as df_utils
@@ -39,8 +50,8 @@ from superset.constants import CacheRegion
 from superset.exceptions import QueryObjectValidationError, SupersetException
 from superset.extensions import cache_manager, security_manager
 from superset.models.helpers import QueryResult
-from superset.utils import csv
 from superset.utils.cache import generate_cache_key, set_and_log_cache
+from superset.utils.concurrency import run_concurrently
 from superset.utils.core import (
     DTTM_ALIAS,
     error_msg_from_exception,
@@ -51,6 +62,7 @@ from superset.utils.core import (
     TIME_COMPARISION,
 )
 from superset.utils.date_parser import get_past_or_future, normalize_time_delta
+from superset.utils.local_cache import memoize_in_request
 from superset.views.utils import get_viz
 
 if TYPE_CHECKING:
@@ -69,6 +81,15 @@ class CachedTimeOffset(TypedDict):
     cache_keys: List[Optional[str]]
 
 
+class TimeOffsetResult(NamedTuple):
+    # the cached metrics aligned with the main df, or the metrics to join with it
+    df: pd.DataFrame
+    query: str
+    cache_key: Optional[str]
+    cached: bool
+    metrics_mapping: Dict[str, str]
+
+
 class QueryContextProcessor:
     """
     The query context contains the query object and additional fields necessary
@@ -85,6 +106,8 @@ class QueryContextProcessor:
     def __init__(self, query_context: QueryContext):
         self._query_context = query_context
         self._qc_datasource = query_context.datasource
+        # raw data cache values of the queries, looked up at once by `get_payload`
+        self._cache_values: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
 
     cache_type: ClassVar[str] = "df"
     enforce_numerical_metrics: ClassVar[bool] = True
@@ -93,43 +116,57 @@ class QueryContextProcessor:
         self, query_obj: QueryObject, force_cached: Optional[bool] = False
     ) -> Dict[str, Any]:
         """Handles caching around the df payload retrieval"""
-        cache_key = self.query_cache_key(query_obj)
-        cache = QueryCacheManager.get(
-            cache_key, CacheRegion.DATA, self._query_context.force, force_cached,
-        )
+        # a page of raw rows is sliced out of the cached row window holding it
+        window_query_obj = self.get_row_window_query_object(query_obj)
+        page_offset = 0
+        page_limit: Optional[int] = None
+        if window_query_obj:
+            page_offset = query_obj.row_offset - window_query_obj.row_offset
+            page_limit = query_obj.row_limit
+            query_obj = window_query_obj
+
+        stats_tags = self.get_stats_tags()
+        with stats_logger.timer("chart_data.cache_key", stats_tags):
+            cache_key = self.query_cache_key(query_obj)
+        with stats_logger.timer(
+            "chart_data.cache_get", {**stats_tags, "cache": "miss"}
+        ) as cache_tags:
+            cache = QueryCacheManager.get(
+                cache_key,
+                CacheRegion.DATA,
+                self._query_context.force,
+                force_cached,
+                row_offset=page_offset,
+                row_limit=page_limit,
+                cache_values=self._cache_values,
+            )
+            if cache.is_loaded:
+                cache_tags["cache"] = "stale" if cache.is_stale else "hit"
+
+        if cache.is_stale:
+            if self.get_stale_timeout():
+                # serve the stale data right away, the next request gets fresh data
+                stats_logger.incr("data_cache.stale.served")
+                self.schedule_refresh(cache_key)
+            else:
+                cache = QueryCacheManager()
 
         if query_obj and cache_key and not cache.is_loaded:
-            try:
-                invalid_columns = [
-                    col
-                    for col in get_column_names_from_columns(query_obj.columns)
-                    + get_column_names_from_metrics(query_obj.metrics or [])
-                    if (
-                        col not in self._qc_datasource.column_names
-                        and col != DTTM_ALIAS
-                    )
-                ]
-                if invalid_columns:
-                    raise QueryObjectValidationError(
-                        _(
-                            "Columns missing in datasource: %(invalid_columns)s",
-                            invalid_columns=invalid_columns,
-                        )
-                    )
-                query_result = self.get_query_result(query_obj)
-                annotation_data = self.get_annotation_data(query_obj)
-                cache.set_query_result(
-                    key=cache_key,
-                    query_result=query_result,
-                    annotation_data=annotation_data,
-                    force_query=self._query_context.force,
-                    timeout=self.get_cache_timeout(),
-                    datasource_uid=self._qc_datasource.uid,
-                    region=CacheRegion.DATA,
-                )
-            except QueryObjectValidationError as ex:
-                cache.error_message = str(ex)
-                cache.status = QueryStatus.FAILED
+            # identical queries running concurrently wait for the first one instead
+            # of all hitting the database
+            with QueryCacheManager.single_flight(
+                cache_key,
+                CacheRegion.DATA,
+                self._query_context.force,
+                row_offset=page_offset,
+                row_limit=page_limit,
+            ) as cache:
+                if not cache.is_loaded:
+                    self.load_query_result(cache, cache_key, query_obj)
+                    if window_query_obj and page_limit is not None:
+                        cache.df = cache.df.iloc[
+                            page_offset : page_offset + page_limit
+                        ].reset_index(drop=True)
 
         return {
             "cache_key": cache_key,
@@ -148,6 +185,129 @@ class QueryContextProcessor:
             "to_dttm": query_obj.to_dttm,
         }
 
+    def load_query_result(
+        self, cache: QueryCacheManager, cache_key: str, query_obj: QueryObject
+    ) -> None:
+        """Run the query object and cache its result"""
+        try:
+            invalid_columns = [
+                col
+                for col in get_column_names_from_columns(query_obj.columns)
+                + get_column_names_from_metrics(query_obj.metrics or [])
+                if (col not in self._qc_datasource.column_names and col != DTTM_ALIAS)
+            ]
+            if invalid_columns:
+                raise QueryObjectValidationError(
+                    _(
+                        "Columns missing in datasource: %(invalid_columns)s",
+                        invalid_columns=invalid_columns,
+                    )
+                )
+            query_result = self.get_query_result(query_obj)
+            annotation_data = self.get_annotation_data(query_obj)
+            cache.set_query_result(
+                key=cache_key,
+                query_result=query_result,
+                annotation_data=annotation_data,
+                force_query=self._query_context.force,
+                timeout=self.get_cache_timeout(),
+                datasource_uid=self._qc_datasource.uid,
+                region=CacheRegion.DATA,
+                stale_timeout=self.get_stale_timeout(),
+            )
+        except QueryObjectValidationError as ex:
+            cache.error_message = str(ex)
+            cache.status = QueryStatus.FAILED
+
+    def get_stale_timeout(self) -> int:
+        """
+        Number of seconds expired results of the query context may be served from
+        the cache while they are refreshed, 0 when stale results aren't served
+        """
+        form_data = self._query_context.form_data or {}
+        extra = getattr(self._qc_datasource, "extra_dict", {})
+        enabled = form_data.get(
+            "stale_while_revalidate",
+            extra.get(
+                "stale_while_revalidate", config["DATA_CACHE_STALE_WHILE_REVALIDATE"]
+            ),
+        )
+        return config["DATA_CACHE_STALE_TIMEOUT"] if enabled else 0
+
+    def schedule_refresh(self, cache_key: str) -> None:
+        """
+        Refresh the cached results of the query context in a Celery worker, once
+        for all the requests serving the stale results of `cache_key`
+        """
+        # pylint: disable=import-outside-toplevel
+        from superset.tasks.async_queries import load_chart_data_into_cache
+
+        try:
+            if not cache_manager.data_cache.add(
+                f"{cache_key}__refresh",
+                True,
+                timeout=config["DATA_CACHE_SINGLE_FLIGHT_LOCK_TIMEOUT"],
+            ):
+                return
+            user = getattr(g, "user", None)
+            form_data = {
+                **self._query_context.cache_values,
+                "form_data": self._query_context.form_data,
+                "force": True,
+            }
+            load_chart_data_into_cache.delay(
+                {"user_id": user.get_id() if user else None}, form_data
+            )
+            stats_logger.incr("data_cache.stale.refresh")
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not schedule the refresh of cache key %s", cache_key)
+            logger.exception(ex)
+
+    @staticmethod
+    def get_row_window_query_object(query_obj: QueryObject) -> Optional[QueryObject]:
+        """
+        Return a copy of the query object fetching the aligned window of
+        `DATA_CACHE_ROW_WINDOW_SIZE` rows that contains the requested rows, or `None`
+        if the query object shouldn't be fetched by windows.
+        """
+        window_size = config["DATA_CACHE_ROW_WINDOW_SIZE"]
+        if (
+            not window_size
+            or not query_obj.row_limit
+            or query_obj.row_limit >= window_size
+            or query_obj.post_processing
+            or query_obj.time_offsets
+        ):
+            return None
+
+        window_start = query_obj.row_offset // window_size * window_size
+        row_end = query_obj.row_offset + query_obj.row_limit
+        window_end = -(-row_end // window_size) * window_size
+        window_query_obj = copy.copy(query_obj)
+        window_query_obj.row_offset = window_start
+        window_query_obj.row_limit = window_end - window_start
+        return window_query_obj
+
+    def get_cache_keys(self) -> List[Optional[str]]:
+        """
+        Returns the data cache keys of the queries whose payload is loaded from the
+        data cache as is
+        """
+        cache_keys = []
+        for query_obj in self._query_context.queries:
+            result_type = query_obj.result_type or self._query_context.result_type
+            if result_type in (
+                ChartDataResultType.FULL,
+                ChartDataResultType.RESULTS,
+                ChartDataResultType.POST_PROCESSED,
+            ):
+                cache_keys.append(
+                    self.query_cache_key(
+                        self.get_row_window_query_object(query_obj) or query_obj
+                    )
+                )
+        return cache_keys
+
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> Optional[str]:
         """
         Returns a QueryObject cache key for objects in self.queries
@@ -157,13 +317,8 @@ class QueryContextProcessor:
 
         cache_key = (
             query_obj.cache_key(
-                datasource=datasource.uid,
                 extra_cache_keys=extra_cache_keys,
-                rls=security_manager.get_rls_ids(datasource)
-                if is_feature_enabled("ROW_LEVEL_SECURITY")
-                and datasource.is_rls_supported
-                else [],
-                changed_on=datasource.changed_on,
+                **self.get_datasource_fingerprint(),
                 **kwargs,
             )
             if query_obj
@@ -171,8 +326,88 @@ class QueryContextProcessor:
         )
         return cache_key
 
+    def get_datasource_fingerprint(self) -> Dict[str, Any]:
+        """
+        Returns the parts of the query cache keys identifying the datasource and the
+        row level security filters applied to it for the current user, computed once
+        per request.
+        """
+        datasource = self._qc_datasource
+
+        def fingerprint() -> Dict[str, Any]:
+            return {
+                "datasource": datasource.uid,
+                "rls": security_manager.get_rls_ids(datasource)
+                if is_feature_enabled("ROW_LEVEL_SECURITY")
+                and datasource.is_rls_supported
+                else [],
+                "changed_on": datasource.changed_on,
+            }
+
+        return memoize_in_request(
+            "datasource_fingerprint",
+            (datasource.uid, datasource.changed_on),
+            fingerprint,
+        )
+
     def get_query_result(self, query_object: QueryObject) -> QueryResult:
         """Returns a pandas dataframe based on the query object"""
+        result = self.get_raw_query_result(query_object)
+        if not result.df.empty:
+            with stats_logger.timer(
+                "chart_data.post_processing", self.get_stats_tags()
+            ):
+                result.df = query_object.exec_post_processing(result.df)
+        return result
+
+    def get_raw_query_result(self, query_object: QueryObject) -> QueryResult:
+        """
+        Returns the result of the query object before post-processing. The result of
+        a query object with post-processing is cached on its own, keyed without the
+        post-processing, so that changing the post-processing only reruns it. The key
+        is salted so that it never serves the full payload of the same query without
+        post-processing, e.g. its annotation data.
+        """
+        if not query_object.post_processing:
+            return self.run_query_object(query_object)
+
+        raw_query_object = copy.copy(query_object)
+        raw_query_object.post_processing = []
+        cache_key = self.query_cache_key(raw_query_object, raw=True)
+        cache = QueryCacheManager.get(
+            cache_key, CacheRegion.DATA, self._query_context.force
+        )
+        if cache.is_loaded and not cache.is_stale:
+            stats_logger.incr("loaded_raw_from_cache")
+            return QueryResult(
+                df=cache.df,
+                query=cache.query,
+                duration=timedelta(0),
+                applied_template_filters=cache.applied_template_filters,
+                from_dttm=query_object.from_dttm,
+                to_dttm=query_object.to_dttm,
+            )
+
+        result = self.run_query_object(query_object)
+        if result.status != QueryStatus.FAILED:
+            QueryCacheManager.set(
+                key=cache_key,
+                value={
+                    "df": result.df,
+                    "query": result.query,
+                    "applied_template_filters": result.applied_template_filters,
+                },
+                timeout=self.get_cache_timeout(),
+                datasource_uid=self._qc_datasource.uid,
+                region=CacheRegion.DATA,
+            )
+        return result
+
+    def run_query_object(self, query_object: QueryObject) -> QueryResult:
+        """
+        Returns the result of the query object, normalized and joined with its time
+        offsets, before post-processing
+        """
         query_context = self._query_context
         # Here, we assume that all the queries will use the same datasource, which is
         # a valid assumption for current setting. In the long term, we may
@@ -199,8 +434,6 @@ class QueryContextProcessor:
                 query += ";\n\n".join(queries)
                 query += ";\n\n"
 
-            df = query_object.exec_post_processing(df)
-
         result.df = df
         result.query = query
         result.from_dttm = query_object.from_dttm
@@ -233,140 +466,221 @@ class QueryContextProcessor:
         self, df: pd.DataFrame, query_object: QueryObject,
     ) -> CachedTimeOffset:
         query_context = self._query_context
-        # ensure query_object is immutable
-        query_object_clone = copy.copy(query_object)
-        queries: List[str] = []
-        cache_keys: List[Optional[str]] = []
-        rv_dfs: List[pd.DataFrame] = [df]
-
         time_offsets = query_object.time_offsets
-        outer_from_dttm = query_object.from_dttm
-        outer_to_dttm = query_object.to_dttm
-        for offset in time_offsets:
-            try:
-                query_object_clone.from_dttm = get_past_or_future(
-                    offset, outer_from_dttm,
+        if time_offsets and (not query_object.from_dttm or not query_object.to_dttm):
+            raise QueryObjectValidationError(
+                _(
+                    "An enclosed time range (both start and end) must be specified "
+                    "when using a Time Comparison."
                 )
-                query_object_clone.to_dttm = get_past_or_future(offset, outer_to_dttm)
-            except ValueError as ex:
-                raise QueryObjectValidationError(str(ex)) from ex
-            # make sure subquery use main query where clause
-            query_object_clone.inner_from_dttm = outer_from_dttm
-            query_object_clone.inner_to_dttm = outer_to_dttm
-            query_object_clone.time_offsets = []
-            query_object_clone.post_processing = []
-
-            if not query_object.from_dttm or not query_object.to_dttm:
-                raise QueryObjectValidationError(
-                    _(
-                        "An enclosed time range (both start and end) must be specified "
-                        "when using a Time Comparison."
-                    )
-                )
-            # `offset` is added to the hash function
-            cache_key = self.query_cache_key(query_object_clone, time_offset=offset)
-            cache = QueryCacheManager.get(
-                cache_key, CacheRegion.DATA, query_context.force
             )
-            # whether hit on the cache
-            if cache.is_loaded:
-                rv_dfs.append(cache.df)
-                queries.append(cache.query)
-                cache_keys.append(cache_key)
-                continue
-
-            query_object_clone_dct = query_object_clone.to_dict()
-            # rename metrics: SUM(value) => SUM(value) 1 year ago
-            metrics_mapping = {
-                metric: TIME_COMPARISION.join([metric, offset])
-                for metric in get_metric_names(
-                    query_object_clone_dct.get("metrics", [])
-                )
-            }
-            join_keys = [col for col in df.columns if col not in metrics_mapping.keys()]
 
-            result = self._qc_datasource.query(query_object_clone_dct)
-            queries.append(result.query)
-            cache_keys.append(None)
-
-            offset_metrics_df = result.df
-            if offset_metrics_df.empty:
-                offset_metrics_df = pd.DataFrame(
-                    {
-                        col: [np.NaN]
-                        for col in join_keys + list(metrics_mapping.values())
-                    }
-                )
-            else:
-                # 1. normalize df, set dttm column
-                offset_metrics_df = self.normalize_df(
-                    offset_metrics_df, query_object_clone
-                )
-
-                # 2. rename extra query columns
-                offset_metrics_df = offset_metrics_df.rename(columns=metrics_mapping)
-
-                # 3. set time offset for index
-                # TODO: add x-axis to QueryObject, potentially as an array for
-                #  multi-dimensional charts
-                granularity = query_object.granularity
-                index = granularity if granularity in df.columns else DTTM_ALIAS
-                offset_metrics_df[index] = offset_metrics_df[index] - DateOffset(
-                    **normalize_time_delta(offset)
+        # offsets are independent from each other: look them all up in the cache at
+        # once and query the missing ones concurrently
+        offset_query_objects = {
+            offset: self.get_time_offset_query_object(query_object, offset)
+            for offset in time_offsets
+        }
+        offset_cache_keys = {
+            offset: self.query_cache_key(offset_query_object, time_offset=offset)
+            for offset, offset_query_object in offset_query_objects.items()
+        }
+        caches = QueryCacheManager.get_many(
+            list(offset_cache_keys.values()), CacheRegion.DATA, query_context.force
+        )
+        offset_results: Dict[str, TimeOffsetResult] = {}
+        for offset, cache_key in offset_cache_keys.items():
+            cache = caches.get(cache_key) if cache_key else None
+            if cache and cache.is_loaded:
+                offset_results[offset] = TimeOffsetResult(
+                    df=cache.df,
+                    query=cache.query,
+                    cache_key=cache_key,
+                    cached=True,
+                    metrics_mapping={},
                 )
-
-            # df left join `offset_metrics_df`
+        missing_offsets = [
+            offset for offset in time_offsets if offset not in offset_results
+        ]
+        for offset, result in zip(
+            missing_offsets,
+            run_concurrently(
+                lambda offset: self.get_time_offset_result(
+                    df,
+                    query_object,
+                    offset,
+                    offset_query_objects[offset],
+                    offset_cache_keys[offset],
+                ),
+                missing_offsets,
+                database_key=self.get_database_key(),
+            ),
+        ):
+            offset_results[offset] = result
+
+        # df left join all the `offset_metrics_df` that weren't cached at once
+        offset_df = df
+        uncached_results = [offset_results[offset] for offset in missing_offsets]
+        if uncached_results:
+            join_keys = [
+                col
+                for col in df.columns
+                if col not in uncached_results[0].metrics_mapping.keys()
+            ]
             offset_df = df_utils.left_join_df(
-                left_df=df, right_df=offset_metrics_df, join_keys=join_keys,
+                left_df=df,
+                right_df=[result.df for result in uncached_results],
+                join_keys=join_keys,
             )
-            offset_slice = offset_df[metrics_mapping.values()]
 
+        queries: List[str] = []
+        cache_keys: List[Optional[str]] = []
+        rv_dfs: List[pd.DataFrame] = [df]
+        values: Dict[str, Dict[str, Any]] = {}
+        for offset in time_offsets:
+            result = offset_results[offset]
+            queries.append(result.query)
+            if result.cached:
+                rv_dfs.append(result.df)
+                cache_keys.append(result.cache_key)
+                continue
+
+            offset_slice = offset_df[result.metrics_mapping.values()]
             # set offset_slice to cache and stack.
-            value = {
-                "df": offset_slice,
-                "query": result.query,
-            }
-            cache.set(
-                key=cache_key,
-                value=value,
-                timeout=self.get_cache_timeout(),
-                datasource_uid=query_context.datasource.uid,
-                region=CacheRegion.DATA,
-            )
+            if result.cache_key:
+                values[result.cache_key] = {
+                    "df": offset_slice,
+                    "query": result.query,
+                }
             rv_dfs.append(offset_slice)
+            cache_keys.append(None)
+
+        QueryCacheManager.set_many(
+            values,
+            timeout=self.get_cache_timeout(),
+            datasource_uid=query_context.datasource.uid,
+            region=CacheRegion.DATA,
+        )
 
         rv_df = pd.concat(rv_dfs, axis=1, copy=False) if time_offsets else df
         return CachedTimeOffset(df=rv_df, queries=queries, cache_keys=cache_keys)
 
-    def get_data(self, df: pd.DataFrame) -> Union[str, List[Dict[str, Any]]]:
-        if self._query_context.result_format == ChartDataResultFormat.CSV:
-            include_index = not isinstance(df.index, pd.RangeIndex)
-            columns = list(df.columns)
-            verbose_map = self._qc_datasource.data.get("verbose_map", {})
-            if verbose_map:
-                df.columns = [verbose_map.get(column, column) for column in columns]
-            result = csv.df_to_escaped_csv(
-                df, index=include_index, **config["CSV_EXPORT"]
+    @staticmethod
+    def get_time_offset_query_object(
+        query_object: QueryObject, offset: str
+    ) -> QueryObject:
+        """Return a copy of the query object shifted by a time offset"""
+        # ensure query_object is immutable
+        query_object_clone = copy.copy(query_object)
+        outer_from_dttm = query_object.from_dttm
+        outer_to_dttm = query_object.to_dttm
+        try:
+            query_object_clone.from_dttm = get_past_or_future(offset, outer_from_dttm,)
+            query_object_clone.to_dttm = get_past_or_future(offset, outer_to_dttm)
+        except ValueError as ex:
+            raise QueryObjectValidationError(str(ex)) from ex
+        # make sure subquery use main query where clause
+        query_object_clone.inner_from_dttm = outer_from_dttm
+        query_object_clone.inner_to_dttm = outer_to_dttm
+        query_object_clone.time_offsets = []
+        query_object_clone.post_processing = []
+        return query_object_clone
+
+    def get_time_offset_result(  # pylint: disable=too-many-arguments
+        self,
+        df: pd.DataFrame,
+        query_object: QueryObject,
+        offset: str,
+        query_object_clone: QueryObject,
+        cache_key: Optional[str],
+    ) -> TimeOffsetResult:
+        """
+        Run the time offset query, as returned by `get_time_offset_query_object`,
+        and return its metrics ready to be joined with `df`.
+        """
+        query_object_clone_dct = query_object_clone.to_dict()
+        # rename metrics: SUM(value) => SUM(value) 1 year ago
+        metrics_mapping = {
+            metric: TIME_COMPARISION.join([metric, offset])
+            for metric in get_metric_names(query_object_clone_dct.get("metrics", []))
+        }
+        join_keys = [col for col in df.columns if col not in metrics_mapping.keys()]
+
+        result = self._qc_datasource.query(query_object_clone_dct)
+
+        offset_metrics_df = result.df
+        if offset_metrics_df.empty:
+            offset_metrics_df = pd.DataFrame(
+                {col: [np.NaN] for col in join_keys + list(metrics_mapping.values())}
+            )
+        else:
+            # 1. normalize df, set dttm column
+            offset_metrics_df = self.normalize_df(offset_metrics_df, query_object_clone)
+
+            # 2. rename extra query columns
+            offset_metrics_df = offset_metrics_df.rename(columns=metrics_mapping)
+
+            # 3. set time offset for index
+            # TODO: add x-axis to QueryObject, potentially as an array for
+            #  multi-dimensional charts
+            granularity = query_object.granularity
+            index = granularity if granularity in df.columns else DTTM_ALIAS
+            offset_metrics_df[index] = offset_metrics_df[index] - DateOffset(
+                **normalize_time_delta(offset)
             )
-            return result or ""
 
-        return df.to_dict(orient="records")
+        return TimeOffsetResult(
+            df=offset_metrics_df,
+            query=result.query,
+            cache_key=cache_key,
+            cached=False,
+            metrics_mapping=metrics_mapping,
+        )
+
+    def get_data(self, df: pd.DataFrame) -> Union[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Returns the records of the DataFrame, or the DataFrame with verbose column
+        names for the formats exported as files, which are streamed from it
+        """
+        stats_tags = {
+            **self.get_stats_tags(),
+            "format": self._query_context.result_format.value,
+        }
+        with stats_logger.timer("chart_data.serialization", stats_tags):
+            if self._query_context.result_format in ChartDataResultFormat.table_like():
+                columns = list(df.columns)
+                verbose_map = self._qc_datasource.data.get("verbose_map", {})
+                if verbose_map:
+                    # the DataFrame may be shared with the cache of the request
+                    df = df.copy(deep=False)
+                    df.columns = [verbose_map.get(column, column) for column in columns]
+                return df
+
+            return df.to_dict(orient="records")
 
     def get_payload(
         self, cache_query_context: Optional[bool] = False, force_cached: bool = False,
     ) -> Dict[str, Any]:
         """Returns the query results with both metadata and data"""
 
-        # Get all the payloads from the QueryObjects
-        query_results = [
-            get_query_results(
+        # Get all the payloads from the QueryObjects, which are independent from each
+        # other and may run concurrently
+        if len(self._query_context.queries) > 1:
+            self.preload_datasource()
+            if not self._query_context.force:
+                self._cache_values = QueryCacheManager.get_cache_values(
+                    self.get_cache_keys(), CacheRegion.DATA
+                )
+        query_results = run_concurrently(
+            lambda query_obj: get_query_results(
                 query_obj.result_type or self._query_context.result_type,
                 self._query_context,
                 query_obj,
                 force_cached,
-            )
-            for query_obj in self._query_context.queries
-        ]
+            ),
+            self._query_context.queries,
+            database_key=self.get_database_key(),
+        )
         return_value = {"queries": query_results}
 
         if cache_query_context:
@@ -381,6 +695,27 @@ class QueryContextProcessor:
 
         return return_value
 
+    def preload_datasource(self) -> None:
+        """
+        Load the lazy relationships of the datasource up front, so that queries
+        running in other threads don't use the session of the current thread.
+        """
+        datasource = self._qc_datasource
+        for attr in ("columns", "metrics", "database"):
+            getattr(datasource, attr, None)
+
+    def get_database_key(self) -> Optional[int]:
+        database = getattr(self._qc_datasource, "database", None)
+        return database.id if database else None
+
+    def get_stats_tags(self) -> Dict[str, str]:
+        """Tags breaking down the metrics of the query context by datasource"""
+        database_key = self.get_database_key()
+        return {
+            "datasource": self._qc_datasource.uid,
+            "database": str(database_key) if database_key else "",
+        }
+
     def get_cache_timeout(self) -> int:
         cache_timeout_rv = self._query_context.get_cache_timeout()
         if cache_timeout_rv:
@@ -477,6 +812,7 @@ class QueryContextProcessor:
 
         :raises SupersetSecurityException: If the user cannot access the resource
         """
-        for query in self._query_context.queries:
-            query.validate()
-        security_manager.raise_for_access(query_context=self._query_context)
+        with stats_logger.timer("chart_data.security_check", self.get_stats_tags()):
+            for query in self._query_context.queries:
+                query.validate()
+            security_manager.raise_for_access(query_context=self._query_context)
@@ -43,7 +43,7 @@ from superset.utils.core import (
     QueryObjectFilterClause,
 )
 from superset.utils.date_parser import parse_human_timedelta
-from superset.utils.hashing import md5_sha_from_dict
+from superset.utils.hashing import canonical_md5_sha_from_dict
 
 if TYPE_CHECKING:
     from superset.connectors.base.models import BaseDatasource
@@ -384,7 +384,7 @@ class QueryObject:  # pylint: disable=too-many-instance-attributes
         if annotation_layers:
             cache_dict["annotation_layers"] = annotation_layers
 
-        return md5_sha_from_dict(cache_dict, default=json_int_dttm_ser, ignore_nan=True)
+        return canonical_md5_sha_from_dict(cache_dict, default=json_int_dttm_ser)
 
     def exec_post_processing(self, df: DataFrame) -> DataFrame:
         """
@@ -0,0 +1,275 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Codecs used to serialize the DataFrames stored in the DATA cache region.
+
+Encoded frames are stored as ``bytes`` made out of a small header followed by the
+codec body::
+
+    MAGIC (4 bytes) | header length (uint32, little endian) | JSON header | body
+
+The header records the codec name alongside the shape of the frame and the number
+of rows per chunk, which allows reading a subset of the rows of a cached frame
+without decoding all of it. Values that are not prefixed with
+``MAGIC`` are plain (pickled) DataFrames written by the legacy code path.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import struct
+from typing import Any, ClassVar, Dict, Optional, Tuple, Type, TYPE_CHECKING, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from superset import app
+from superset.exceptions import SerializationError
+from superset.utils.dates import now_as_float
+
+if TYPE_CHECKING:
+    from superset.stats_logger import BaseStatsLogger
+
+config = app.config
+stats_logger: BaseStatsLogger = config["STATS_LOGGER"]
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SSDF"
+_HEADER_LENGTH = struct.Struct("<I")
+_PREFIX_LENGTH = len(MAGIC) + _HEADER_LENGTH.size
+
+
+class DataFrameCodec:
+    """Base class for DataFrame cache codecs"""
+
+    name: ClassVar[str] = ""
+
+    def __init__(self, compression: Optional[str] = None, chunk_size: int = 0) -> None:
+        self.compression = compression
+        self.chunk_size = chunk_size
+
+    def encode_body(self, table: pa.Table, chunk_size: int) -> bytes:
+        raise NotImplementedError()
+
+    def decode_body(
+        self, body: pa.Buffer, chunk_size: int, first_chunk: int, last_chunk: int,
+    ) -> pa.Table:
+        """
+        Read the chunks in `[first_chunk, last_chunk)`. A `last_chunk` of `-1` reads
+        until the last chunk.
+        """
+        raise NotImplementedError()
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        """Serialize a DataFrame into a header-prefixed, chunked buffer"""
+        table = pa.Table.from_pandas(df)
+        chunk_size = self.chunk_size or max(table.num_rows, 1)
+        header = json.dumps(
+            {
+                "codec": self.name,
+                "compression": self.compression,
+                "chunk_size": chunk_size,
+                "num_rows": table.num_rows,
+                "columns": [str(column) for column in df.columns],
+            }
+        ).encode("utf-8")
+        body = self.encode_body(table, chunk_size)
+        return b"".join([MAGIC, _HEADER_LENGTH.pack(len(header)), header, body])
+
+    def decode(
+        self, payload: bytes, row_offset: int = 0, row_limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Deserialize a buffer previously produced by `encode`. Only the chunks
+        overlapping the requested row range are read.
+        """
+        header, offset = read_header(payload)
+        if header.get("codec") != self.name:
+            raise SerializationError(
+                f"Payload was encoded with codec {header.get('codec')}, "
+                f"not {self.name}"
+            )
+        chunk_size = header["chunk_size"]
+        num_rows = header["num_rows"]
+        row_offset = min(row_offset, num_rows)
+        row_end = (
+            num_rows if row_limit is None else min(row_offset + row_limit, num_rows)
+        )
+        first_chunk = row_offset // chunk_size
+        last_chunk = -(-row_end // chunk_size) if row_limit is not None else -1
+
+        # slicing a memoryview keeps the body zero-copy until Arrow decompresses it
+        body = pa.py_buffer(memoryview(payload)[offset:])
+        table = self.decode_body(body, chunk_size, first_chunk, last_chunk)
+        if row_offset or row_limit is not None:
+            table = table.slice(
+                row_offset - first_chunk * chunk_size, row_end - row_offset
+            )
+        return table.to_pandas()
+
+
+class ArrowIpcCodec(DataFrameCodec):
+    """
+    Arrow IPC file format, with optional LZ4/ZSTD buffer compression. Each chunk is
+    written as a separate record batch, which can be read independently.
+    """
+
+    name = "arrow"
+
+    def encode_body(self, table: pa.Table, chunk_size: int) -> bytes:
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            for batch in table.to_batches(max_chunksize=chunk_size):
+                writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+    def decode_body(
+        self, body: pa.Buffer, chunk_size: int, first_chunk: int, last_chunk: int,
+    ) -> pa.Table:
+        reader = pa.ipc.open_file(body)
+        num_chunks = reader.num_record_batches
+        if last_chunk < 0 or last_chunk > num_chunks:
+            last_chunk = num_chunks
+        return pa.Table.from_batches(
+            [reader.get_batch(i) for i in range(first_chunk, last_chunk)],
+            schema=reader.schema,
+        )
+
+
+class ParquetCodec(DataFrameCodec):
+    """
+    Parquet format, smaller than Arrow IPC but slower to read and write. Each chunk
+    is written as a separate row group.
+    """
+
+    name = "parquet"
+
+    def encode_body(self, table: pa.Table, chunk_size: int) -> bytes:
+        sink = pa.BufferOutputStream()
+        pq.write_table(
+            table,
+            sink,
+            row_group_size=chunk_size,
+            compression=self.compression or "none",
+        )
+        return sink.getvalue().to_pybytes()
+
+    def decode_body(
+        self, body: pa.Buffer, chunk_size: int, first_chunk: int, last_chunk: int,
+    ) -> pa.Table:
+        parquet_file = pq.ParquetFile(pa.BufferReader(body))
+        num_chunks = parquet_file.num_row_groups
+        if last_chunk < 0 or last_chunk > num_chunks:
+            last_chunk = num_chunks
+        if first_chunk == 0 and last_chunk == num_chunks:
+            return parquet_file.read(use_pandas_metadata=True)
+        return parquet_file.read_row_groups(
+            list(range(first_chunk, last_chunk)), use_pandas_metadata=True
+        )
+
+
+CODECS: Dict[str, Type[DataFrameCodec]] = {
+    ArrowIpcCodec.name: ArrowIpcCodec,
+    ParquetCodec.name: ParquetCodec,
+}
+
+
+def is_encoded(value: Any) -> bool:
+    return isinstance(value, bytes) and value[: len(MAGIC)] == MAGIC
+
+
+def read_header(payload: bytes) -> Tuple[Dict[str, Any], int]:
+    """
+    Read the header of an encoded DataFrame
+
+    :returns: the header and the offset at which the codec body starts
+    """
+    if not is_encoded(payload):
+        raise SerializationError("Payload is not an encoded DataFrame")
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload, len(MAGIC))
+    offset = _PREFIX_LENGTH + header_length
+    header = json.loads(payload[_PREFIX_LENGTH:offset].decode("utf-8"))
+    return header, offset
+
+
+def get_codec(name: Optional[str] = None) -> Optional[DataFrameCodec]:
+    """
+    Return the codec configured with `DATA_CACHE_CODEC`, or `None` when DataFrames
+    should be stored as-is (pickled by the cache backend).
+    """
+    if name is None:
+        name = config["DATA_CACHE_CODEC"]
+    if not name or name == "pickle":
+        return None
+    if name not in CODECS:
+        raise SerializationError(f"Unknown DATA_CACHE_CODEC: {name}")
+    return CODECS[name](
+        compression=config["DATA_CACHE_CODEC_COMPRESSION"],
+        chunk_size=config["DATA_CACHE_CODEC_CHUNK_SIZE"],
+    )
+
+
+def encode_df(df: pd.DataFrame) -> Union[pd.DataFrame, bytes]:
+    """
+    Encode a DataFrame with the configured codec. Frames that can't be represented
+    in Arrow (e.g. columns holding mixed Python objects) are returned unchanged.
+    """
+    codec = get_codec()
+    if codec is None or not isinstance(df, pd.DataFrame):
+        return df
+
+    start = now_as_float()
+    try:
+        payload = codec.encode(df)
+    except (pa.ArrowException, TypeError, ValueError) as ex:
+        logger.warning("Unable to encode DataFrame with codec %s: %s", codec.name, ex)
+        stats_logger.incr(f"data_cache.{codec.name}.encode_fallback")
+        return df
+    stats_logger.timing(f"data_cache.{codec.name}.encode", now_as_float() - start)
+    stats_logger.gauge(f"data_cache.{codec.name}.encoded_bytes", len(payload))
+    return payload
+
+
+def decode_df(
+    value: Union[pd.DataFrame, bytes],
+    row_offset: int = 0,
+    row_limit: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Decode a cached DataFrame, regardless of the codec it was written with,
+    optionally restricted to a range of its rows.
+    """
+    if not is_encoded(value):
+        df = value
+        if row_offset or row_limit is not None:
+            row_end = None if row_limit is None else row_offset + row_limit
+            df = df.iloc[row_offset:row_end]
+            if isinstance(df.index, pd.RangeIndex):
+                df = df.reset_index(drop=True)
+        return df
+
+    header, _ = read_header(value)
+    codec = get_codec(header["codec"])
+    if codec is None:
+        raise SerializationError("Unable to determine DataFrame codec")
+
+    start = now_as_float()
+    df = codec.decode(value, row_offset, row_limit)
+    stats_logger.timing(f"data_cache.{codec.name}.decode", now_as_float() - start)
+    return df
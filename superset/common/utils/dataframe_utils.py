@@ -16,19 +16,43 @@
 # under the License.
 from __future__ import annotations
 
-from typing import List, TYPE_CHECKING
+from typing import List, TYPE_CHECKING, Union
 
 import numpy as np
 import pandas as pd
+from pandas.api.types import is_integer_dtype
 
 if TYPE_CHECKING:
     from superset.common.query_object import QueryObject
 
 
 def left_join_df(
-    left_df: pd.DataFrame, right_df: pd.DataFrame, join_keys: List[str],
+    left_df: pd.DataFrame,
+    right_df: Union[pd.DataFrame, List[pd.DataFrame]],
+    join_keys: List[str],
 ) -> pd.DataFrame:
-    df = left_df.set_index(join_keys).join(right_df.set_index(join_keys))
+    """
+    Left join one or several DataFrames on `join_keys`. Several DataFrames are
+    joined in a single pass over the index of `left_df`. Integer columns are kept
+    as such unless the join leaves them with missing values.
+    """
+    left = left_df.set_index(join_keys)
+    if isinstance(right_df, list):
+        right = [rdf.set_index(join_keys) for rdf in right_df]
+        df = left.join(right)
+    else:
+        right = [right_df.set_index(join_keys)]
+        df = left.join(right[0])
+    # aligning several DataFrames at once, e.g. with an empty one, upcasts integer
+    # columns to float even when none of their values are missing
+    for frame in [left, *right]:
+        for column, dtype in frame.dtypes.items():
+            if (
+                is_integer_dtype(dtype)
+                and df[column].dtype != dtype
+                and not df[column].isna().any()
+            ):
+                df[column] = df[column].astype(dtype)
     df.reset_index(inplace=True)
     return df
 
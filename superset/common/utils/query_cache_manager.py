@@ -17,20 +17,26 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
 
 from flask_caching import Cache
 from pandas import DataFrame
 
 from superset import app
 from superset.common.db_query_status import QueryStatus
+from superset.common.utils.cache_codec import decode_df, encode_df
 from superset.constants import CacheRegion
 from superset.exceptions import CacheLoadError
 from superset.extensions import cache_manager
 from superset.models.helpers import QueryResult
 from superset.stats_logger import BaseStatsLogger
-from superset.utils.cache import set_and_log_cache
+from superset.utils.cache import set_and_log_cache, set_many_and_log_cache
 from superset.utils.core import error_msg_from_exception, get_stacktrace
+from superset.utils.local_cache import local_data_cache
 
 config = app.config
 stats_logger: BaseStatsLogger = config["STATS_LOGGER"]
@@ -61,6 +67,7 @@ class QueryCacheManager:
         is_cached: Optional[bool] = None,
         cache_dttm: Optional[str] = None,
         cache_value: Optional[Dict[str, Any]] = None,
+        is_stale: bool = False,
     ) -> None:
         self.df = df
         self.query = query
@@ -74,6 +81,7 @@ class QueryCacheManager:
         self.is_cached = is_cached
         self.cache_dttm = cache_dttm
         self.cache_value = cache_value
+        self.is_stale = is_stale
 
     # pylint: disable=too-many-arguments
     def set_query_result(
@@ -85,6 +93,7 @@ class QueryCacheManager:
         timeout: Optional[int] = None,
         datasource_uid: Optional[str] = None,
         region: CacheRegion = CacheRegion.DEFAULT,
+        stale_timeout: int = 0,
     ) -> None:
         """
         Set dataframe of query-result to specific cache region
@@ -116,6 +125,7 @@ class QueryCacheManager:
                     timeout=timeout,
                     datasource_uid=datasource_uid,
                     region=region,
+                    stale_timeout=stale_timeout,
                 )
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
@@ -125,26 +135,39 @@ class QueryCacheManager:
             self.stacktrace = get_stacktrace()
 
     @classmethod
-    def get(
+    def get(  # pylint: disable=too-many-arguments
         cls,
         key: Optional[str],
         region: CacheRegion = CacheRegion.DEFAULT,
         force_query: Optional[bool] = False,
         force_cached: Optional[bool] = False,
+        row_offset: int = 0,
+        row_limit: Optional[int] = None,
+        cache_values: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
     ) -> "QueryCacheManager":
         """
-        Initialize QueryCacheManager by query-cache key
+        Initialize QueryCacheManager by query-cache key. When `row_offset` or
+        `row_limit` are specified, only that range of rows of the cached DataFrame
+        is loaded. Keys found in `cache_values`, as returned by `get_cache_values`,
+        aren't looked up in the cache again.
         """
         query_cache = cls()
         if not key or not _cache[region] or force_query:
             return query_cache
 
-        cache_value = _cache[region].get(key)
+        if cache_values is not None and key in cache_values:
+            cache_value = cache_values[key]
+            if cache_value and isinstance(cache_value.get("df"), DataFrame):
+                cache_value = {**cache_value, "df": cache_value["df"].copy()}
+        else:
+            cache_value = cls.get_cache_value(key, region)
         if cache_value:
             logger.info("Cache key: %s", key)
             stats_logger.incr("loading_from_cache")
             try:
-                query_cache.df = cache_value["df"]
+                query_cache.df = decode_df(
+                    cache_value["df"], row_offset=row_offset, row_limit=row_limit,
+                )
                 query_cache.query = cache_value["query"]
                 query_cache.annotation_data = cache_value.get("annotation_data", {})
                 query_cache.applied_template_filters = cache_value.get(
@@ -157,6 +180,7 @@ class QueryCacheManager:
                     cache_value["dttm"] if cache_value is not None else None
                 )
                 query_cache.cache_value = cache_value
+                query_cache.is_stale = is_stale(cache_value)
                 stats_logger.incr("loaded_from_cache")
             except KeyError as ex:
                 logger.exception(ex)
@@ -174,6 +198,191 @@ class QueryCacheManager:
             raise CacheLoadError("Error loading data from cache")
         return query_cache
 
+    @classmethod
+    def get_many(
+        cls,
+        keys: List[Optional[str]],
+        region: CacheRegion = CacheRegion.DEFAULT,
+        force_query: Optional[bool] = False,
+    ) -> Dict[str, "QueryCacheManager"]:
+        """
+        Initialize a QueryCacheManager for each query-cache key, looking all of them
+        up with a single call to the cache backend.
+        """
+        cache_values = {} if force_query else cls.get_cache_values(keys, region)
+        return {
+            key: cls.get(key, region, force_query, cache_values=cache_values)
+            for key in keys
+            if key
+        }
+
+    @classmethod
+    @contextmanager
+    def single_flight(  # pylint: disable=too-many-arguments
+        cls,
+        key: str,
+        region: CacheRegion = CacheRegion.DEFAULT,
+        force_query: Optional[bool] = False,
+        row_offset: int = 0,
+        row_limit: Optional[int] = None,
+    ) -> Iterator["QueryCacheManager"]:
+        """
+        Coalesce identical queries missing from the cache, across processes.
+
+        The first caller takes a short-lived lock on the key in the cache backend,
+        and is yielded an empty QueryCacheManager: it is expected to run the query
+        and cache its result before exiting the context, which releases the lock.
+        Concurrent callers wait up to `DATA_CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT`
+        seconds for that result and are yielded it, or an empty QueryCacheManager
+        if it didn't make it to the cache in time, in which case they run the query
+        themselves.
+        """
+        wait_timeout = config["DATA_CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT"]
+        if region != CacheRegion.DATA or not wait_timeout or force_query:
+            yield cls()
+            return
+
+        lock_key = f"{key}__lock"
+        token = uuid4().hex
+        try:
+            locked = _cache[region].add(
+                lock_key,
+                token,
+                timeout=config["DATA_CACHE_SINGLE_FLIGHT_LOCK_TIMEOUT"],
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not lock cache key %s", key)
+            logger.exception(ex)
+            yield cls()
+            return
+
+        if not locked:
+            stats_logger.incr("data_cache.single_flight.wait")
+            query_cache = cls.wait_for(
+                key,
+                lock_key,
+                region,
+                wait_timeout,
+                row_offset=row_offset,
+                row_limit=row_limit,
+            )
+            if query_cache.is_loaded:
+                stats_logger.incr("data_cache.single_flight.hit")
+            else:
+                stats_logger.incr("data_cache.single_flight.fallback")
+            yield query_cache
+            return
+
+        try:
+            yield cls()
+        finally:
+            try:
+                # don't release a lock that expired and was taken by someone else
+                if _cache[region].get(lock_key) == token:
+                    _cache[region].delete(lock_key)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning("Could not unlock cache key %s", key)
+                logger.exception(ex)
+
+    @classmethod
+    def wait_for(  # pylint: disable=too-many-arguments
+        cls,
+        key: str,
+        lock_key: str,
+        region: CacheRegion,
+        timeout: float,
+        row_offset: int = 0,
+        row_limit: Optional[int] = None,
+    ) -> "QueryCacheManager":
+        """
+        Poll the cache until `key` is set, `lock_key` is released or `timeout`
+        seconds have passed
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            time.sleep(
+                max(min(config["DATA_CACHE_SINGLE_FLIGHT_POLL_INTERVAL"], remaining), 0)
+            )
+            # the value is cached before the lock is released, check it afterwards
+            released = not _cache[region].get(lock_key)
+            query_cache = cls.get(
+                key, region, row_offset=row_offset, row_limit=row_limit
+            )
+            if (
+                (query_cache.is_loaded and not query_cache.is_stale)
+                or released
+                or time.monotonic() >= deadline
+            ):
+                return query_cache
+
+    @staticmethod
+    def get_cache_value(key: str, region: CacheRegion) -> Optional[Dict[str, Any]]:
+        """
+        Get the raw value of a cache key, from the process-local cache if possible
+        for the data region
+        """
+        if region != CacheRegion.DATA:
+            return _cache[region].get(key)
+
+        cache_value = local_data_cache.get(key)
+        if cache_value is not None:
+            stats_logger.incr("data_cache.local.hit")
+        else:
+            stats_logger.incr("data_cache.local.miss")
+            cache_value = _cache[region].get(key)
+            if not cache_value:
+                return cache_value
+            set_local_cache_value(key, cache_value)
+
+        if isinstance(cache_value.get("df"), DataFrame):
+            # DataFrames stored as-is are shared with the local cache, callers
+            # get a copy they are free to modify
+            cache_value = {**cache_value, "df": cache_value["df"].copy()}
+        return cache_value
+
+    @staticmethod
+    def get_cache_values(
+        keys: List[Optional[str]], region: CacheRegion = CacheRegion.DEFAULT
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get the raw values of many cache keys with a single call to the cache backend.
+        The values are shared with the process-local cache: pass them to `get` to
+        load them.
+
+        Data cache values are also kept in the process-local cache, and therefore
+        in the current request, so that subsequent calls to `get` for these keys
+        don't call the cache backend again.
+        """
+        unique_keys = [key for key in dict.fromkeys(keys) if key]
+        if not unique_keys or not _cache[region]:
+            return {}
+
+        if region != CacheRegion.DATA:
+            log_round_trips_saved(len(unique_keys) - 1)
+            return dict(zip(unique_keys, _cache[region].get_many(*unique_keys)))
+
+        cache_values: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing_keys = []
+        for key in unique_keys:
+            cache_value = local_data_cache.get(key)
+            if cache_value is None:
+                stats_logger.incr("data_cache.local.miss")
+                missing_keys.append(key)
+            else:
+                stats_logger.incr("data_cache.local.hit")
+                cache_values[key] = cache_value
+
+        if missing_keys:
+            log_round_trips_saved(len(missing_keys) - 1)
+            for key, cache_value in zip(
+                missing_keys, _cache[region].get_many(*missing_keys)
+            ):
+                cache_values[key] = cache_value or None
+                if cache_value:
+                    set_local_cache_value(key, cache_value)
+        return cache_values
+
     @staticmethod
     def set(
         key: Optional[str],
@@ -181,9 +390,107 @@ class QueryCacheManager:
         timeout: Optional[int] = None,
         datasource_uid: Optional[str] = None,
         region: CacheRegion = CacheRegion.DEFAULT,
+        stale_timeout: int = 0,
     ) -> None:
         """
         set value to specify cache region, proxy for `set_and_log_cache`
+
+        Data cache values are kept `stale_timeout` seconds longer in the cache after
+        they expire, to be served while they are being refreshed.
         """
         if key:
+            if region == CacheRegion.DATA:
+                if "df" in value:
+                    value = {**value, "df": encode_df(value["df"])}
+                # used to bound the lifetime and invalidate local cache entries
+                if timeout is None:
+                    timeout = config["CACHE_DEFAULT_TIMEOUT"]
+                value = {
+                    **value,
+                    "cache_timeout": timeout,
+                    "datasource_uid": datasource_uid,
+                }
+                if timeout and stale_timeout:
+                    timeout += stale_timeout
+                local_data_cache.delete(key)
             set_and_log_cache(_cache[region], key, value, timeout, datasource_uid)
+
+    @staticmethod
+    def set_many(  # pylint: disable=too-many-arguments
+        values: Dict[str, Dict[str, Any]],
+        timeout: Optional[int] = None,
+        datasource_uid: Optional[str] = None,
+        region: CacheRegion = CacheRegion.DEFAULT,
+        stale_timeout: int = 0,
+    ) -> None:
+        """
+        Set many values to the specified cache region with a single call to the cache
+        backend, pipelined by backends supporting it, as `set` would.
+        """
+        values = {key: value for key, value in values.items() if key}
+        if not values:
+            return
+
+        if region == CacheRegion.DATA:
+            if timeout is None:
+                timeout = config["CACHE_DEFAULT_TIMEOUT"]
+            values = {
+                key: {
+                    **value,
+                    **({"df": encode_df(value["df"])} if "df" in value else {}),
+                    "cache_timeout": timeout,
+                    "datasource_uid": datasource_uid,
+                }
+                for key, value in values.items()
+            }
+            if timeout and stale_timeout:
+                timeout += stale_timeout
+            for key in values:
+                local_data_cache.delete(key)
+        log_round_trips_saved(len(values) - 1)
+        set_many_and_log_cache(_cache[region], values, timeout, datasource_uid)
+
+
+def log_round_trips_saved(count: int) -> None:
+    """Count the calls to the cache backend saved by a call for many keys"""
+    if count > 0:
+        stats_logger.counter("cache.round_trips_saved", count=count)
+
+
+def set_local_cache_value(key: str, cache_value: Dict[str, Any]) -> None:
+    """Keep a data cache value in the process-local cache"""
+    evicted = local_data_cache.set(
+        key,
+        cache_value,
+        size=get_value_size(cache_value),
+        timeout=get_remaining_timeout(cache_value),
+        tag=cache_value.get("datasource_uid"),
+    )
+    if evicted:
+        stats_logger.incr("data_cache.local.evicted")
+
+
+def get_value_size(cache_value: Dict[str, Any]) -> int:
+    """Approximate size in bytes of a data cache value"""
+    df = cache_value.get("df")
+    if isinstance(df, bytes):
+        return len(df)
+    if isinstance(df, DataFrame):
+        return int(df.memory_usage(index=True, deep=True).sum())
+    return 0
+
+
+def get_remaining_timeout(cache_value: Dict[str, Any]) -> Optional[float]:
+    """Seconds until a data cache value expires from the data cache, if known"""
+    cache_timeout = cache_value.get("cache_timeout")
+    if not cache_timeout or "dttm" not in cache_value:
+        return None
+    cached_at = datetime.fromisoformat(cache_value["dttm"])
+    expires_at = cached_at + timedelta(seconds=cache_timeout)
+    return (expires_at - datetime.utcnow()).total_seconds()
+
+
+def is_stale(cache_value: Dict[str, Any]) -> bool:
+    """Whether a data cache value is only kept in the data cache to be served stale"""
+    remaining_timeout = get_remaining_timeout(cache_value)
+    return remaining_timeout is not None and remaining_timeout <= 0
@@ -48,7 +48,7 @@ from superset.stats_logger import DummyStatsLogger
 from superset.typing import CacheConfig
 from superset.utils.core import is_test, parse_boolean_string
 from superset.utils.encrypt import SQLAlchemyUtilsAdapter
-from superset.utils.log import DBEventLogger
+from superset.utils.log import BufferedDBEventLogger
 from superset.utils.logging_configurator import DefaultLoggingConfigurator
 
 logger = logging.getLogger(__name__)
@@ -59,9 +59,16 @@ if TYPE_CHECKING:
     from superset.connectors.sqla.models import SqlaTable
     from superset.models.core import Database
 
-# Realtime stats logger, a StatsD implementation exists
+# Realtime stats logger, a StatsD implementation exists, as well as a Prometheus one
+# exposing the tags of the metrics as labels, which requires `prometheus_client`:
+#   from superset.stats_logger import PrometheusStatsLogger
+#   STATS_LOGGER = PrometheusStatsLogger(port=9102)
+# serves the metrics on http://localhost:9102/metrics
 STATS_LOGGER = DummyStatsLogger()
-EVENT_LOGGER = DBEventLogger()
+# Logs of the actions of users, buffered and written to the logs table in batches
+# from a background thread. DBEventLogger() writes them in the session of the
+# request instead.
+EVENT_LOGGER = BufferedDBEventLogger()
 
 SUPERSET_LOG_VIEW = True
 
@@ -587,6 +594,50 @@ CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 # Cache for datasource metadata and query results
 DATA_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 
+# Maximum size in bytes of the process-local cache kept in front of the data cache,
+# which saves the network round trip and deserialization for keys that are read
+# repeatedly, e.g. by charts sharing a query. Set to 0 to disable it.
+DATA_CACHE_LOCAL_MAX_SIZE = 0
+# Maximum number of seconds values are kept in the process-local cache. Values never
+# outlive their entry in the data cache, but cache invalidations are only applied to
+# the local cache of the process handling them, so this should be kept short.
+DATA_CACHE_LOCAL_TIMEOUT = 60
+
+# Codec used to serialize the DataFrames stored in the data cache. "pickle" stores
+# the DataFrame as-is, leaving serialization to the cache backend, while "arrow"
+# (Arrow IPC) and "parquet" store compact columnar buffers which are considerably
+# faster to serialize and deserialize for large results.
+DATA_CACHE_CODEC = "pickle"
+# Compression used by the "arrow" ("lz4", "zstd" or None) and "parquet" codecs
+DATA_CACHE_CODEC_COMPRESSION: Optional[str] = "zstd"
+# Number of rows per independently readable chunk (Arrow record batch or Parquet
+# row group) for the "arrow" and "parquet" codecs. Smaller chunks make reading a
+# page of a large cached result cheaper. Set to 0 to store a single chunk.
+DATA_CACHE_CODEC_CHUNK_SIZE = 10000
+# When set, queries returning raw rows (no post-processing nor time comparison)
+# with a row limit smaller than this value, e.g. paginated table charts and
+# samples, are fetched and cached in aligned windows of this many rows. Following
+# pages are then sliced out of the cached window instead of querying the database.
+DATA_CACHE_ROW_WINDOW_SIZE: Optional[int] = None
+# Maximum number of seconds a chart data query missing from the data cache waits for
+# an identical query already running, in any process, to cache its result instead of
+# querying the database again. The query is run anyway once this timeout expires.
+# Requires a data cache backend supporting atomic adds (e.g. Redis, Memcached). Set
+# to 0 to disable query coalescing.
+DATA_CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT = 0
+# Number of seconds after which the lock held by a running query expires, letting
+# another request run it if the process holding the lock died
+DATA_CACHE_SINGLE_FLIGHT_LOCK_TIMEOUT = 120
+# Number of seconds between checks of the data cache while waiting for a query
+DATA_CACHE_SINGLE_FLIGHT_POLL_INTERVAL = 0.2
+# Serve chart data from the data cache for up to DATA_CACHE_STALE_TIMEOUT seconds
+# after it expired, while it is refreshed by a Celery worker, instead of having the
+# user wait for the query. Can be overridden for a dataset, through the
+# "stale_while_revalidate" key of its extra JSON, or for a chart, through the
+# "stale_while_revalidate" key of its form data. Requires Celery.
+DATA_CACHE_STALE_WHILE_REVALIDATE = False
+DATA_CACHE_STALE_TIMEOUT = int(timedelta(days=1).total_seconds())
+
 # Cache for dashboard filter state (`CACHE_TYPE` defaults to `SimpleCache` when
 #  running in debug mode unless overridden)
 FILTER_STATE_CACHE_CONFIG: CacheConfig = {
@@ -606,6 +657,17 @@ EXPLORE_FORM_DATA_CACHE_CONFIG: CacheConfig = {
 # store cache keys by datasource UID (via CacheKey) for custom processing/invalidation
 STORE_CACHE_KEYS_IN_METADATA_DB = False
 
+# Number of threads used to run independent queries concurrently, e.g. the query
+# objects of a single chart data request. Queries run serially when set to 0.
+MAX_PARALLEL_QUERY_THREADS = 0
+# Maximum number of the above queries running concurrently against a single
+# database, per process
+MAX_PARALLEL_QUERIES_PER_DATABASE = 4
+
+# Maximum number of query contexts accepted by a single request to the batch chart
+# data endpoint, `/api/v1/chart/data/batch`
+CHART_DATA_BATCH_MAX_QUERY_CONTEXTS = 100
+
 # CORS Options
 ENABLE_CORS = False
 CORS_OPTIONS: Dict[Any, Any] = {}
@@ -623,11 +685,24 @@ CSV_EXTENSIONS = {"csv", "tsv", "txt"}
 COLUMNAR_EXTENSIONS = {"parquet", "zip"}
 ALLOWED_EXTENSIONS = {*EXCEL_EXTENSIONS, *CSV_EXTENSIONS, *COLUMNAR_EXTENSIONS}
 
+# Uploaded files are read and loaded in the database in chunks of this number of
+# rows, with the bulk loading path of the database when it has one. The schema of
+# the table is inferred from the first chunk.
+DATA_UPLOAD_CHUNK_SIZE = 100000
+
 # CSV Options: key/value pairs that will be passed as argument to DataFrame.to_csv
 # method.
 # note: index option should not be overridden
 CSV_EXPORT = {"encoding": "utf-8"}
 
+# Exports of SQL Lab and chart results, in CSV, Parquet or Arrow, are streamed in
+# chunks of this number of rows
+DATA_EXPORT_CHUNK_SIZE = 10000
+# Compression of the Parquet exports: "snappy", "gzip", "zstd" or None
+DATA_EXPORT_COMPRESSION: Optional[str] = "snappy"
+# Gzip exports on the fly for clients accepting it
+DATA_EXPORT_GZIP = True
+
 # ---------------------------------------------------
 # Time grain configurations
 # ---------------------------------------------------
@@ -777,6 +852,14 @@ class CeleryConfig:  # pylint: disable=too-few-public-methods
             "task": "reports.prune_log",
             "schedule": crontab(minute=0, hour=0),
         },
+        "log_rollup.rollup": {
+            "task": "log_rollup.rollup",
+            "schedule": crontab(minute="*/5", hour="*"),
+        },
+        "log_rollup.prune": {
+            "task": "log_rollup.prune",
+            "schedule": crontab(minute=30, hour=0),
+        },
     }
 
 
@@ -785,6 +868,29 @@ CELERY_CONFIG = CeleryConfig  # pylint: disable=invalid-name
 # Set celery config to None to disable all the above configuration
 # CELERY_CONFIG = None
 
+# User the `cache-warmup` task runs chart queries as
+CACHE_WARMUP_USER = "admin"
+# Dispatch each chart warmed up by the `cache-warmup` task as a separate Celery task,
+# spreading them across workers, instead of warming them all up in the worker running
+# the warmup. Requires a Celery result backend to gather the summary of the warmup.
+CACHE_WARMUP_FAN_OUT = False
+
+# The `log_rollup.rollup` task counts the actions logged to the `logs` table per hour
+# and per day, action, user, dashboard and chart. The `top_n_dashboards` cache warmup
+# strategy and the recent activity of users read these counters, along with the logs
+# not counted yet, instead of the whole `logs` table.
+# Number of logs counted, or pruned, per transaction
+LOG_ROLLUP_BATCH_SIZE = 50000
+# Logs are only counted once older than this many seconds, as logs written
+# concurrently may be committed out of the order of their ids
+LOG_ROLLUP_LAG = 60
+# Days after which the `log_rollup.prune` task deletes hourly counters. Daily
+# counters are kept.
+LOG_ROLLUP_HOURLY_RETENTION_DAYS = 30
+# Days after which the `log_rollup.prune` task deletes the logs counted already.
+# None keeps all the logs.
+LOG_RETENTION_DAYS: Optional[int] = None
+
 # Additional static HTTP headers to be served by your Superset server. Note
 # Flask-Talisman applies the relevant security HTTP headers.
 #
@@ -811,6 +917,17 @@ SQLLAB_DEFAULT_DBID = None
 # The MAX duration a query can run for before being killed by celery.
 SQLLAB_ASYNC_TIME_LIMIT_SEC = int(timedelta(hours=6).total_seconds())
 
+# When set, SQL Lab fetches results from the cursor in batches of this many rows,
+# converting each batch to Arrow as it arrives. Peak memory when fetching large
+# results is then proportional to the batch size rather than to the result size.
+SQLLAB_FETCH_BATCH_SIZE: Optional[int] = None
+
+# Whether SQL Lab queries use the pooled connections of the databases, see
+# DATABASE_ENGINE_POOL. Off by default, as statements run in SQL Lab, such as SET,
+# can change the state of the session of a connection, which would then leak to
+# the next queries of the pool.
+SQLLAB_POOL_CONNECTIONS = False
+
 # Some databases support running EXPLAIN queries that allow users to estimate
 # query costs before they run. These EXPLAIN queries should have a small
 # timeout.
@@ -885,6 +1002,15 @@ RESULTS_BACKEND: Optional[BaseCache] = None
 # in order to disable should breaking issues be discovered.
 RESULTS_BACKEND_USE_MSGPACK = True
 
+# Store query results in the results backend as pages of compressed Arrow IPC record
+# batches, so that only the rows being displayed or exported are fetched and
+# deserialized. Takes precedence over RESULTS_BACKEND_USE_MSGPACK.
+RESULTS_BACKEND_USE_ARROW = True
+# Compression of the Arrow record batches: "zstd", "lz4" or None
+RESULTS_BACKEND_ARROW_COMPRESSION: Optional[str] = "zstd"
+# Number of rows of each page stored under its own results backend key
+RESULTS_BACKEND_ARROW_PAGE_SIZE = 10000
+
 # The S3 bucket where you want to store your external hive tables created
 # from CSV files. For example, 'companyname-superset'
 CSV_TO_HIVE_UPLOAD_S3_BUCKET = None
@@ -1047,6 +1173,26 @@ DASHBOARD_TEMPLATE_ID = None
 # as such `create_engine(url, **params)`
 DB_CONNECTION_MUTATOR = None
 
+# The engines of the analytics databases are kept in a process-wide registry, per
+# database, effective URL, impersonated user and engine parameters, so that their
+# connections are pooled and reused. These are the default parameters of their
+# pool, which the "engine_params" of the extra of a database override, for
+# instance {"engine_params": {"pool_size": 10}}. DB_CONNECTION_MUTATOR can still
+# set the "poolclass" param to sqlalchemy.pool.NullPool to disable pooling.
+DATABASE_ENGINE_POOL: Dict[str, Any] = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    # recycle connections before the database or a proxy closes them
+    "pool_recycle": 3600,
+    # check connections are alive before using them
+    "pool_pre_ping": True,
+}
+# Engines unused for this number of seconds are disposed, along with their pool
+DATABASE_ENGINE_REGISTRY_IDLE_TIMEOUT: Optional[int] = 3600
+# The maximum number of engines kept per process, the least recently used ones
+# being disposed, e.g. when impersonating many users
+DATABASE_ENGINE_REGISTRY_MAX_ENGINES: Optional[int] = 100
+
 
 # A function that intercepts the SQL to be executed and can alter it.
 # The use case is can be around adding some sort of comment header
@@ -1233,6 +1379,15 @@ TALISMAN_CONFIG = {
 # }
 RLS_FORM_QUERY_REL_FIELDS: Optional[Dict[str, List[List[Any]]]] = None
 
+# Number of seconds the row level security filters applying to a set of roles are
+# kept in the cache defined by CACHE_CONFIG. They are invalidated whenever row level
+# security filters are changed. Set to 0 to query them for every request.
+RLS_FILTERS_CACHE_TIMEOUT = int(timedelta(minutes=10).total_seconds())
+# Number of seconds the permissions granted by a set of roles are kept in the cache
+# defined by CACHE_CONFIG. They are invalidated whenever roles or permissions are
+# changed. Set to 0 to query them for every request.
+PERMISSIONS_CACHE_TIMEOUT = int(timedelta(minutes=10).total_seconds())
+
 #
 # Flask session cookie options
 #
@@ -54,11 +54,9 @@ class ConnectorRegistry:
         if datasource_type not in cls.sources:
             raise DatasetNotFoundError()
 
-        datasource = (
-            session.query(cls.sources[datasource_type])
-            .filter_by(id=datasource_id)
-            .one_or_none()
-        )
+        # a primary key lookup, served from the session's identity map when the
+        # datasource was already loaded, e.g. along with the other dashboard datasets
+        datasource = session.query(cls.sources[datasource_type]).get(datasource_id)
 
         if not datasource:
             raise DatasetNotFoundError()
@@ -63,7 +63,14 @@ from sqlalchemy import (
     update,
 )
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import backref, Query, relationship, RelationshipProperty, Session
+from sqlalchemy.orm import (
+    backref,
+    object_session,
+    Query,
+    relationship,
+    RelationshipProperty,
+    Session,
+)
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.schema import UniqueConstraint
 from sqlalchemy.sql import column, ColumnElement, literal_column, table
@@ -106,8 +113,10 @@ from superset.utils.core import (
     QueryObjectFilterClause,
     remove_duplicates,
 )
+from superset.utils.local_cache import local_data_cache, memoize_in_request
 
 config = app.config
+stats_logger = config["STATS_LOGGER"]
 metadata = Model.metadata  # pylint: disable=no-member
 logger = logging.getLogger(__name__)
 
@@ -1575,7 +1584,9 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
 
     def query(self, query_obj: QueryObjectDict) -> QueryResult:
         qry_start_dttm = datetime.now()
-        query_str_ext = self.get_query_str_extended(query_obj)
+        stats_tags = {"datasource": self.uid, "database": str(self.database_id)}
+        with stats_logger.timer("sqla.compile", stats_tags):
+            query_str_ext = self.get_query_str_extended(query_obj)
         sql = query_str_ext.sql
         status = QueryStatus.SUCCESS
         errors = None
@@ -1607,7 +1618,9 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
             return df
 
         try:
-            df = self.database.get_df(sql, self.schema, mutator=assign_column_label)
+            df = self.database.get_df(
+                sql, self.schema, mutator=assign_column_label, stats_tags=stats_tags
+            )
         except Exception as ex:  # pylint: disable=broad-except
             df = pd.DataFrame()
             status = QueryStatus.FAILED
@@ -1734,12 +1747,21 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
         :param query_obj: query object to analyze
         :return: True if there are call(s) to an `ExtraCache` method, False otherwise
         """
+        extras = query_obj.get("extras", {})
+        # the analysis only depends on the dataset and these extras, all the query
+        # objects of a request sharing them are analyzed once
+        return memoize_in_request(
+            "has_extra_cache_key_calls",
+            (self.uid, self.changed_on, extras.get("where"), extras.get("having")),
+            lambda: self._has_extra_cache_key_calls(extras),
+        )
+
+    def _has_extra_cache_key_calls(self, extras: Dict[str, Any]) -> bool:
         templatable_statements: List[str] = []
         if self.sql:
             templatable_statements.append(self.sql)
         if self.fetch_values_predicate:
             templatable_statements.append(self.fetch_values_predicate)
-        extras = query_obj.get("extras", {})
         if "where" in extras:
             templatable_statements.append(extras["where"])
         if "having" in extras:
@@ -2273,10 +2295,21 @@ class SqlaTable(Model, BaseDatasource):  # pylint: disable=too-many-public-metho
         dataset.is_physical = target.sql is None
 
 
+def invalidate_local_data_cache(
+    _mapper: Mapper, _connection: Connection, target: SqlaTable
+) -> None:
+    """
+    Cached results of the previous version of the table are keyed on its former
+    `changed_on` and can't be read anymore, drop them from the local cache.
+    """
+    local_data_cache.delete_tag(target.uid)
+
+
 sa.event.listen(SqlaTable, "before_update", SqlaTable.before_update)
 sa.event.listen(SqlaTable, "after_insert", SqlaTable.after_insert)
 sa.event.listen(SqlaTable, "after_delete", SqlaTable.after_delete)
 sa.event.listen(SqlaTable, "after_update", SqlaTable.after_update)
+sa.event.listen(SqlaTable, "after_update", invalidate_local_data_cache)
 sa.event.listen(SqlMetric, "after_update", SqlaTable.update_table)
 sa.event.listen(TableColumn, "after_update", SqlaTable.update_table)
 
@@ -2318,3 +2351,13 @@ class RowLevelSecurityFilter(Model, AuditMixinNullable):
     )
 
     clause = Column(Text, nullable=False)
+
+
+def invalidate_rls_rules(
+    _mapper: Mapper, _connection: Connection, target: RowLevelSecurityFilter
+) -> None:
+    security_manager.invalidate_rls_rules(object_session(target))
+
+
+for event in ("after_insert", "after_update", "after_delete"):
+    sa.event.listen(RowLevelSecurityFilter, event, invalidate_rls_rules)
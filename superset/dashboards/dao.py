@@ -53,7 +53,14 @@ class DashboardDAO(BaseDAO):
 
     @staticmethod
     def get_charts_for_dashboard(id_or_slug: str) -> List[Slice]:
-        return DashboardDAO.get_by_id_or_slug(id_or_slug).slices
+        dashboard = DashboardDAO.get_by_id_or_slug(id_or_slug)
+        # load the datasets of all the charts with a query per datasource type, each
+        # chart then resolves, and memoizes, its own from the session's identity map
+        datasources = dashboard.get_datasources_by_key()
+        for chart in dashboard.slices:
+            if (chart.cls_model, chart.datasource_id) in datasources:
+                chart.datasource  # pylint: disable=pointless-statement
+        return dashboard.slices
 
     @staticmethod
     def get_dashboard_changed_on(
@@ -118,9 +125,9 @@ class DashboardDAO(BaseDAO):
             else id_or_slug_or_dashboard
         )
         dashboard_changed_on = DashboardDAO.get_dashboard_changed_on(dashboard)
-        datasources = dashboard.datasources
+        datasources = dashboard.get_datasources_changed_on()
         datasources_changed_on = max(
-            [datasource.changed_on for datasource in datasources]
+            [changed_on for _, _, changed_on in datasources]
             + ([datetime.fromtimestamp(0)] if len(datasources) == 0 else [])
         )
         # drop microseconds in datetime to match with last_modified header
@@ -30,6 +30,7 @@ from superset.databases.commands.exceptions import (
     DatabaseNotFoundError,
 )
 from superset.databases.dao import DatabaseDAO
+from superset.extensions import engine_registry
 from superset.models.core import Database
 from superset.reports.dao import ReportScheduleDAO
 
@@ -49,6 +50,7 @@ class DeleteDatabaseCommand(BaseCommand):
         except DAODeleteFailedError as ex:
             logger.exception(ex.exception)
             raise DatabaseDeleteFailedError() from ex
+        engine_registry.dispose(database.id)
         return database
 
     def validate(self) -> None:
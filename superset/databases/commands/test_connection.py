@@ -75,7 +75,7 @@ class TestConnectionDatabaseCommand(BaseCommand):
             database.set_sqlalchemy_uri(uri)
             database.db_engine_spec.mutate_db_for_connection_test(database)
             username = self._actor.username if self._actor is not None else None
-            engine = database.get_sqla_engine(user_name=username)
+            engine = database.get_sqla_engine(nullpool=True, user_name=username)
             event_logger.log_with_context(
                 action="test_connection_attempt",
                 engine=database.db_engine_spec.__name__,
@@ -31,7 +31,7 @@ from superset.databases.commands.exceptions import (
     DatabaseUpdateFailedError,
 )
 from superset.databases.dao import DatabaseDAO
-from superset.extensions import db, security_manager
+from superset.extensions import db, engine_registry, security_manager
 from superset.models.core import Database
 
 logger = logging.getLogger(__name__)
@@ -62,6 +62,8 @@ class UpdateDatabaseCommand(BaseCommand):
                     "schema_access", security_manager.get_schema_perm(database, schema)
                 )
             db.session.commit()
+            # the engines of the former connection are no longer needed
+            engine_registry.dispose(database.id)
 
         except DAOUpdateFailedError as ex:
             logger.exception(ex.exception)
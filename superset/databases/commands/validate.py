@@ -114,7 +114,7 @@ class ValidateDatabaseParametersCommand(BaseCommand):
         database.set_sqlalchemy_uri(sqlalchemy_uri)
         database.db_engine_spec.mutate_db_for_connection_test(database)
         username = self._actor.username if self._actor is not None else None
-        engine = database.get_sqla_engine(user_name=username)
+        engine = database.get_sqla_engine(nullpool=True, user_name=username)
         try:
             with closing(engine.raw_connection()) as conn:
                 alive = engine.dialect.do_ping(conn)
@@ -24,6 +24,8 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Match,
     NamedTuple,
@@ -45,7 +47,7 @@ from flask_babel import gettext as __, lazy_gettext as _
 from marshmallow import fields, Schema
 from marshmallow.validate import Range
 from sqlalchemy import column, select, types
-from sqlalchemy.engine.base import Engine
+from sqlalchemy.engine.base import Connection, Engine
 from sqlalchemy.engine.interfaces import Compiled, Dialect
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import make_url, URL
@@ -313,6 +315,14 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
 
     force_column_alias_quotes = False
     arraysize = 0
+    # Whether results can be fetched from the cursor in batches with `fetchmany`,
+    # see `fetch_data_in_batches`. Engines relying on custom logic in `fetch_data`
+    # should disable this.
+    allows_streaming_fetch = True
+    # Whether uploaded files can be loaded chunk after chunk, see `dfs_to_sql`.
+    # Engines uploading the whole DataFrame at once in `df_to_sql` should disable
+    # this.
+    supports_chunked_upload = True
     max_column_name_length = 0
     try_remove_schema_from_table_name = True  # pylint: disable=invalid-name
     run_multiple_statements_as_one = False
@@ -376,7 +386,7 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
     ) -> Engine:
         user_name = utils.get_username()
         return database.get_sqla_engine(
-            schema=schema, nullpool=True, user_name=user_name, source=source
+            schema=schema, user_name=user_name, source=source
         )
 
     @classmethod
@@ -547,6 +557,33 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         except Exception as ex:
             raise cls.get_dbapi_mapped_exception(ex)
 
+    @classmethod
+    def fetch_data_in_batches(
+        cls, cursor: Any, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Fetch the results of the cursor in batches of at most `batch_size` rows,
+        so that the whole result never needs to be held in memory as Python objects.
+
+        :param cursor: Cursor instance
+        :param batch_size: Maximum number of rows to fetch per batch
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Iterator over batches of rows
+        """
+        if cls.arraysize:
+            cursor.arraysize = cls.arraysize
+        fetched = 0
+        while limit is None or fetched < limit:
+            size = batch_size if limit is None else min(batch_size, limit - fetched)
+            try:
+                rows = cursor.fetchmany(size)
+            except Exception as ex:
+                raise cls.get_dbapi_mapped_exception(ex)
+            if not rows:
+                return
+            fetched += len(rows)
+            yield rows
+
     @classmethod
     def expand_data(
         cls, columns: List[Dict[Any, Any]], data: List[Dict[Any, Any]]
@@ -807,6 +844,92 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
 
         df.to_sql(con=engine, **to_sql_kwargs)
 
+    @classmethod
+    def dfs_to_sql(
+        cls,
+        database: "Database",
+        table: Table,
+        dfs: Iterable[pd.DataFrame],
+        to_sql_kwargs: Dict[str, Any],
+    ) -> int:
+        """
+        Upload the chunks of data of a file to a database.
+
+        The table is created with the schema inferred from the first chunk, then each
+        chunk is loaded with `bulk_insert` within a single transaction, so that the
+        whole file is never held in memory. Engines which don't support chunked
+        uploads load the whole data at once with `df_to_sql`.
+
+        Note this method does not create metadata for the table.
+
+        :param database: The database to upload the data to
+        :param table: The table to upload the data to
+        :param dfs: The chunks of data to be uploaded
+        :param to_sql_kwargs: The `if_exists`, `index` and `index_label` kwargs of
+            the `pandas.DataFrame.to_sql` method
+        :return: The number of uploaded rows
+        """
+        if not cls.supports_chunked_upload:
+            df = pd.concat(dfs)
+            cls.df_to_sql(database, table, df, to_sql_kwargs)
+            return len(df.index)
+
+        engine = cls.get_engine(database)
+        sample_dtypes: Optional[pd.Series] = None
+        row_count = 0
+        with engine.begin() as connection:
+            for df in dfs:
+                if to_sql_kwargs.get("index"):
+                    df = _index_to_columns(df, to_sql_kwargs.get("index_label"))
+                if sample_dtypes is None:
+                    df = df.infer_objects()
+                    sample_dtypes = df.dtypes
+                    df.head(0).to_sql(
+                        con=connection,
+                        name=table.table,
+                        schema=table.schema or None,
+                        if_exists=to_sql_kwargs.get("if_exists", "fail"),
+                        index=False,
+                    )
+                else:
+                    df = _cast_to_sample_dtypes(df, sample_dtypes)
+
+                cls.bulk_insert(database, connection, table, df)
+                row_count += len(df.index)
+                logger.info("Uploaded %i rows to %s", row_count, table)
+        return row_count
+
+    @classmethod
+    def bulk_insert(  # pylint: disable=unused-argument
+        cls,
+        database: "Database",
+        connection: Connection,
+        table: Table,
+        df: pd.DataFrame,
+    ) -> None:
+        """
+        Insert a chunk of data of an upload in an existing table, within the
+        transaction of the connection.
+
+        This calls the `pandas.DataFrame.to_sql` method, inserting many rows per
+        statement when the dialect supports it. Can be overridden for engines with a
+        faster bulk loading path.
+
+        :param database: The database to upload the data to
+        :param connection: The connection of the upload transaction
+        :param table: The table to upload the data to
+        :param df: The chunk of data, with the columns of the table
+        """
+        df.to_sql(
+            con=connection,
+            name=table.table,
+            schema=table.schema or None,
+            if_exists="append",
+            index=False,
+            chunksize=1000,
+            method="multi" if connection.dialect.supports_multivalues_insert else None,
+        )
+
     @classmethod
     def convert_dttm(  # pylint: disable=unused-argument
         cls, target_type: str, dttm: datetime, db_extra: Optional[Dict[str, Any]] = None
@@ -1501,6 +1624,34 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         return [str(s).strip(" ;") for s in sqlparse.parse(sql)]
 
 
+def _index_to_columns(
+    df: pd.DataFrame, index_label: Optional[Union[str, List[str]]] = None
+) -> pd.DataFrame:
+    """Turn the index of a DataFrame into columns named like `DataFrame.to_sql` does"""
+    if index_label:
+        names = [index_label] if isinstance(index_label, str) else list(index_label)
+    elif df.index.nlevels == 1:
+        names = [df.index.name or "index"]
+    else:
+        names = [name or f"level_{i}" for i, name in enumerate(df.index.names)]
+    return df.rename_axis(names).reset_index()
+
+
+def _cast_to_sample_dtypes(df: pd.DataFrame, sample_dtypes: pd.Series) -> pd.DataFrame:
+    """
+    Cast the integer columns of the sample that became float in a chunk, because of
+    missing values, to nullable integers so that they still match the table.
+    """
+    columns = {
+        column: "Int64"
+        for column, dtype in sample_dtypes.items()
+        if column in df.columns
+        and pd.api.types.is_integer_dtype(dtype)
+        and pd.api.types.is_float_dtype(df[column].dtype)
+    }
+    return df.astype(columns) if columns else df
+
+
 # schema for adding a database by providing parameters instead of the
 # full SQLAlchemy URI
 class BasicParametersSchema(Schema):
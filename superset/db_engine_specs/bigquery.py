@@ -101,6 +101,9 @@ class BigQueryEngineSpec(BaseEngineSpec):
 
     allows_hidden_cc_in_orderby = True
 
+    # `df_to_sql` uploads the whole DataFrame with `pandas_gbq`
+    supports_chunked_upload = False
+
     """
     https://www.python.org/dev/peps/pep-0249/#arraysize
     raw_connections bypass the pybigquery query execution context and deal with
@@ -112,6 +115,8 @@ class BigQueryEngineSpec(BaseEngineSpec):
     https://github.com/mxmzdlv/pybigquery/blob/d214bb089ca0807ca9aaa6ce4d5a01172d40264e/pybigquery/sqlalchemy_bigquery.py#L102
     """
     arraysize = 5000
+    # `fetch_data` unpacks BigQuery `Row` objects
+    allows_streaming_fetch = False
 
     _date_trunc_functions = {
         "DATE": "DATE_TRUNC",
@@ -91,6 +91,10 @@ class HiveEngineSpec(PrestoEngineSpec):
     max_column_name_length = 767
     allows_alias_to_source_column = True
     allows_hidden_ordeby_agg = False
+    # `fetch_data` polls the operation state before fetching
+    allows_streaming_fetch = False
+    # `df_to_sql` stores the whole DataFrame as a Parquet file
+    supports_chunked_upload = False
 
     # When running `SHOW FUNCTIONS`, what is the name of the column with the
     # function names?
@@ -15,10 +15,12 @@
 # specific language governing permissions and limitations
 # under the License.
 import re
+import tempfile
 from datetime import datetime
-from typing import Any, Dict, Optional, Pattern, Tuple
+from typing import Any, Dict, Optional, Pattern, Tuple, TYPE_CHECKING
 from urllib import parse
 
+import pandas as pd
 from flask_babel import gettext as __
 from sqlalchemy.dialects.mysql import (
     BIT,
@@ -32,7 +34,9 @@ from sqlalchemy.dialects.mysql import (
     TINYINT,
     TINYTEXT,
 )
+from sqlalchemy.engine.base import Connection
 from sqlalchemy.engine.url import URL
+from sqlalchemy.sql import text
 
 from superset.db_engine_specs.base import (
     BaseEngineSpec,
@@ -41,9 +45,13 @@ from superset.db_engine_specs.base import (
 )
 from superset.errors import SupersetErrorType
 from superset.models.sql_lab import Query
+from superset.sql_parse import Table
 from superset.utils import core as utils
 from superset.utils.core import ColumnSpec, GenericDataType
 
+if TYPE_CHECKING:
+    from superset.models.core import Database
+
 # Regular expressions to catch custom errors
 CONNECTION_ACCESS_DENIED_REGEX = re.compile(
     "Access denied for user '(?P<username>.*?)'@'(?P<hostname>.*?)'"
@@ -158,6 +166,62 @@ class MySQLEngineSpec(BaseEngineSpec, BasicParametersMixin):
             return f"""STR_TO_DATE('{datetime_formatted}', '%Y-%m-%d %H:%i:%s.%f')"""
         return None
 
+    @classmethod
+    def bulk_insert(
+        cls,
+        database: "Database",
+        connection: Connection,
+        table: Table,
+        df: pd.DataFrame,
+    ) -> None:
+        """
+        Load the chunks of data of uploads with `LOAD DATA LOCAL INFILE` when the
+        `local_infile` connect arg of the database enables it, which the server
+        must allow as well, and with `INSERT` statements otherwise.
+
+        Note empty strings are loaded as NULL, as with the CSV files themselves.
+        """
+        connect_args = (
+            database.get_extra().get("engine_params", {}).get("connect_args", {})
+        )
+        if not connect_args.get("local_infile"):
+            super().bulk_insert(database, connection, table, df)
+            return
+
+        preparer = connection.dialect.identifier_preparer
+        full_table_name = preparer.quote(table.table)
+        if table.schema:
+            full_table_name = f"{preparer.quote_schema(table.schema)}.{full_table_name}"
+        variables = [f"@c{idx}" for idx in range(len(df.columns))]
+        assignments = ", ".join(
+            f"{preparer.quote(str(column))} = NULLIF({variable}, '')"
+            for column, variable in zip(df.columns, variables)
+        )
+        # booleans are loaded in TINYINT columns
+        df = df.astype(
+            {
+                column: int
+                for column, dtype in df.dtypes.items()
+                if pd.api.types.is_bool_dtype(dtype)
+            }
+        )
+
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", encoding="utf-8", newline=""
+        ) as file:
+            df.to_csv(file, index=False, header=False)
+            file.flush()
+            connection.execute(
+                text(
+                    f"LOAD DATA LOCAL INFILE :path INTO TABLE {full_table_name} "
+                    "CHARACTER SET utf8mb4 "
+                    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                    "ESCAPED BY '' LINES TERMINATED BY '\\n' "
+                    f"({', '.join(variables)}) SET {assignments}"
+                ),
+                path=file.name,
+            )
+
     @classmethod
     def adjust_database_uri(
         cls, uri: URL, selected_schema: Optional[str] = None
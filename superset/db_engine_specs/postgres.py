@@ -14,15 +14,19 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import io
 import json
 import logging
 import re
+from contextlib import closing
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Pattern, Tuple, TYPE_CHECKING
 
+import pandas as pd
 from flask_babel import gettext as __
 from sqlalchemy.dialects.postgresql import ARRAY, DOUBLE_PRECISION, ENUM, JSON
 from sqlalchemy.dialects.postgresql.base import PGInspector
+from sqlalchemy.engine.base import Connection
 from sqlalchemy.types import String
 
 from superset.db_engine_specs.base import (
@@ -33,6 +37,7 @@ from superset.db_engine_specs.base import (
 from superset.errors import SupersetErrorType
 from superset.exceptions import SupersetException
 from superset.models.sql_lab import Query
+from superset.sql_parse import Table
 from superset.utils import core as utils
 from superset.utils.core import ColumnSpec, GenericDataType
 
@@ -192,6 +197,41 @@ class PostgresEngineSpec(PostgresBaseEngineSpec, BasicParametersMixin):
         (re.compile(r"^enum.*", re.IGNORECASE), ENUM(), GenericDataType.STRING,),
     )
 
+    @classmethod
+    def bulk_insert(
+        cls,
+        database: "Database",
+        connection: Connection,
+        table: Table,
+        df: pd.DataFrame,
+    ) -> None:
+        """
+        Load the chunks of data of uploads with `COPY FROM STDIN`, far faster than
+        `INSERT` statements, which drivers without `copy_expert` fall back to.
+
+        Note empty strings are loaded as NULL, as with the CSV files themselves.
+        """
+        cursor = connection.connection.cursor()
+        if not hasattr(cursor, "copy_expert"):
+            cursor.close()
+            super().bulk_insert(database, connection, table, df)
+            return
+
+        preparer = connection.dialect.identifier_preparer
+        full_table_name = preparer.quote(table.table)
+        if table.schema:
+            full_table_name = f"{preparer.quote_schema(table.schema)}.{full_table_name}"
+        columns = ", ".join(preparer.quote(str(column)) for column in df.columns)
+
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        with closing(cursor):
+            cursor.copy_expert(
+                f"COPY {full_table_name} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+
     @classmethod
     def get_allow_cost_estimate(cls, extra: Dict[str, Any]) -> bool:
         return True
@@ -18,11 +18,14 @@ import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Pattern, Tuple, TYPE_CHECKING
 
+import pandas as pd
 from flask_babel import gettext as __
+from sqlalchemy.engine.base import Connection
 from sqlalchemy.engine.reflection import Inspector
 
 from superset.db_engine_specs.base import BaseEngineSpec
 from superset.errors import SupersetErrorType
+from superset.sql_parse import Table
 from superset.utils import core as utils
 
 if TYPE_CHECKING:
@@ -96,6 +99,27 @@ class SqliteEngineSpec(BaseEngineSpec):
             )
         raise Exception(f"Unsupported datasource_type: {datasource_type}")
 
+    @classmethod
+    def bulk_insert(
+        cls,
+        database: "Database",
+        connection: Connection,
+        table: Table,
+        df: pd.DataFrame,
+    ) -> None:
+        """
+        SQLite limits the number of variables of a statement, the rows of the chunks
+        of uploads are inserted with `executemany` instead, within the transaction of
+        the upload.
+        """
+        df.to_sql(
+            con=connection,
+            name=table.table,
+            schema=table.schema or None,
+            if_exists="append",
+            index=False,
+        )
+
     @classmethod
     def convert_dttm(
         cls, target_type: str, dttm: datetime, db_extra: Optional[Dict[str, Any]] = None
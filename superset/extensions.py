@@ -30,6 +30,7 @@ from werkzeug.local import LocalProxy
 from superset.utils.async_query_manager import AsyncQueryManager
 from superset.utils.cache_manager import CacheManager
 from superset.utils.encrypt import EncryptedFieldFactory
+from superset.utils.engine_registry import EngineRegistry
 from superset.utils.feature_flag_manager import FeatureFlagManager
 from superset.utils.machine_auth import MachineAuthProviderFactory
 from superset.utils.profiler import SupersetProfiler
@@ -113,6 +114,7 @@ csrf = CSRFProtect()
 db = SQLA()
 _event_logger: Dict[str, Any] = {}
 encrypted_field_factory = EncryptedFieldFactory()
+engine_registry = EngineRegistry()
 event_logger = LocalProxy(lambda: _event_logger.get("event_logger"))
 feature_flag_manager = FeatureFlagManager()
 machine_auth_provider_factory = MachineAuthProviderFactory()
@@ -40,6 +40,7 @@ from superset.extensions import (
     csrf,
     db,
     encrypted_field_factory,
+    engine_registry,
     feature_flag_manager,
     machine_auth_provider_factory,
     manifest_processor,
@@ -558,6 +559,7 @@ class SupersetAppInitializer:  # pylint: disable=too-many-public-methods
         self.configure_feature_flags()
         self.configure_db_encrypt()
         self.setup_db()
+        self.configure_engine_registry()
         self.configure_celery()
         self.enable_profiling()
         self.setup_event_logger()
@@ -590,6 +592,9 @@ class SupersetAppInitializer:  # pylint: disable=too-many-public-methods
         cache_manager.init_app(self.superset_app)
         results_backend_manager.init_app(self.superset_app)
 
+    def configure_engine_registry(self) -> None:
+        engine_registry.init_app(self.superset_app)
+
     def configure_feature_flags(self) -> None:
         feature_flag_manager.init_app(self.superset_app)
 
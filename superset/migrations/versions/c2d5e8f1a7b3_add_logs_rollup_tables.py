@@ -0,0 +1,69 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""add_logs_rollup_tables
+
+Revision ID: c2d5e8f1a7b3
+Revises: 7293b0ca7944
+Create Date: 2022-03-10 11:02:41.513627
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "c2d5e8f1a7b3"
+down_revision = "7293b0ca7944"
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def upgrade():
+    op.create_table(
+        "logs_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("granularity", sa.String(length=8), nullable=False),
+        sa.Column("period_start", sa.DateTime(), nullable=False),
+        sa.Column("action", sa.String(length=512), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("dashboard_id", sa.Integer(), nullable=True),
+        sa.Column("slice_id", sa.Integer(), nullable=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("last_dttm", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_logs_rollup_period", "logs_rollup", ["granularity", "period_start"]
+    )
+    op.create_index(
+        "ix_logs_rollup_user",
+        "logs_rollup",
+        ["user_id", "granularity", "period_start"],
+    )
+    op.create_table(
+        "logs_rollup_checkpoint",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("last_log_id", sa.Integer(), nullable=False),
+        sa.Column("changed_on", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("logs_rollup_checkpoint")
+    op.drop_index("ix_logs_rollup_user", table_name="logs_rollup")
+    op.drop_index("ix_logs_rollup_period", table_name="logs_rollup")
+    op.drop_table("logs_rollup")
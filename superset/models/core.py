@@ -24,7 +24,7 @@ from ast import literal_eval
 from contextlib import closing
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
 
 import numpy
 import pandas as pd
@@ -34,9 +34,9 @@ from flask_appbuilder import Model
 from sqlalchemy import (
     Boolean,
     Column,
-    create_engine,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     MetaData,
     String,
@@ -55,7 +55,12 @@ from sqlalchemy.sql import expression, Select
 
 from superset import app, db_engine_specs, is_feature_enabled
 from superset.db_engine_specs.base import TimeGrain
-from superset.extensions import cache_manager, encrypted_field_factory, security_manager
+from superset.extensions import (
+    cache_manager,
+    encrypted_field_factory,
+    engine_registry,
+    security_manager,
+)
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.tags import FavStarUpdater
 from superset.result_set import SupersetResultSet
@@ -335,21 +340,17 @@ class Database(
                 effective_username = g.user.username
         return effective_username
 
-    @memoized(
-        watch=(
-            "impersonate_user",
-            "sqlalchemy_uri_decrypted",
-            "extra",
-            "encrypted_extra",
-        )
-    )
     def get_sqla_engine(
         self,
         schema: Optional[str] = None,
-        nullpool: bool = True,
+        nullpool: bool = False,
         user_name: Optional[str] = None,
         source: Optional[utils.QuerySource] = None,
     ) -> Engine:
+        """
+        Get the engine of the database from the engine registry, which pools its
+        connections unless `nullpool` is set.
+        """
         extra = self.get_extra()
         sqlalchemy_url = make_url(self.sqlalchemy_uri_decrypted)
         self.db_engine_spec.adjust_database_uri(sqlalchemy_url, schema)
@@ -393,7 +394,9 @@ class Database(
             )
 
         try:
-            return create_engine(sqlalchemy_url, **params)
+            return engine_registry.get_engine(
+                self.id, sqlalchemy_url, params, effective_username
+            )
         except Exception as ex:
             raise self.db_engine_spec.get_dbapi_mapped_exception(ex)
 
@@ -403,18 +406,65 @@ class Database(
     def get_quoter(self) -> Callable[[str, Any], str]:
         return self.get_dialect().identifier_preparer.quote
 
-    def get_df(  # pylint: disable=too-many-locals
+    def get_df(  # pylint: disable=too-many-arguments,too-many-locals
         self,
         sql: str,
         schema: Optional[str] = None,
         mutator: Optional[Callable[[pd.DataFrame], None]] = None,
         username: Optional[str] = None,
+        stats_tags: Optional[Dict[str, str]] = None,
+        nullpool: Optional[bool] = None,
     ) -> pd.DataFrame:
+        """
+        Run the SQL and return its results as a DataFrame, recording the time spent
+        executing it, fetching its results and building the DataFrame, tagged with
+        `stats_tags` along with the database.
+
+        The SQL runs on a pooled connection unless `nullpool` is set, which it is by
+        default when the SQL has several statements, as they may change the state of
+        the session.
+        """
         sqls = self.db_engine_spec.parse_sql(sql)
+        stats_tags = {"datasource": "", **(stats_tags or {}), "database": str(self.id)}
 
-        engine = self.get_sqla_engine(schema=schema, user_name=username)
+        if nullpool is None:
+            nullpool = len(sqls) > 1
+        engine = self.get_sqla_engine(
+            schema=schema, nullpool=nullpool, user_name=username
+        )
         username = utils.get_username() or username
 
+        def _log_query(sql: str) -> None:
+            if log_query:
+                log_query(engine.url, sql, schema, username, __name__, security_manager)
+
+        with closing(engine.raw_connection()) as conn:
+            cursor = conn.cursor()
+            for sql_ in sqls[:-1]:
+                _log_query(sql_)
+                self.db_engine_spec.execute(cursor, sql_)
+                cursor.fetchall()
+
+            _log_query(sqls[-1])
+            with stats_logger.timer("database.execute", stats_tags):
+                self.db_engine_spec.execute(cursor, sqls[-1])
+            with stats_logger.timer("database.fetch", stats_tags):
+                data = self.db_engine_spec.fetch_data(cursor)
+            with stats_logger.timer("database.df_build", stats_tags):
+                result_set = SupersetResultSet(
+                    data, cursor.description, self.db_engine_spec
+                )
+                df = result_set.to_pandas_df()
+                if mutator:
+                    df = mutator(df)
+                df = self._dump_nested_columns(df)
+
+            return df
+
+    @staticmethod
+    def _dump_nested_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """Serialize the columns holding lists or dicts as JSON"""
+
         def needs_conversion(df_series: pd.Series) -> bool:
             return (
                 not df_series.empty
@@ -422,6 +472,37 @@ class Database(
                 and isinstance(df_series[0], (list, dict))
             )
 
+        for col, coltype in df.dtypes.to_dict().items():
+            if coltype == numpy.object_ and needs_conversion(df[col]):
+                df[col] = df[col].apply(utils.json_dumps_w_dates)
+
+        return df
+
+    def iter_df(  # pylint: disable=too-many-arguments
+        self,
+        sql: str,
+        schema: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        nullpool: Optional[bool] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Run the SQL and yield its results as DataFrames of at most `batch_size` rows,
+        fetched from the cursor one after the other. Engines that don't allow fetching
+        results in batches yield a single DataFrame. Connections are pooled as in
+        `get_df`.
+        """
+        if not self.db_engine_spec.allows_streaming_fetch:
+            yield self.get_df(sql, schema, nullpool=nullpool)[:limit]
+            return
+
+        batch_size = batch_size or config["DATA_EXPORT_CHUNK_SIZE"]
+        sqls = self.db_engine_spec.parse_sql(sql)
+        if nullpool is None:
+            nullpool = len(sqls) > 1
+        engine = self.get_sqla_engine(schema=schema, nullpool=nullpool)
+        username = utils.get_username()
+
         def _log_query(sql: str) -> None:
             if log_query:
                 log_query(engine.url, sql, schema, username, __name__, security_manager)
@@ -436,19 +517,20 @@ class Database(
             _log_query(sqls[-1])
             self.db_engine_spec.execute(cursor, sqls[-1])
 
-            data = self.db_engine_spec.fetch_data(cursor)
-            result_set = SupersetResultSet(
-                data, cursor.description, self.db_engine_spec
-            )
-            df = result_set.to_pandas_df()
-            if mutator:
-                df = mutator(df)
-
-            for col, coltype in df.dtypes.to_dict().items():
-                if coltype == numpy.object_ and needs_conversion(df[col]):
-                    df[col] = df[col].apply(utils.json_dumps_w_dates)
-
-            return df
+            empty = True
+            for rows in self.db_engine_spec.fetch_data_in_batches(
+                cursor, batch_size, limit
+            ):
+                empty = False
+                yield self._dump_nested_columns(
+                    SupersetResultSet(
+                        rows, cursor.description, self.db_engine_spec
+                    ).to_pandas_df()
+                )
+            if empty:
+                yield SupersetResultSet(
+                    [], cursor.description, self.db_engine_spec
+                ).to_pandas_df()
 
     def compile_sqla_query(self, qry: Select, schema: Optional[str] = None) -> str:
         engine = self.get_sqla_engine(schema=schema)
@@ -801,6 +883,44 @@ class Log(Model):  # pylint: disable=too-few-public-methods
     referrer = Column(String(1024))
 
 
+class LogRollup(Model):  # pylint: disable=too-few-public-methods
+
+    """
+    Counters of the actions logged to the `logs` table, per hour or day, action,
+    user, dashboard and chart, maintained by the `log_rollup.rollup` task
+    """
+
+    __tablename__ = "logs_rollup"
+
+    id = Column(Integer, primary_key=True)
+    # "hour" or "day"
+    granularity = Column(String(8), nullable=False)
+    period_start = Column(DateTime, nullable=False)
+    action = Column(String(512))
+    user_id = Column(Integer)
+    dashboard_id = Column(Integer)
+    slice_id = Column(Integer)
+    count = Column(Integer, nullable=False, default=0)
+    duration_ms = Column(Integer, nullable=False, default=0)
+    last_dttm = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_logs_rollup_period", granularity, period_start),
+        Index("ix_logs_rollup_user", user_id, granularity, period_start),
+    )
+
+
+class LogRollupCheckpoint(Model):  # pylint: disable=too-few-public-methods
+
+    """Id of the last row of the `logs` table counted in the `logs_rollup` table"""
+
+    __tablename__ = "logs_rollup_checkpoint"
+
+    name = Column(String(64), primary_key=True)
+    last_log_id = Column(Integer, nullable=False, default=0)
+    changed_on = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class FavStarClassName(str, enum.Enum):
     CHART = "slice"
     DASHBOARD = "Dashboard"
@@ -19,8 +19,8 @@ from __future__ import annotations
 import json
 import logging
 from collections import defaultdict
-from functools import partial
-from typing import Any, Callable, Dict, List, Set, Tuple, Type, Union
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Set, Tuple, Type
 
 import sqlalchemy as sqla
 from flask import g
@@ -32,6 +32,7 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    func,
     Integer,
     MetaData,
     String,
@@ -40,17 +41,13 @@ from sqlalchemy import (
     UniqueConstraint,
 )
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import relationship, sessionmaker, subqueryload
+from sqlalchemy.orm import joinedload, relationship, sessionmaker, subqueryload
 from sqlalchemy.orm.mapper import Mapper
-from sqlalchemy.orm.session import object_session
-from sqlalchemy.sql import join, select
 from sqlalchemy.sql.elements import BinaryExpression
 
 from superset import app, ConnectorRegistry, db, is_feature_enabled, security_manager
 from superset.common.request_contexed_based import is_user_admin
 from superset.connectors.base.models import BaseDatasource
-from superset.connectors.druid.models import DruidColumn, DruidMetric
-from superset.connectors.sqla.models import SqlMetric, TableColumn
 from superset.extensions import cache_manager
 from superset.models.filter_set import FilterSet
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
@@ -59,7 +56,6 @@ from superset.models.tags import DashboardUpdater
 from superset.models.user_attributes import UserAttribute
 from superset.tasks.thumbnails import cache_dashboard_thumbnail
 from superset.utils import core as utils
-from superset.utils.decorators import debounce
 from superset.utils.hashing import md5_sha_from_str
 from superset.utils.urls import get_url_path
 
@@ -173,21 +169,91 @@ class Dashboard(Model, AuditMixinNullable, ImportExportMixin):
 
     @property
     def datasources(self) -> Set[BaseDatasource]:
-        # Verbose but efficient database enumeration of dashboard datasources.
-        datasources_by_cls_model: Dict[Type["BaseDatasource"], Set[int]] = defaultdict(
+        return set(self.get_datasources_by_key().values())
+
+    def get_datasource_ids_by_cls_model(self) -> Dict[Type[BaseDatasource], Set[int]]:
+        datasource_ids_by_cls_model: Dict[Type[BaseDatasource], Set[int]] = defaultdict(
             set
         )
-
         for slc in self.slices:
-            datasources_by_cls_model[slc.cls_model].add(slc.datasource_id)
+            datasource_ids_by_cls_model[slc.cls_model].add(slc.datasource_id)
+        return datasource_ids_by_cls_model
 
-        return {
-            datasource
-            for cls_model, datasource_ids in datasources_by_cls_model.items()
-            for datasource in db.session.query(cls_model)
-            .filter(cls_model.id.in_(datasource_ids))
-            .all()
-        }
+    def get_datasources_by_key(
+        self, eager: bool = False
+    ) -> Dict[Tuple[Type[BaseDatasource], int], BaseDatasource]:
+        """
+        Load the datasources of the dashboard's charts with a single query per
+        datasource type, keyed by type and id.
+
+        :param eager: Whether to also load the columns, metrics, owners and database
+            of the datasources, as needed to serialize them
+        :returns: The datasources by type and id
+        """
+        datasources: Dict[Tuple[Type[BaseDatasource], int], BaseDatasource] = {}
+        for cls_model, ids in self.get_datasource_ids_by_cls_model().items():
+            query = db.session.query(cls_model).filter(cls_model.id.in_(ids))
+            if eager:
+                relationships = cls_model.__mapper__.relationships.keys()
+                query = query.options(
+                    *[
+                        subqueryload(getattr(cls_model, name))
+                        for name in ("columns", "metrics", "owners")
+                        if name in relationships
+                    ],
+                    *[
+                        joinedload(getattr(cls_model, name))
+                        for name in ("database",)
+                        if name in relationships
+                    ],
+                )
+            for datasource in query.all():
+                datasources[(cls_model, datasource.id)] = datasource
+        return datasources
+
+    def get_datasources_changed_on(self) -> List[Tuple[str, int, datetime]]:
+        """
+        The type, id and last change of the datasources of the dashboard's charts,
+        without loading the datasources.
+        """
+        return sorted(
+            (cls_model.type, datasource_id, changed_on)
+            for cls_model, ids in self.get_datasource_ids_by_cls_model().items()
+            for datasource_id, changed_on in db.session.query(
+                cls_model.id, cls_model.changed_on
+            ).filter(cls_model.id.in_(ids))
+        )
+
+    def get_datasources_related_changes(self) -> List[Tuple[Any, ...]]:
+        """
+        The owners of the datasources of the dashboard's charts, and the number and
+        last change of their columns and metrics, which don't always update the
+        `changed_on` of the datasources, without loading them.
+        """
+        changes: List[Tuple[Any, ...]] = []
+        for cls_model, ids in self.get_datasource_ids_by_cls_model().items():
+            relationships = cls_model.__mapper__.relationships
+            for name in ("columns", "metrics", "owners"):
+                if name not in relationships.keys():
+                    continue
+                relationship = relationships[name]
+                ((_, datasource_id),) = relationship.synchronize_pairs
+                if relationship.secondary is None:
+                    target = relationship.mapper.class_
+                    query = (
+                        db.session.query(
+                            datasource_id, func.count(), func.max(target.changed_on)
+                        )
+                        .filter(datasource_id.in_(ids))
+                        .group_by(datasource_id)
+                    )
+                else:
+                    ((_, target_id),) = relationship.secondary_synchronize_pairs
+                    query = db.session.query(datasource_id, target_id).filter(
+                        datasource_id.in_(ids)
+                    )
+                changes.extend((cls_model.type, name, *row) for row in query)
+        return sorted(changes, key=str)
 
     @property
     def filter_sets(self) -> Dict[int, FilterSet]:
@@ -280,26 +346,47 @@ class Dashboard(Model, AuditMixinNullable, ImportExportMixin):
             "last_modified_time": self.changed_on.replace(microsecond=0).timestamp(),
         }
 
-    @cache_manager.cache.memoize(
-        # manage cache version manually
-        make_name=lambda fname: f"{fname}-v1.0",
-        unless=lambda: not is_feature_enabled("DASHBOARD_CACHE"),
-    )
     def datasets_trimmed_for_slices(self) -> List[Dict[str, Any]]:
-        # Verbose but efficient database enumeration of dashboard datasources.
+        """
+        The datasets of the dashboard's charts, trimmed to the fields needed to render
+        them. When `DASHBOARD_CACHE` is enabled, they are cached under a key versioned
+        with the last changes of the dashboard, its charts and their datasets, including
+        the owners, columns and metrics of the datasets.
+        """
+        if not is_feature_enabled("DASHBOARD_CACHE"):
+            return self._get_datasets_trimmed_for_slices()
+
+        version = md5_sha_from_str(
+            json.dumps(
+                [
+                    self.changed_on,
+                    sorted((slc.id, slc.changed_on) for slc in self.slices),
+                    self.get_datasources_changed_on(),
+                    self.get_datasources_related_changes(),
+                ],
+                default=str,
+            )
+        )
+        cache_key = f"dashboard_datasets-v2.0-{self.id}-{version}"
+        result = cache_manager.cache.get(cache_key)
+        if result is None:
+            result = self._get_datasets_trimmed_for_slices()
+            cache_manager.cache.set(cache_key, result)
+        return result
+
+    def _get_datasets_trimmed_for_slices(self) -> List[Dict[str, Any]]:
         slices_by_datasource: Dict[
-            Tuple[Type["BaseDatasource"], int], Set[Slice]
+            Tuple[Type[BaseDatasource], int], Set[Slice]
         ] = defaultdict(set)
 
         for slc in self.slices:
             slices_by_datasource[(slc.cls_model, slc.datasource_id)].add(slc)
 
+        datasources = self.get_datasources_by_key(eager=True)
         result: List[Dict[str, Any]] = []
 
-        for (cls_model, datasource_id), slices in slices_by_datasource.items():
-            datasource = (
-                db.session.query(cls_model).filter_by(id=datasource_id).one_or_none()
-            )
+        for key, slices in slices_by_datasource.items():
+            datasource = datasources.get(key)
 
             if datasource:
                 # Filter out unneeded fields from the datasource payload
@@ -325,35 +412,6 @@ class Dashboard(Model, AuditMixinNullable, ImportExportMixin):
         url = get_url_path("Superset.dashboard", dashboard_id_or_slug=self.id)
         cache_dashboard_thumbnail.delay(url, self.digest, force=True)
 
-    @debounce(0.1)
-    def clear_cache(self) -> None:
-        cache_manager.cache.delete_memoized(Dashboard.datasets_trimmed_for_slices, self)
-
-    @classmethod
-    @debounce(0.1)
-    def clear_cache_for_slice(cls, slice_id: int) -> None:
-        filter_query = select([dashboard_slices.c.dashboard_id], distinct=True).where(
-            dashboard_slices.c.slice_id == slice_id
-        )
-        for (dashboard_id,) in db.engine.execute(filter_query):
-            cls(id=dashboard_id).clear_cache()
-
-    @classmethod
-    @debounce(0.1)
-    def clear_cache_for_datasource(cls, datasource_id: int) -> None:
-        filter_query = select(
-            [dashboard_slices.c.dashboard_id], distinct=True,
-        ).select_from(
-            join(
-                dashboard_slices,
-                Slice,
-                (Slice.id == dashboard_slices.c.slice_id)
-                & (Slice.datasource_id == datasource_id),
-            )
-        )
-        for (dashboard_id,) in db.engine.execute(filter_query):
-            cls(id=dashboard_id).clear_cache()
-
     @classmethod
     def export_dashboards(  # pylint: disable=too-many-locals
         cls, dashboard_ids: List[int]
@@ -457,41 +515,3 @@ if is_feature_enabled("THUMBNAILS_SQLA_LISTENERS"):
     update_thumbnail: OnDashboardChange = lambda _, __, dash: dash.update_thumbnail()
     sqla.event.listen(Dashboard, "after_insert", update_thumbnail)
     sqla.event.listen(Dashboard, "after_update", update_thumbnail)
-
-if is_feature_enabled("DASHBOARD_CACHE"):
-
-    def clear_dashboard_cache(
-        _mapper: Mapper,
-        _connection: Connection,
-        obj: Union[Slice, BaseDatasource, Dashboard],
-        check_modified: bool = True,
-    ) -> None:
-        if check_modified and not object_session(obj).is_modified(obj):
-            # needed for avoiding excessive cache purging when duplicating a dashboard
-            return
-        if isinstance(obj, Dashboard):
-            obj.clear_cache()
-        elif isinstance(obj, Slice):
-            Dashboard.clear_cache_for_slice(slice_id=obj.id)
-        elif isinstance(obj, BaseDatasource):
-            Dashboard.clear_cache_for_datasource(datasource_id=obj.id)
-        elif isinstance(obj, (SqlMetric, TableColumn)):
-            Dashboard.clear_cache_for_datasource(datasource_id=obj.table_id)
-        elif isinstance(obj, (DruidMetric, DruidColumn)):
-            Dashboard.clear_cache_for_datasource(datasource_id=obj.datasource_id)
-
-    sqla.event.listen(Dashboard, "after_update", clear_dashboard_cache)
-    sqla.event.listen(
-        Dashboard, "after_delete", partial(clear_dashboard_cache, check_modified=False)
-    )
-    sqla.event.listen(Slice, "after_update", clear_dashboard_cache)
-    sqla.event.listen(Slice, "after_delete", clear_dashboard_cache)
-    sqla.event.listen(
-        BaseDatasource, "after_update", clear_dashboard_cache, propagate=True
-    )
-    # also clear cache on column/metric updates since updates to these will not
-    # trigger update events for BaseDatasource.
-    sqla.event.listen(SqlMetric, "after_update", clear_dashboard_cache)
-    sqla.event.listen(TableColumn, "after_update", clear_dashboard_cache)
-    sqla.event.listen(DruidMetric, "after_update", clear_dashboard_cache)
-    sqla.event.listen(DruidColumn, "after_update", clear_dashboard_cache)
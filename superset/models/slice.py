@@ -147,7 +147,9 @@ class Slice(  # pylint: disable=too-many-public-methods
     @datasource.getter  # type: ignore
     @memoized
     def get_datasource(self) -> Optional["BaseDatasource"]:
-        return db.session.query(self.cls_model).filter_by(id=self.datasource_id).first()
+        # a primary key lookup, served from the session's identity map when the
+        # datasource was already loaded, e.g. along with the other dashboard datasets
+        return db.session.query(self.cls_model).get(self.datasource_id)
 
     @renders("datasource_name")
     def datasource_link(self) -> Optional[Markup]:
@@ -19,9 +19,8 @@
 import datetime
 import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
 
-import numpy as np
 import pandas as pd
 import pyarrow as pa
 
@@ -62,17 +61,148 @@ def stringify(obj: Any) -> str:
     return json.dumps(obj, default=utils.json_iso_dttm_ser)
 
 
-def stringify_values(array: np.ndarray) -> np.ndarray:
-    vstringify = np.vectorize(stringify)
-    return vstringify(array)
-
-
 def destringify(obj: str) -> Any:
     return json.loads(obj)
 
 
+# Arrow types that can be assumed up front based on the generic column type
+_PA_TYPE_HINTS: Dict[utils.GenericDataType, pa.DataType] = {
+    utils.GenericDataType.STRING: pa.string(),
+    utils.GenericDataType.BOOLEAN: pa.bool_(),
+}
+
+_PA_CONVERSION_ERRORS = (
+    pa.lib.ArrowInvalid,
+    pa.lib.ArrowTypeError,
+    pa.lib.ArrowNotImplementedError,
+    TypeError,  # this is super hackey,
+    # https://issues.apache.org/jira/browse/ARROW-7855
+)
+
+
+# number of decimal digits needed to hold the values of integer types
+_INTEGER_DIGITS = {8: 3, 16: 5, 32: 10, 64: 20}
+
+
+def _common_decimal_type(left: pa.DataType, right: pa.DataType) -> pa.DataType:
+    """Decimal type holding the values of two decimal or integer types"""
+
+    def digits(pa_type: pa.DataType) -> Tuple[int, int]:
+        if pa.types.is_decimal(pa_type):
+            return pa_type.precision - pa_type.scale, pa_type.scale
+        return _INTEGER_DIGITS[pa_type.bit_width], 0
+
+    left_integer_digits, left_scale = digits(left)
+    right_integer_digits, right_scale = digits(right)
+    scale = max(left_scale, right_scale)
+    precision = max(left_integer_digits, right_integer_digits) + scale
+    if precision <= 38:
+        return pa.decimal128(precision, scale)
+    if precision <= 76:
+        return pa.decimal256(precision, scale)
+    return pa.float64()
+
+
+def get_common_type(left: pa.DataType, right: pa.DataType) -> pa.DataType:
+    """
+    Arrow type the values of two types inferred for the same column can be cast to:
+    the widest decimal, integer or floating point type for numbers, and a string
+    for types of different kinds.
+    """
+    # pylint: disable=too-many-return-statements
+    if left == right or pa.types.is_null(right):
+        return left
+    if pa.types.is_null(left):
+        return right
+    if pa.types.is_integer(left) and pa.types.is_integer(right):
+        if pa.types.is_unsigned_integer(left) and pa.types.is_unsigned_integer(right):
+            return pa.uint64()
+        return pa.int64()
+    numeric = (pa.types.is_integer, pa.types.is_floating, pa.types.is_decimal)
+    if any(is_type(left) for is_type in numeric) and any(
+        is_type(right) for is_type in numeric
+    ):
+        if pa.types.is_floating(left) or pa.types.is_floating(right):
+            return pa.float64()
+        return _common_decimal_type(left, right)
+    if (
+        pa.types.is_timestamp(left)
+        and pa.types.is_timestamp(right)
+        and left.tz == right.tz
+    ):
+        return pa.timestamp("ns", tz=left.tz)
+    if pa.types.is_large_string(left) or pa.types.is_large_string(right):
+        if pa.types.is_string(left) or pa.types.is_string(right):
+            return pa.large_string()
+    return pa.string()
+
+
+def unify_schemas(left: pa.Schema, right: pa.Schema) -> pa.Schema:
+    """Schema the tables of two schemas with the same columns can be cast to"""
+    return pa.schema(
+        [
+            field.with_type(get_common_type(field.type, right.field(i).type))
+            for i, field in enumerate(left)
+        ],
+        metadata=left.metadata,
+    )
+
+
+def cast_array(array: Any, pa_type: pa.DataType) -> Any:
+    """
+    Cast an Arrow array to a type returned by `get_common_type`. Values cast to a
+    string from another kind of type are serialized to JSON, like the values of
+    columns holding mixed types.
+    """
+    if array.type == pa_type:
+        return array
+    if pa.types.is_null(array.type):
+        return pa.nulls(len(array), type=pa_type)
+    if (pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type)) and not (
+        pa.types.is_string(array.type) or pa.types.is_large_string(array.type)
+    ):
+        return pa.array([stringify(value) for value in array.to_pylist()], pa_type)
+    # integers beyond 2^53 lose precision when cast to floats, as in pandas
+    safe = not pa.types.is_floating(pa_type)
+    try:
+        return array.cast(pa_type, safe=safe)
+    except (pa.lib.ArrowInvalid, pa.lib.ArrowNotImplementedError):
+        # eg. older versions of Arrow don't cast decimals to floats
+        values = array.to_pylist()
+        if pa.types.is_floating(pa_type):
+            values = [None if value is None else float(value) for value in values]
+        return pa.array(values, pa_type)
+
+
+def cast_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Cast a table to a schema returned by `unify_schemas`"""
+    if table.schema.equals(schema):
+        return table
+    return pa.Table.from_arrays(
+        [
+            cast_array(column, field.type)
+            for column, field in zip(table.columns, schema)
+        ],
+        schema=schema,
+    )
+
+
+def concat_tables(tables: List[pa.Table]) -> pa.Table:
+    """
+    Concatenate tables built from separate batches of the same result, casting the
+    columns that were inferred as different types across batches to a common type.
+    """
+    if len(tables) == 1:
+        return tables[0]
+
+    schema = tables[0].schema
+    for table in tables[1:]:
+        schema = unify_schemas(schema, table.schema)
+    return pa.concat_tables([cast_table(table, schema) for table in tables])
+
+
 class SupersetResultSet:
-    def __init__(  # pylint: disable=too-many-locals
+    def __init__(
         self,
         data: DbapiResult,
         cursor_description: DbapiDescription,
@@ -83,8 +213,6 @@ class SupersetResultSet:
         column_names: List[str] = []
         pa_data: List[pa.Array] = []
         deduped_cursor_desc: List[Tuple[Any, ...]] = []
-        numpy_dtype: List[Tuple[str, ...]] = []
-        stringified_arr: np.ndarray
 
         if cursor_description:
             # get deduped list of column names
@@ -96,57 +224,6 @@ class SupersetResultSet:
                 for column_name, description in zip(column_names, cursor_description)
             ]
 
-            # generate numpy structured array dtype
-            numpy_dtype = [(column_name, "object") for column_name in column_names]
-
-        # only do expensive recasting if datatype is not standard list of tuples
-        if data and (not isinstance(data, list) or not isinstance(data[0], tuple)):
-            data = [tuple(row) for row in data]
-        array = np.array(data, dtype=numpy_dtype)
-        if array.size > 0:
-            for column in column_names:
-                try:
-                    pa_data.append(pa.array(array[column].tolist()))
-                except (
-                    pa.lib.ArrowInvalid,
-                    pa.lib.ArrowTypeError,
-                    pa.lib.ArrowNotImplementedError,
-                    TypeError,  # this is super hackey,
-                    # https://issues.apache.org/jira/browse/ARROW-7855
-                ):
-                    # attempt serialization of values as strings
-                    stringified_arr = stringify_values(array[column])
-                    pa_data.append(pa.array(stringified_arr.tolist()))
-
-        if pa_data:  # pylint: disable=too-many-nested-blocks
-            for i, column in enumerate(column_names):
-                if pa.types.is_nested(pa_data[i].type):
-                    # TODO: revisit nested column serialization once nested types
-                    #  are added as a natively supported column type in Superset
-                    #  (superset.utils.core.GenericDataType).
-                    stringified_arr = stringify_values(array[column])
-                    pa_data[i] = pa.array(stringified_arr.tolist())
-
-                elif pa.types.is_temporal(pa_data[i].type):
-                    # workaround for bug converting
-                    # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
-                    # related: https://issues.apache.org/jira/browse/ARROW-5248
-                    sample = self.first_nonempty(array[column])
-                    if sample and isinstance(sample, datetime.datetime):
-                        try:
-                            if sample.tzinfo:
-                                tz = sample.tzinfo
-                                series = pd.Series(
-                                    array[column], dtype="datetime64[ns]"
-                                )
-                                series = pd.to_datetime(series).dt.tz_localize(tz)
-                                pa_data[i] = pa.Array.from_pandas(
-                                    series, type=pa.timestamp("ns", tz=tz)
-                                )
-                        except Exception as ex:  # pylint: disable=broad-except
-                            logger.exception(ex)
-
-        self.table = pa.Table.from_arrays(pa_data, names=column_names)
         self._type_dict: Dict[str, Any] = {}
         try:
             # The driver may not be passing a cursor.description
@@ -158,6 +235,96 @@ class SupersetResultSet:
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
 
+        # transpose rows to columns once; this works for any sequence type, so
+        # driver specific row types don't need to be recast to tuples first
+        columns_values = [list(values) for values in zip(*data)]
+        if columns_values:
+            for column, values in zip(column_names, columns_values):
+                pa_data.append(self.to_pa_array(values, self.get_pa_type_hint(column)))
+
+        self.table = pa.Table.from_arrays(pa_data, names=column_names)
+
+    def get_pa_type_hint(self, column_name: str) -> Optional[pa.DataType]:
+        """
+        Return the Arrow type to try first for a column, based on the generic type
+        of its type in the cursor description.
+        """
+        try:
+            column_spec = self.db_engine_spec.get_column_spec(
+                self._type_dict.get(column_name),
+                source=utils.ColumnTypeSource.CURSOR_DESCRIPION,
+            )
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if column_spec is None:
+            return None
+        return _PA_TYPE_HINTS.get(column_spec.generic_type)
+
+    @classmethod
+    def to_pa_array(
+        cls, values: List[Any], type_hint: Optional[pa.DataType] = None
+    ) -> pa.Array:
+        """
+        Convert the values of a column to an Arrow array. Values that Arrow can't
+        infer a type for, as well as nested values, are serialized to JSON strings.
+        """
+        sample = cls.first_nonempty(values)
+        if isinstance(sample, datetime.datetime) and sample.tzinfo:
+            # workaround for bug converting
+            # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
+            # related: https://issues.apache.org/jira/browse/ARROW-5248
+            try:
+                tz = sample.tzinfo
+                series = pd.Series(values, dtype="datetime64[ns]")
+                series = pd.to_datetime(series).dt.tz_localize(tz)
+                return pa.Array.from_pandas(series, type=pa.timestamp("ns", tz=tz))
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.exception(ex)
+
+        array: Optional[pa.Array] = None
+        if type_hint is not None:
+            try:
+                array = pa.array(values, type=type_hint)
+            except _PA_CONVERSION_ERRORS:
+                array = None
+        if array is None:
+            try:
+                array = pa.array(values)
+            except _PA_CONVERSION_ERRORS:
+                # attempt serialization of values as strings
+                return pa.array([stringify(value) for value in values])
+
+        if pa.types.is_nested(array.type):
+            # TODO: revisit nested column serialization once nested types
+            #  are added as a natively supported column type in Superset
+            #  (superset.utils.core.GenericDataType).
+            return pa.array([stringify(value) for value in values])
+        return array
+
+    @classmethod
+    def from_batches(
+        cls,
+        batches: Iterable[DbapiResult],
+        cursor_description: DbapiDescription,
+        db_engine_spec: Type[BaseEngineSpec],
+    ) -> "SupersetResultSet":
+        """
+        Build a result set from batches of rows, converting each batch to Arrow as
+        it arrives so that only one batch is ever held as Python objects.
+        """
+        result_set: Optional[SupersetResultSet] = None
+        tables: List[pa.Table] = []
+        for batch in batches:
+            batch_result_set = cls(batch, cursor_description, db_engine_spec)
+            if result_set is None:
+                result_set = batch_result_set
+            tables.append(batch_result_set.table)
+
+        if result_set is None:
+            return cls([], cursor_description, db_engine_spec)
+        result_set.table = concat_tables(tables)
+        return result_set
+
     @staticmethod
     def convert_pa_dtype(pa_dtype: pa.DataType) -> Optional[str]:
         if pa.types.is_boolean(pa_dtype):
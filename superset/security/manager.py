@@ -25,13 +25,17 @@ from typing import (
     Callable,
     cast,
     Dict,
+    FrozenSet,
     List,
     NamedTuple,
     Optional,
     Set,
+    Tuple,
     TYPE_CHECKING,
+    TypeVar,
     Union,
 )
+from uuid import uuid4
 
 import jwt
 from flask import current_app, Flask, g, Request
@@ -40,10 +44,11 @@ from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_appbuilder.security.sqla.manager import SecurityManager
 from flask_appbuilder.security.sqla.models import (
     assoc_permissionview_role,
-    assoc_user_role,
+    Permission,
     PermissionView,
     Role,
     User,
+    ViewMenu,
 )
 from flask_appbuilder.security.views import (
     PermissionModelView,
@@ -54,17 +59,17 @@ from flask_appbuilder.security.views import (
 )
 from flask_appbuilder.widgets import ListWidget
 from flask_login import AnonymousUserMixin, LoginManager
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, event, or_
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import object_session, Session
 from sqlalchemy.orm.mapper import Mapper
-from sqlalchemy.orm.query import Query as SqlaQuery
 
 from superset import sql_parse
 from superset.connectors.connector_registry import ConnectorRegistry
 from superset.constants import RouteMethod
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SupersetSecurityException
+from superset.extensions import cache_manager
 from superset.security.guest_token import (
     GuestToken,
     GuestTokenResources,
@@ -74,6 +79,8 @@ from superset.security.guest_token import (
     GuestUser,
 )
 from superset.utils.core import DatasourceName, RowLevelSecurityFilterType
+from superset.utils.hashing import md5_sha_from_str
+from superset.utils.local_cache import memoize_in_request
 from superset.utils.urls import get_url_host
 
 if TYPE_CHECKING:
@@ -89,11 +96,89 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+T = TypeVar("T")
+
+
 class DatabaseAndSchema(NamedTuple):
     database: str
     schema: str
 
 
+class RowLevelSecurityRule(NamedTuple):
+    id: int
+    group_key: Optional[str]
+    clause: str
+
+
+class PermissionIndex(NamedTuple):
+    # (permission name, view menu name) pairs
+    permission_views: FrozenSet[Tuple[str, str]]
+    # view menu names by permission name, e.g. the schemas of "schema_access"
+    view_menus: Dict[str, FrozenSet[str]]
+
+
+def get_cached_by_roles(
+    name: str, role_ids: Tuple[int, ...], load: Callable[[], T], timeout: int
+) -> T:
+    """
+    Return the value loaded for a set of roles, cached for `timeout` seconds in the
+    cache defined by `CACHE_CONFIG` until invalidated with
+    `invalidate_cached_by_roles`.
+
+    :param name: The name of the cached value
+    :param role_ids: The sorted ids of the roles
+    :param load: Loads the value
+    :param timeout: The cache timeout, the value isn't cached when 0
+    :returns: The value
+    """
+    if not timeout:
+        return load()
+
+    # values are keyed on a version replaced on invalidation
+    version_key = f"{name}_version"
+    version = cache_manager.cache.get(version_key)
+    if version is None:
+        version = uuid4().hex
+        if not cache_manager.cache.add(version_key, version, timeout=0):
+            version = cache_manager.cache.get(version_key) or version
+    role_key = md5_sha_from_str(",".join(str(role_id) for role_id in role_ids))
+    cache_key = f"{name}_{version}_{role_key}"
+    value = cache_manager.cache.get(cache_key)
+    if value is None:
+        value = load()
+        cache_manager.cache.set(cache_key, value, timeout=timeout)
+    return value
+
+
+def invalidate_cached_by_roles(name: str, session: Optional[Session] = None) -> None:
+    """
+    Invalidate the values cached by `get_cached_by_roles` for all roles.
+
+    When the values are invalidated by changes made in a session, they are only
+    invalidated once the session commits, so that concurrent requests can't cache
+    the values committed before under the new version. Nothing is invalidated if
+    the session rolls back.
+
+    :param name: The name of the cached value
+    :param session: The session of the changes invalidating the values
+    """
+    if session is None:
+        cache_manager.cache.set(f"{name}_version", uuid4().hex, timeout=0)
+    else:
+        session.info.setdefault("invalidated_by_roles", set()).add(name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_by_roles_after_commit(session: Session) -> None:
+    for name in session.info.pop("invalidated_by_roles", ()):
+        invalidate_cached_by_roles(name)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_cached_by_roles_invalidations(session: Session) -> None:
+    session.info.pop("invalidated_by_roles", None)
+
+
 class SupersetSecurityListWidget(ListWidget):  # pylint: disable=too-few-public-methods
     """
     Redeclaring to avoid circular imports
@@ -292,7 +377,10 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         user = g.user
         if user.is_anonymous:
             return self.is_item_public(permission_name, view_name)
-        return self._has_view_access(user, permission_name, view_name)
+        if any(role.name in self.builtin_roles for role in user.roles):
+            return self._has_view_access(user, permission_name, view_name)
+        index = self.get_user_permission_index()
+        return (permission_name, view_name) in index.permission_views
 
     def can_access_all_queries(self) -> bool:
         """
@@ -467,6 +555,10 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :returns: The list of datasources
         """
 
+        all_datasources = ConnectorRegistry.get_all_datasources(self.get_session)
+        if self.can_access_all_datasources() or self.can_access_all_databases():
+            return all_datasources
+
         user_perms = self.user_view_menu_names("datasource_access")
         schema_perms = self.user_view_menu_names("schema_access")
         user_datasources = set()
@@ -483,7 +575,6 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             )
 
         # group all datasources by database
-        all_datasources = ConnectorRegistry.get_all_datasources(self.get_session)
         datasources_by_database: Dict["Database", Set["BaseDatasource"]] = defaultdict(
             set
         )
@@ -514,6 +605,10 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return True
 
     def user_view_menu_names(self, permission_name: str) -> Set[str]:
+        if not g.user.is_anonymous:
+            index = self.get_user_permission_index()
+            return set(index.view_menus.get(permission_name, frozenset()))
+
         base_query = (
             self.get_session.query(self.viewmenu_model.name)
             .join(self.permissionview_model)
@@ -522,16 +617,6 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             .join(self.role_model)
         )
 
-        if not g.user.is_anonymous:
-            # filter by user id
-            view_menu_names = (
-                base_query.join(assoc_user_role)
-                .join(self.user_model)
-                .filter(self.user_model.id == g.user.get_id())
-                .filter(self.permission_model.name == permission_name)
-            ).all()
-            return {s.name for s in view_menu_names}
-
         # Properly treat anonymous user
         public_role = self.get_public_role()
         if public_role:
@@ -544,6 +629,59 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             return {s.name for s in view_menu_names}
         return set()
 
+    def get_user_permission_index(self) -> PermissionIndex:
+        """
+        Return the permissions granted to the current user by the roles stored in the
+        metadata database, computed once per request and cached for
+        `PERMISSIONS_CACHE_TIMEOUT` seconds, or until roles or permissions change.
+
+        :returns: The permissions of the user
+        """
+        role_ids = tuple(sorted(role.id for role in g.user.roles))
+        return memoize_in_request(
+            "permission_index",
+            role_ids,
+            lambda: get_cached_by_roles(
+                "permission_index",
+                role_ids,
+                lambda: self._load_permission_index(role_ids),
+                current_app.config["PERMISSIONS_CACHE_TIMEOUT"],
+            ),
+        )
+
+    def _load_permission_index(self, role_ids: Tuple[int, ...]) -> PermissionIndex:
+        query = (
+            self.get_session.query(self.permission_model.name, self.viewmenu_model.name)
+            .select_from(self.permissionview_model)
+            .join(self.permission_model)
+            .join(self.viewmenu_model)
+            .join(assoc_permissionview_role)
+            .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+            .distinct()
+        )
+        permission_views = frozenset(
+            (permission_name, view_menu_name)
+            for permission_name, view_menu_name in query.all()
+        )
+        view_menus: Dict[str, Set[str]] = defaultdict(set)
+        for permission_name, view_menu_name in permission_views:
+            view_menus[permission_name].add(view_menu_name)
+        return PermissionIndex(
+            permission_views=permission_views,
+            view_menus={
+                permission_name: frozenset(names)
+                for permission_name, names in view_menus.items()
+            },
+        )
+
+    @staticmethod
+    def invalidate_permission_index(session: Optional[Session] = None) -> None:
+        """
+        Invalidates the cached permissions of all roles, once the session commits
+        when given
+        """
+        invalidate_cached_by_roles("permission_index", session)
+
     def get_schemas_accessible_by_user(
         self, database: "Database", schemas: List[str], hierarchical: bool = True
     ) -> List[str]:
@@ -1143,7 +1281,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             ]
         return []
 
-    def get_rls_filters(self, table: "BaseDatasource") -> List[SqlaQuery]:
+    def get_rls_filters(self, table: "BaseDatasource") -> List[RowLevelSecurityRule]:
         """
         Retrieves the appropriate row level security filters for the current user and
         the passed table.
@@ -1152,63 +1290,86 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :returns: A list of filters
         """
         if hasattr(g, "user"):
-            # pylint: disable=import-outside-toplevel
-            from superset.connectors.sqla.models import (
-                RLSFilterRoles,
-                RLSFilterTables,
-                RowLevelSecurityFilter,
+            role_ids = tuple(sorted(role.id for role in self.get_user_roles()))
+            rules = memoize_in_request(
+                "rls_rules", role_ids, lambda: self.get_rls_rules(role_ids)
             )
+            return rules.get(table.id, [])
+        return []
 
-            user_roles = [role.id for role in self.get_user_roles()]
-            regular_filter_roles = (
-                self.get_session.query(RLSFilterRoles.c.rls_filter_id)
-                .join(RowLevelSecurityFilter)
-                .filter(
-                    RowLevelSecurityFilter.filter_type
-                    == RowLevelSecurityFilterType.REGULAR
-                )
-                .filter(RLSFilterRoles.c.role_id.in_(user_roles))
-                .subquery()
-            )
-            base_filter_roles = (
-                self.get_session.query(RLSFilterRoles.c.rls_filter_id)
-                .join(RowLevelSecurityFilter)
-                .filter(
-                    RowLevelSecurityFilter.filter_type
-                    == RowLevelSecurityFilterType.BASE
-                )
-                .filter(RLSFilterRoles.c.role_id.in_(user_roles))
-                .subquery()
+    def get_rls_rules(
+        self, role_ids: Tuple[int, ...]
+    ) -> Dict[int, List[RowLevelSecurityRule]]:
+        """
+        Retrieves the row level security filters applying to users with the given
+        roles, indexed by table id. They are cached for `RLS_FILTERS_CACHE_TIMEOUT`
+        seconds, or until row level security filters are changed.
+
+        :param role_ids: The ids of the roles of the user
+        :returns: The filters of each table
+        """
+        return get_cached_by_roles(
+            "rls_rules",
+            role_ids,
+            lambda: self._load_rls_rules(role_ids),
+            current_app.config["RLS_FILTERS_CACHE_TIMEOUT"],
+        )
+
+    def _load_rls_rules(
+        self, role_ids: Tuple[int, ...]
+    ) -> Dict[int, List[RowLevelSecurityRule]]:
+        # pylint: disable=import-outside-toplevel
+        from superset.connectors.sqla.models import (
+            RLSFilterRoles,
+            RLSFilterTables,
+            RowLevelSecurityFilter,
+        )
+
+        filter_roles = (
+            self.get_session.query(RLSFilterRoles.c.rls_filter_id)
+            .filter(RLSFilterRoles.c.role_id.in_(role_ids))
+            .subquery()
+        )
+        query = (
+            self.get_session.query(
+                RLSFilterTables.c.table_id,
+                RowLevelSecurityFilter.id,
+                RowLevelSecurityFilter.group_key,
+                RowLevelSecurityFilter.clause,
             )
-            filter_tables = (
-                self.get_session.query(RLSFilterTables.c.rls_filter_id)
-                .filter(RLSFilterTables.c.table_id == table.id)
-                .subquery()
+            .join(
+                RowLevelSecurityFilter,
+                RowLevelSecurityFilter.id == RLSFilterTables.c.rls_filter_id,
             )
-            query = (
-                self.get_session.query(
-                    RowLevelSecurityFilter.id,
-                    RowLevelSecurityFilter.group_key,
-                    RowLevelSecurityFilter.clause,
-                )
-                .filter(RowLevelSecurityFilter.id.in_(filter_tables))
-                .filter(
-                    or_(
-                        and_(
-                            RowLevelSecurityFilter.filter_type
-                            == RowLevelSecurityFilterType.REGULAR,
-                            RowLevelSecurityFilter.id.in_(regular_filter_roles),
-                        ),
-                        and_(
-                            RowLevelSecurityFilter.filter_type
-                            == RowLevelSecurityFilterType.BASE,
-                            RowLevelSecurityFilter.id.notin_(base_filter_roles),
-                        ),
-                    )
+            .filter(
+                or_(
+                    # regular filters apply to the roles they are set for
+                    and_(
+                        RowLevelSecurityFilter.filter_type
+                        == RowLevelSecurityFilterType.REGULAR,
+                        RowLevelSecurityFilter.id.in_(filter_roles),
+                    ),
+                    # base filters apply to all roles but the ones they are set for
+                    and_(
+                        RowLevelSecurityFilter.filter_type
+                        == RowLevelSecurityFilterType.BASE,
+                        RowLevelSecurityFilter.id.notin_(filter_roles),
+                    ),
                 )
             )
-            return query.all()
-        return []
+        )
+        rules: Dict[int, List[RowLevelSecurityRule]] = defaultdict(list)
+        for table_id, filter_id, group_key, clause in query.all():
+            rules[table_id].append(RowLevelSecurityRule(filter_id, group_key, clause))
+        return dict(rules)
+
+    @staticmethod
+    def invalidate_rls_rules(session: Optional[Session] = None) -> None:
+        """
+        Invalidates the cached row level security filters of all roles, once the
+        session commits when given
+        """
+        invalidate_cached_by_roles("rls_rules", session)
 
     def get_rls_ids(self, table: "BaseDatasource") -> List[int]:
         """
@@ -1410,3 +1571,14 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             if resource["type"] == resource_type.value and str(resource["id"]) == strid:
                 return True
         return False
+
+
+def invalidate_permission_index(
+    _mapper: Mapper, _connection: Connection, target: Model
+) -> None:
+    SupersetSecurityManager.invalidate_permission_index(object_session(target))
+
+
+for model in (Role, Permission, ViewMenu, PermissionView):
+    for event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, event_name, invalidate_permission_index, propagate=True)
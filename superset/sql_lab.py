@@ -19,6 +19,7 @@ import logging
 import uuid
 from contextlib import closing
 from datetime import datetime
+from itertools import chain
 from sys import getsizeof
 from typing import Any, cast, Dict, List, Optional, Tuple, Union
 
@@ -42,6 +43,7 @@ from superset.models.core import Database
 from superset.models.sql_lab import Query
 from superset.result_set import SupersetResultSet
 from superset.sql_parse import CtasMethod, ParsedQuery
+from superset.sqllab.arrow_results import write_arrow_results
 from superset.sqllab.limiting_factor import LimitingFactor
 from superset.utils.celery import session_scope
 from superset.utils.core import json_iso_dttm_ser, QuerySource, zlib_compress
@@ -53,6 +55,8 @@ stats_logger = config["STATS_LOGGER"]
 SQLLAB_TIMEOUT = config["SQLLAB_ASYNC_TIME_LIMIT_SEC"]
 SQLLAB_HARD_TIMEOUT = SQLLAB_TIMEOUT + 60
 SQL_MAX_ROW = config["SQL_MAX_ROW"]
+SQLLAB_FETCH_BATCH_SIZE = config["SQLLAB_FETCH_BATCH_SIZE"]
+SQLLAB_POOL_CONNECTIONS = config["SQLLAB_POOL_CONNECTIONS"]
 SQLLAB_CTAS_NO_LIMIT = config["SQLLAB_CTAS_NO_LIMIT"]
 SQL_QUERY_MUTATOR = config["SQL_QUERY_MUTATOR"]
 log_query = config["QUERY_LOGGER"]
@@ -251,6 +255,8 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-locals
                 query.id,
                 str(query.to_dict()),
             )
+            if SQLLAB_FETCH_BATCH_SIZE and db_engine_spec.allows_streaming_fetch:
+                return _fetch_result_set_in_batches(cursor, query, increased_limit)
             data = db_engine_spec.fetch_data(cursor, increased_limit)
             if query.limit is None or len(data) <= query.limit:
                 query.limiting_factor = LimitingFactor.NOT_LIMITED
@@ -287,6 +293,31 @@ def execute_sql_statement(  # pylint: disable=too-many-arguments,too-many-locals
     return SupersetResultSet(data, cursor_description, db_engine_spec)
 
 
+def _fetch_result_set_in_batches(
+    cursor: Any, query: Query, increased_limit: Optional[int]
+) -> SupersetResultSet:
+    """
+    Fetch the results of the cursor in batches of `SQLLAB_FETCH_BATCH_SIZE` rows,
+    converting each batch to Arrow as it arrives to bound memory usage.
+    """
+    db_engine_spec = query.database.db_engine_spec
+    batches = db_engine_spec.fetch_data_in_batches(
+        cursor, SQLLAB_FETCH_BATCH_SIZE, increased_limit
+    )
+    # some drivers only populate the cursor description once rows are fetched
+    first_batch = next(batches, [])
+    logger.debug("Query %d: Fetching cursor description", query.id)
+    result_set = SupersetResultSet.from_batches(
+        chain([first_batch], batches), cursor.description, db_engine_spec
+    )
+    if query.limit is None or result_set.size <= query.limit:
+        query.limiting_factor = LimitingFactor.NOT_LIMITED
+    else:
+        # return 1 row less than increased_query
+        result_set.table = result_set.table.slice(0, query.limit)
+    return result_set
+
+
 def apply_limit_if_exists(
     database: Database, increased_limit: Optional[int], query: Query, sql: str
 ) -> str:
@@ -348,6 +379,24 @@ def _serialize_and_expand_data(
     return (data, selected_columns, all_columns, expanded_columns)
 
 
+def _write_results_payload(
+    key: str, payload: Dict[str, Any], cache_timeout: int
+) -> None:
+    """Store a whole serialized and compressed query payload in the results backend"""
+    with stats_timing("sqllab.query.results_backend_write", stats_logger):
+        with stats_timing(
+            "sqllab.query.results_backend_write_serialization", stats_logger
+        ):
+            serialized_payload = _serialize_payload(
+                payload, cast(bool, results_backend_use_msgpack)
+            )
+
+        compressed = zlib_compress(serialized_payload)
+        logger.debug("*** serialized payload size: %i", getsizeof(serialized_payload))
+        logger.debug("*** compressed payload size: %i", getsizeof(compressed))
+        results_backend.set(key, compressed, cache_timeout)
+
+
 def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-locals, too-many-statements, too-many-branches
     query_id: int,
     rendered_query: str,
@@ -432,7 +481,7 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
 
     engine = database.get_sqla_engine(
         schema=query.schema,
-        nullpool=True,
+        nullpool=not SQLLAB_POOL_CONNECTIONS,
         user_name=user_name,
         source=QuerySource.SQL_LAB,
     )
@@ -506,10 +555,29 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
         )
     query.end_time = now_as_float()
 
-    use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
-    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
-        result_set, db_engine_spec, use_arrow_data, expand_data
+    use_arrow_results = (
+        store_results and bool(results_backend) and config["RESULTS_BACKEND_USE_ARROW"]
+    )
+    use_arrow_data = (
+        store_results
+        and cast(bool, results_backend_use_msgpack)
+        and not use_arrow_results
     )
+    data: Union[bytes, str, List[Any]]
+    if use_arrow_results:
+        # the results table is stored as is, and expanded when it's read
+        data = []
+        selected_columns = all_columns = result_set.columns
+        expanded_columns: List[Any] = []
+    else:
+        (
+            data,
+            selected_columns,
+            all_columns,
+            expanded_columns,
+        ) = _serialize_and_expand_data(
+            result_set, db_engine_spec, use_arrow_data, expand_data
+        )
 
     # TODO: data should be saved separately from metadata (likely in Parquet)
     payload.update(
@@ -529,23 +597,17 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
         logger.info(
             "Query %s: Storing results in results backend, key: %s", str(query_id), key
         )
-        with stats_timing("sqllab.query.results_backend_write", stats_logger):
-            with stats_timing(
-                "sqllab.query.results_backend_write_serialization", stats_logger
-            ):
-                serialized_payload = _serialize_payload(
-                    payload, cast(bool, results_backend_use_msgpack)
+        cache_timeout = database.cache_timeout
+        if cache_timeout is None:
+            cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
+
+        if use_arrow_results:
+            with stats_timing("sqllab.query.results_backend_write", stats_logger):
+                write_arrow_results(
+                    results_backend, key, payload, result_set.pa_table, cache_timeout
                 )
-            cache_timeout = database.cache_timeout
-            if cache_timeout is None:
-                cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
-
-            compressed = zlib_compress(serialized_payload)
-            logger.debug(
-                "*** serialized payload size: %i", getsizeof(serialized_payload)
-            )
-            logger.debug("*** compressed payload size: %i", getsizeof(compressed))
-            results_backend.set(key, compressed, cache_timeout)
+        else:
+            _write_results_payload(key, payload, cache_timeout)
         query.results_key = key
 
     query.status = QueryStatus.SUCCESS
@@ -553,7 +615,7 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
 
     if return_results:
         # since we're returning results we need to create non-arrow data
-        if use_arrow_data:
+        if use_arrow_data or use_arrow_results:
             (
                 data,
                 selected_columns,
@@ -596,7 +658,7 @@ def cancel_query(query: Query, user_name: Optional[str] = None) -> bool:
 
     engine = query.database.get_sqla_engine(
         schema=query.schema,
-        nullpool=True,
+        nullpool=not SQLLAB_POOL_CONNECTIONS,
         user_name=user_name,
         source=QuerySource.SQL_LAB,
     )
@@ -0,0 +1,164 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Storage of SQL Lab query results in the results backend as pages of compressed
+Arrow IPC record batches.
+
+The results key holds the payload of the query without its data, along with the
+Arrow schema and the number of rows of each page, each page being stored under its
+own key. Readers only fetch, decompress and deserialize the pages holding the rows
+they need.
+"""
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+from cachelib.base import BaseCache
+
+from superset import app
+from superset.exceptions import SerializationError
+from superset.result_set import SupersetResultSet
+
+config = app.config
+logger = logging.getLogger(__name__)
+
+ARROW_RESULTS_FORMAT = "arrow-ipc-v1"
+
+
+def is_arrow_results(value: Any) -> bool:
+    """Whether a results backend value was written by `write_arrow_results`"""
+    return isinstance(value, dict) and value.get("format") == ARROW_RESULTS_FORMAT
+
+
+def get_page_key(key: str, page: int) -> str:
+    return f"{key}/{page}"
+
+
+def get_ipc_write_options() -> pa.ipc.IpcWriteOptions:
+    compression = config["RESULTS_BACKEND_ARROW_COMPRESSION"]
+    if compression and not pa.Codec.is_available(compression):
+        logger.warning("Arrow %s compression isn't available", compression)
+        compression = None
+    return pa.ipc.IpcWriteOptions(compression=compression)
+
+
+def write_arrow_results(
+    results_backend: BaseCache,
+    key: str,
+    payload: Dict[str, Any],
+    table: pa.Table,
+    timeout: Optional[int] = None,
+) -> None:
+    """
+    Store the payload of a query, without its data, and its results table split in
+    pages of `RESULTS_BACKEND_ARROW_PAGE_SIZE` rows.
+    """
+    options = get_ipc_write_options()
+    pages: Dict[str, bytes] = {}
+    page_rows: List[int] = []
+    for batch in table.to_batches(
+        max_chunksize=config["RESULTS_BACKEND_ARROW_PAGE_SIZE"]
+    ):
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_batch(batch)
+        pages[get_page_key(key, len(page_rows))] = sink.getvalue().to_pybytes()
+        page_rows.append(batch.num_rows)
+
+    value = {
+        **{name: item for name, item in payload.items() if name != "data"},
+        "format": ARROW_RESULTS_FORMAT,
+        "schema": table.schema.serialize().to_pybytes(),
+        "page_rows": page_rows,
+    }
+    # pages are set along with the index, so that the index never references
+    # missing pages
+    results_backend.set_many({**pages, key: value}, timeout=timeout)
+
+
+def read_arrow_results(
+    results_backend: BaseCache,
+    key: str,
+    value: Dict[str, Any],
+    row_offset: int = 0,
+    row_limit: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read a range of rows of the results stored by `write_arrow_results`, fetching
+    only the pages holding them, and optionally only some of their columns.
+
+    :param results_backend: The results backend
+    :param key: The results key
+    :param value: The value of the results key
+    :param row_offset: The first row to read
+    :param row_limit: The number of rows to read, all of them by default
+    :param columns: The columns to read, all of them by default
+    :raises SerializationError: If the results can't be read
+    """
+    pages: List[int] = []
+    first_row = None
+    page_start = 0
+    for page, num_rows in enumerate(value["page_rows"]):
+        page_end = page_start + num_rows
+        if page_end > row_offset and (
+            row_limit is None or page_start < row_offset + row_limit
+        ):
+            pages.append(page)
+            if first_row is None:
+                first_row = page_start
+        page_start = page_end
+
+    try:
+        schema = pa.ipc.read_schema(pa.py_buffer(value["schema"]))
+        blobs = (
+            results_backend.get_many(*[get_page_key(key, page) for page in pages])
+            if pages
+            else []
+        )
+        if any(blob is None for blob in blobs):
+            raise SerializationError("Results pages are missing")
+        batches = [pa.ipc.open_stream(blob).read_next_batch() for blob in blobs]
+        table = pa.Table.from_batches(batches, schema=schema)
+    except (pa.ArrowException, KeyError) as ex:
+        raise SerializationError("Unable to deserialize table") from ex
+
+    table = table.slice(row_offset - (first_row or 0), row_limit)
+    if columns is not None:
+        table = pa.Table.from_arrays(
+            [table.column(column) for column in columns], names=columns
+        )
+    return SupersetResultSet.convert_table_to_df(table)
+
+
+def iter_arrow_results(
+    results_backend: BaseCache, key: str, value: Dict[str, Any]
+) -> Iterator[pd.DataFrame]:
+    """
+    Read the results stored by `write_arrow_results` page after page, so that only
+    a page is held in memory at a time.
+
+    :raises SerializationError: If the results can't be read
+    """
+    if not value["page_rows"]:
+        yield read_arrow_results(results_backend, key, value)
+        return
+    row_offset = 0
+    for num_rows in value["page_rows"]:
+        yield read_arrow_results(results_backend, key, value, row_offset, num_rows)
+        row_offset += num_rows
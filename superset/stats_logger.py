@@ -15,7 +15,11 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
-from typing import Optional
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
 
 from colorama import Fore, Style
 
@@ -48,6 +52,51 @@ class BaseStatsLogger:
         """Setup a gauge"""
         raise NotImplementedError()
 
+    def counter(
+        self, key: str, tags: Optional[Dict[str, str]] = None, count: int = 1
+    ) -> None:
+        """
+        Increment a counter by `count`, broken down by tags. Loggers that don't
+        support tags increment the counter without them.
+        """
+        # loggers able to increment a counter by more than one at once override this
+        for _ in range(count):
+            self.incr(key)
+
+    def histogram(
+        self, key: str, value: float, tags: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Record a unitless value, e.g. a number of rows, in a histogram broken down
+        by tags. Loggers that don't support histograms record it as a gauge.
+        """
+        self.gauge(key, value)
+
+    def duration(
+        self, key: str, value: float, tags: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Record a duration in milliseconds in a histogram broken down by tags. Loggers
+        that don't support tags record a timing without them.
+        """
+        self.timing(key, value)
+
+    @contextmanager
+    def timer(
+        self, key: str, tags: Optional[Dict[str, str]] = None
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Record the duration of a block in milliseconds in a histogram. The tags are
+        yielded so that the block can add the tags only known once it ran, such as
+        whether it hit the cache.
+        """
+        tags = dict(tags or {})
+        start = time.perf_counter()
+        try:
+            yield tags
+        finally:
+            self.duration(key, (time.perf_counter() - start) * 1000, tags)
+
 
 class DummyStatsLogger(BaseStatsLogger):
     def incr(self, key: str) -> None:
@@ -72,6 +121,33 @@ class DummyStatsLogger(BaseStatsLogger):
             )
         )
 
+    def counter(
+        self, key: str, tags: Optional[Dict[str, str]] = None, count: int = 1
+    ) -> None:
+        logger.debug(
+            Fore.CYAN
+            + f"[stats_logger] (counter) {key} {tags} | {count} "
+            + Style.RESET_ALL
+        )
+
+    def histogram(
+        self, key: str, value: float, tags: Optional[Dict[str, str]] = None
+    ) -> None:
+        logger.debug(
+            Fore.CYAN
+            + f"[stats_logger] (histogram) {key} {tags} | {value} "
+            + Style.RESET_ALL
+        )
+
+    def duration(
+        self, key: str, value: float, tags: Optional[Dict[str, str]] = None
+    ) -> None:
+        logger.debug(
+            Fore.CYAN
+            + f"[stats_logger] (duration) {key} {tags} | {value} "
+            + Style.RESET_ALL
+        )
+
 
 try:
     from statsd import StatsClient
@@ -107,6 +183,161 @@ try:
         def gauge(self, key: str, value: float) -> None:
             self.client.gauge(key, value)
 
+        def counter(
+            self, key: str, tags: Optional[Dict[str, str]] = None, count: int = 1
+        ) -> None:
+            self.client.incr(key, count)
+
+
+except Exception:  # pylint: disable=broad-except
+    pass
+
+
+try:
+    from prometheus_client import (
+        Counter,
+        Gauge,
+        Histogram,
+        REGISTRY,
+        start_http_server,
+    )
+    from prometheus_client.registry import CollectorRegistry
+
+    class PrometheusStatsLogger(BaseStatsLogger):
+        """
+        Stats logger keeping metrics in a Prometheus registry, with their tags as
+        labels and durations in seconds, eg. for the `chart_data.cache_get` timer:
+
+            superset_chart_data_cache_get_seconds_bucket{cache="hit",...}
+
+        `incr` and `decr` move the same gauge, so that they can be paired, e.g. to
+        count requests in flight, while `counter` keeps a Prometheus counter. Other
+        histograms than durations are unitless.
+
+        The metrics are served in the Prometheus exposition format on `port` when
+        given, or by any exporter of the registry otherwise.
+        """
+
+        # from 5ms up to the 5 minutes of long running warehouse queries
+        DEFAULT_BUCKETS = (
+            0.005,
+            0.01,
+            0.025,
+            0.05,
+            0.1,
+            0.25,
+            0.5,
+            1,
+            2.5,
+            5,
+            10,
+            30,
+            60,
+            120,
+            300,
+        )
+
+        def __init__(
+            self,
+            prefix: str = "superset",
+            port: Optional[int] = None,
+            registry: Optional[CollectorRegistry] = None,
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+        ) -> None:
+            super().__init__(prefix)
+            self.registry = registry or REGISTRY
+            self.buckets = buckets
+            self._metrics: Dict[str, Tuple[Any, Tuple[str, ...]]] = {}
+            self._lock = threading.Lock()
+            if port is not None:
+                try:
+                    start_http_server(port, registry=self.registry)
+                except OSError:
+                    # another process of the server serves the metrics already
+                    logger.warning("Could not serve Prometheus metrics on %s", port)
+
+        def _get_metric(
+            self,
+            metric_class: Any,
+            key: str,
+            tags: Optional[Dict[str, str]] = None,
+            suffix: str = "",
+            buckets: Sequence[float] = Histogram.DEFAULT_BUCKETS,
+        ) -> Optional[Any]:
+            """
+            The child of the metric with the labels of the tags. The labels of a
+            metric are those of the tags it was first recorded with: missing tags
+            are recorded as empty labels and unknown tags are ignored.
+            """
+            name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{self.prefix}_{key}{suffix}")
+            tags = tags or {}
+            with self._lock:
+                if name not in self._metrics:
+                    labelnames = tuple(sorted(tags))
+                    kwargs = {"buckets": buckets} if metric_class is Histogram else {}
+                    try:
+                        metric = metric_class(
+                            name,
+                            key,
+                            labelnames=labelnames,
+                            registry=self.registry,
+                            **kwargs,
+                        )
+                    except ValueError:
+                        logger.warning("Invalid or duplicate metric %s", name)
+                        return None
+                    self._metrics[name] = (metric, labelnames)
+                metric, labelnames = self._metrics[name]
+            if not isinstance(metric, metric_class):
+                logger.warning("Metric %s is a %s", name, type(metric).__name__)
+                return None
+            if not labelnames:
+                return metric
+            return metric.labels(
+                **{label: str(tags.get(label, "")) for label in labelnames}
+            )
+
+        def incr(self, key: str) -> None:
+            gauge = self._get_metric(Gauge, key)
+            if gauge is not None:
+                gauge.inc()
+
+        def decr(self, key: str) -> None:
+            gauge = self._get_metric(Gauge, key)
+            if gauge is not None:
+                gauge.dec()
+
+        def timing(self, key: str, value: float) -> None:
+            self.duration(key, value)
+
+        def gauge(self, key: str, value: float) -> None:
+            gauge = self._get_metric(Gauge, key)
+            if gauge is not None:
+                gauge.set(value)
+
+        def counter(
+            self, key: str, tags: Optional[Dict[str, str]] = None, count: int = 1
+        ) -> None:
+            counter = self._get_metric(Counter, key, tags)
+            if counter is not None:
+                counter.inc(count)
+
+        def histogram(
+            self, key: str, value: float, tags: Optional[Dict[str, str]] = None
+        ) -> None:
+            histogram = self._get_metric(Histogram, key, tags)
+            if histogram is not None:
+                histogram.observe(value)
+
+        def duration(
+            self, key: str, value: float, tags: Optional[Dict[str, str]] = None
+        ) -> None:
+            histogram = self._get_metric(
+                Histogram, key, tags, suffix="_seconds", buckets=self.buckets
+            )
+            if histogram is not None:
+                histogram.observe(value / 1000)
+
 
 except Exception:  # pylint: disable=broad-except
     pass
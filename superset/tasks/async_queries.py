@@ -78,6 +78,9 @@ def load_chart_data_into_cache(
         query_context = _create_query_context_from_form(form_data)
         command = ChartDataCommand(query_context)
         result = command.run(cache=True)
+        if "job_id" not in job_metadata:
+            # refreshing stale cached data, nobody is waiting for the result
+            return
         cache_key = result["cache_key"]
         result_url = f"/api/v1/chart/data/{cache_key}"
         async_query_manager.update_job(
@@ -90,9 +93,10 @@ def load_chart_data_into_cache(
         # TODO: QueryContext should support SIP-40 style errors
         error = ex.message if hasattr(ex, "message") else str(ex)  # type: ignore # pylint: disable=no-member
         errors = [{"message": error}]
-        async_query_manager.update_job(
-            job_metadata, async_query_manager.STATUS_ERROR, errors=errors
-        )
+        if "job_id" in job_metadata:
+            async_query_manager.update_job(
+                job_metadata, async_query_manager.STATUS_ERROR, errors=errors
+            )
         raise ex
 
 
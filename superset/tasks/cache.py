@@ -16,21 +16,29 @@
 # under the License.
 import json
 import logging
+import time
 from typing import Any, Dict, List, Optional, Union
-from urllib import request
-from urllib.error import URLError
 
+from celery import chord
 from celery.utils.log import get_task_logger
-from sqlalchemy import and_, func
-
-from superset import app, db
+from flask import g
+from sqlalchemy import and_
+
+from superset import app, db, security_manager
+from superset.charts.schemas import ChartDataQueryContextSchema
+from superset.common.query_context import QueryContext
+from superset.common.utils.query_cache_manager import is_stale, QueryCacheManager
+from superset.constants import CacheRegion
+from superset.exceptions import SupersetException, SupersetVizException
 from superset.extensions import celery_app
-from superset.models.core import Log
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.models.tags import Tag, TaggedObject
+from superset.utils.concurrency import database_slot, run_concurrently
+from superset.utils.core import NO_TIME_RANGE
 from superset.utils.date_parser import parse_human_datetime
-from superset.views.utils import build_extra_filters
+from superset.utils.log_rollup import get_top_dashboard_ids
+from superset.views.utils import build_extra_filters, get_viz
 
 logger = get_task_logger(__name__)
 logger.setLevel(logging.INFO)
@@ -72,6 +80,14 @@ def get_form_data(
     return form_data
 
 
+def get_payload(chart: Slice, dashboard: Optional[Dashboard] = None) -> Dict[str, Any]:
+    """Return the payload for warming up a given chart, in a given dashboard."""
+    return {
+        **get_form_data(chart.id, dashboard),
+        "dashboard_id": dashboard.id if dashboard else None,
+    }
+
+
 def get_url(chart: Slice, extra_filters: Optional[Dict[str, Any]] = None) -> str:
     """Return external URL for warming up a given chart/table cache."""
     with app.test_request_context():
@@ -87,8 +103,9 @@ class Strategy:  # pylint: disable=too-few-public-methods
     """
     A cache warm up strategy.
 
-    Each strategy defines a `get_urls` method that returns a list of URLs to
-    be fetched from the `/superset/warm_up_cache/` endpoint.
+    Each strategy defines a `get_payloads` method that returns the charts to
+    warm up, as the `form_data` built by `get_form_data`, along with the id of
+    the dashboard they are warmed up for, if any.
 
     Strategies can be configured in `superset/config.py`:
 
@@ -109,8 +126,23 @@ class Strategy:  # pylint: disable=too-few-public-methods
     def __init__(self) -> None:
         pass
 
+    def get_payloads(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError("Subclasses must implement get_payloads!")
+
     def get_urls(self) -> List[str]:
-        raise NotImplementedError("Subclasses must implement get_urls!")
+        """Explore URLs of the charts to warm up"""
+        session = db.create_scoped_session()
+        urls = []
+        for payload in self.get_payloads():
+            chart = session.query(Slice).get(payload["slice_id"])
+            if chart:
+                form_data = {
+                    key: value
+                    for key, value in payload.items()
+                    if key != "dashboard_id"
+                }
+                urls.append(get_url(chart, form_data))
+        return urls
 
 
 class DummyStrategy(Strategy):  # pylint: disable=too-few-public-methods
@@ -131,11 +163,11 @@ class DummyStrategy(Strategy):  # pylint: disable=too-few-public-methods
 
     name = "dummy"
 
-    def get_urls(self) -> List[str]:
+    def get_payloads(self) -> List[Dict[str, Any]]:
         session = db.create_scoped_session()
         charts = session.query(Slice).all()
 
-        return [get_url(chart) for chart in charts]
+        return [get_payload(chart) for chart in charts]
 
 
 class TopNDashboardsStrategy(Strategy):  # pylint: disable=too-few-public-methods
@@ -163,26 +195,17 @@ class TopNDashboardsStrategy(Strategy):  # pylint: disable=too-few-public-method
         self.top_n = top_n
         self.since = parse_human_datetime(since) if since else None
 
-    def get_urls(self) -> List[str]:
-        urls = []
+    def get_payloads(self) -> List[Dict[str, Any]]:
+        payloads = []
         session = db.create_scoped_session()
 
-        records = (
-            session.query(Log.dashboard_id, func.count(Log.dashboard_id))
-            .filter(and_(Log.dashboard_id.isnot(None), Log.dttm >= self.since))
-            .group_by(Log.dashboard_id)
-            .order_by(func.count(Log.dashboard_id).desc())
-            .limit(self.top_n)
-            .all()
-        )
-        dash_ids = [record.dashboard_id for record in records]
+        dash_ids = get_top_dashboard_ids(session, self.since, self.top_n)
         dashboards = session.query(Dashboard).filter(Dashboard.id.in_(dash_ids)).all()
         for dashboard in dashboards:
             for chart in dashboard.slices:
-                form_data_with_filters = get_form_data(chart.id, dashboard)
-                urls.append(get_url(chart, form_data_with_filters))
+                payloads.append(get_payload(chart, dashboard))
 
-        return urls
+        return payloads
 
 
 class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
@@ -207,8 +230,8 @@ class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
         super().__init__()
         self.tags = tags or []
 
-    def get_urls(self) -> List[str]:
-        urls = []
+    def get_payloads(self) -> List[Dict[str, Any]]:
+        payloads = []
         session = db.create_scoped_session()
 
         tags = session.query(Tag).filter(Tag.name.in_(self.tags)).all()
@@ -229,7 +252,7 @@ class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
         tagged_dashboards = session.query(Dashboard).filter(Dashboard.id.in_(dash_ids))
         for dashboard in tagged_dashboards:
             for chart in dashboard.slices:
-                urls.append(get_url(chart))
+                payloads.append(get_payload(chart))
 
         # add charts that are tagged
         tagged_objects = (
@@ -245,22 +268,201 @@ class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
         chart_ids = [tagged_object.object_id for tagged_object in tagged_objects]
         tagged_charts = session.query(Slice).filter(Slice.id.in_(chart_ids))
         for chart in tagged_charts:
-            urls.append(get_url(chart))
+            payloads.append(get_payload(chart))
 
-        return urls
+        return payloads
 
 
 strategies = [DummyStrategy, TopNDashboardsStrategy, DashboardTagsStrategy]
 
 
+def get_query_context(
+    chart: Slice, extra_filters: Optional[List[Dict[str, Any]]] = None
+) -> Optional[QueryContext]:
+    """
+    Build the query context of a chart from the one saved with it, with the given
+    extra filters applied to all its queries. Charts last saved before query
+    contexts were saved with charts have none.
+    """
+    if not chart.query_context:
+        return None
+
+    query_context = json.loads(chart.query_context)
+    for query in query_context.get("queries", []):
+        apply_extra_filters(query, extra_filters or [])
+    query_context["force"] = False
+    return ChartDataQueryContextSchema().load(query_context)
+
+
+# the fields of a query object set by the legacy extra filters targeting time options
+# rather than a column, see `merge_extra_filters`
+TIME_EXTRA_FILTER_FIELDS = {
+    "__time_range": ("time_range",),
+    "__time_col": ("granularity",),
+    "__time_grain": ("extras", "time_grain_sqla"),
+    "__time_origin": ("extras", "druid_time_origin"),
+    "__granularity": ("granularity",),
+}
+
+
+def apply_extra_filters(
+    query: Dict[str, Any], extra_filters: List[Dict[str, Any]]
+) -> None:
+    """
+    Apply legacy extra filters to a query object the way dashboards do: time options
+    are set on the query object and recorded in its `applied_time_extras`, while the
+    filters on a column with values are appended to its filters.
+    """
+    filters = list(query.get("filters", []))
+    for extra_filter in extra_filters:
+        column, value = extra_filter["col"], extra_filter.get("val")
+        fields = TIME_EXTRA_FILTER_FIELDS.get(column)
+        if fields:
+            if value and value != NO_TIME_RANGE:
+                target = query
+                for field in fields[:-1]:
+                    target[field] = target.get(field) or {}
+                    target = target[field]
+                target[fields[-1]] = value
+                query["applied_time_extras"] = {
+                    **(query.get("applied_time_extras") or {}),
+                    column: value,
+                }
+        elif value:
+            filters.append({**extra_filter, "op": extra_filter["op"].upper()})
+    query["filters"] = filters
+
+
+def is_warm(query_context: QueryContext) -> bool:
+    """Whether fresh results of all the queries of a query context are cached"""
+    cache_keys = query_context.get_cache_keys()
+    if len(cache_keys) < len(query_context.queries):
+        return False
+    # a single call to the cache backend for all the queries
+    cache_values = QueryCacheManager.get_cache_values(cache_keys, CacheRegion.DATA)
+    for cache_key in cache_keys:
+        cache_value = cache_values.get(cache_key) if cache_key else None
+        if not cache_value or is_stale(cache_value):
+            return False
+    return True
+
+
+def warm_up_legacy_chart(chart: Slice, payload: Dict[str, Any]) -> None:
+    """Warm up a chart without a query context through its legacy viz"""
+    form_data = {
+        **chart.form_data,
+        **{key: value for key, value in payload.items() if key != "dashboard_id"},
+    }
+    viz_obj = get_viz(
+        datasource_type=chart.datasource.type,
+        datasource_id=chart.datasource.id,
+        form_data=form_data,
+        force=False,
+    )
+    g.form_data = form_data
+    try:
+        viz_payload = viz_obj.get_payload()
+    finally:
+        delattr(g, "form_data")
+    if viz_obj.has_error(viz_payload):
+        raise SupersetVizException(errors=viz_payload["errors"])
+
+
+def warm_up_chart(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the queries of a chart, unless they are all cached already, and return a
+    summary of the outcome and time spent.
+    """
+    # pylint: disable=import-outside-toplevel
+    from superset.charts.data.commands.get_data_command import ChartDataCommand
+
+    start = time.perf_counter()
+    summary = {
+        "chart_id": payload["slice_id"],
+        "dashboard_id": payload.get("dashboard_id"),
+    }
+    try:
+        chart = db.session.query(Slice).get(payload["slice_id"])
+        if not chart or not chart.datasource:
+            raise SupersetException("Chart or its datasource does not exist")
+        query_context = get_query_context(chart, payload.get("extra_filters"))
+        if query_context is None:
+            # legacy viz queries run serially in the current thread
+            database = getattr(chart.datasource, "database", None)
+            with database_slot(database.id if database else None):
+                warm_up_legacy_chart(chart, payload)
+            summary["status"] = "warmed"
+        elif is_warm(query_context):
+            summary["status"] = "cached"
+        else:
+            # the queries of the command take their database slots, and may fan out
+            # to other threads which couldn't take one while this thread holds it
+            command = ChartDataCommand(query_context)
+            command.validate()
+            command.run()
+            summary["status"] = "warmed"
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.exception("Error warming up chart %s", payload["slice_id"])
+        summary["status"] = "error"
+        summary["error"] = str(ex)
+    summary["duration"] = round(time.perf_counter() - start, 3)
+    logger.info(
+        "Chart %s: %s in %.3fs",
+        summary["chart_id"],
+        summary["status"],
+        summary["duration"],
+    )
+    return summary
+
+
+def set_warmup_user() -> None:
+    g.user = security_manager.get_user_by_username(app.config["CACHE_WARMUP_USER"])
+
+
+@celery_app.task(name="cache-warmup-chart")
+def cache_warmup_chart(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Warm up the cache of a single chart."""
+    set_warmup_user()
+    return warm_up_chart(payload)
+
+
+@celery_app.task(name="cache-warmup-report")
+def cache_warmup_report(
+    summaries: List[Dict[str, Any]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group the summaries of warmed up charts by outcome and log the time spent.
+    """
+    results: Dict[str, List[Dict[str, Any]]] = {
+        "success": [],
+        "skipped": [],
+        "errors": [],
+    }
+    groups = {"warmed": "success", "cached": "skipped", "error": "errors"}
+    for summary in summaries:
+        results[groups[summary["status"]]].append(summary)
+
+    logger.info(
+        "Warmed up %i charts, skipped %i already cached, %i errors, in %.3fs",
+        len(results["success"]),
+        len(results["skipped"]),
+        len(results["errors"]),
+        sum(summary["duration"] for summary in summaries),
+    )
+    return results
+
+
 @celery_app.task(name="cache-warmup")
 def cache_warmup(
     strategy_name: str, *args: Any, **kwargs: Any
-) -> Union[Dict[str, List[str]], str]:
+) -> Union[Dict[str, List[Dict[str, Any]]], str]:
     """
     Warm up cache.
 
-    This task periodically hits charts to warm up the cache.
+    This task periodically runs the queries of charts to warm up the cache.
+    Charts are warmed up in this worker, concurrently when
+    `MAX_PARALLEL_QUERY_THREADS` is set, or dispatched to all workers when
+    `CACHE_WARMUP_FAN_OUT` is set.
 
     """
     logger.info("Loading strategy")
@@ -282,14 +484,12 @@ def cache_warmup(
         logger.exception(message)
         return message
 
-    results: Dict[str, List[str]] = {"success": [], "errors": []}
-    for url in strategy.get_urls():
-        try:
-            logger.info("Fetching %s", url)
-            request.urlopen(url)  # pylint: disable=consider-using-with
-            results["success"].append(url)
-        except URLError:
-            logger.exception("Error warming up cache!")
-            results["errors"].append(url)
+    payloads = strategy.get_payloads()
+    if app.config["CACHE_WARMUP_FAN_OUT"]:
+        chord(cache_warmup_chart.s(payload) for payload in payloads)(
+            cache_warmup_report.s()
+        )
+        return f"Dispatched {len(payloads)} charts to warm up"
 
-    return results
+    set_warmup_user()
+    return cache_warmup_report(run_concurrently(warm_up_chart, payloads))
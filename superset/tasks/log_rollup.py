@@ -0,0 +1,53 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import logging
+
+from celery.exceptions import SoftTimeLimitExceeded
+
+from superset.extensions import celery_app
+from superset.utils.celery import session_scope
+from superset.utils.log_rollup import prune_logs, prune_rollup, rollup_logs
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="log_rollup.rollup")
+def rollup() -> None:
+    """
+    Celery beat task counting the new rows of the `logs` table into the rollup
+    """
+    try:
+        with session_scope(nullpool=True) as session:
+            row_count = rollup_logs(session)
+        logger.info("Counted %i logs in the rollup", row_count)
+    except SoftTimeLimitExceeded as ex:
+        # logs are counted and checkpointed in batches, the next run resumes
+        logger.warning("A timeout occurred while counting logs: %s", ex)
+
+
+@celery_app.task(name="log_rollup.prune")
+def prune() -> None:
+    """
+    Celery beat task deleting the raw logs and hourly counters past their retention
+    """
+    try:
+        with session_scope(nullpool=True) as session:
+            log_count = prune_logs(session)
+            counter_count = prune_rollup(session)
+        logger.info("Deleted %i logs and %i hourly counters", log_count, counter_count)
+    except SoftTimeLimitExceeded as ex:
+        logger.warning("A timeout occurred while pruning logs: %s", ex)
@@ -80,6 +80,44 @@ def set_and_log_cache(
         logger.exception(ex)
 
 
+def set_many_and_log_cache(
+    cache_instance: Cache,
+    cache_values: Dict[str, Dict[str, Any]],
+    cache_timeout: Optional[int] = None,
+    datasource_uid: Optional[str] = None,
+) -> None:
+    """Like `set_and_log_cache`, with a single call to the cache backend"""
+    if isinstance(cache_instance.cache, NullCache) or not cache_values:
+        return
+
+    timeout = (
+        cache_timeout
+        if cache_timeout is not None
+        else app.config["CACHE_DEFAULT_TIMEOUT"]
+    )
+    try:
+        dttm = datetime.utcnow().isoformat().split(".")[0]
+        cache_instance.set_many(
+            {key: {**value, "dttm": dttm} for key, value in cache_values.items()},
+            timeout=timeout,
+        )
+        for _ in cache_values:
+            stats_logger.incr("set_cache_key")
+
+        if datasource_uid and config["STORE_CACHE_KEYS_IN_METADATA_DB"]:
+            db.session.add_all(
+                CacheKey(
+                    cache_key=cache_key,
+                    cache_timeout=cache_timeout,
+                    datasource_uid=datasource_uid,
+                )
+                for cache_key in cache_values
+            )
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Could not cache keys %s", ", ".join(cache_values))
+        logger.exception(ex)
+
+
 # If a user sets `max_age` to 0, for long the browser should cache the
 # resource? Flask-Caching will cache forever, but for the HTTP header we need
 # to specify a "far future" date.
@@ -0,0 +1,219 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Helpers to run independent units of work, typically warehouse queries,
+concurrently in threads while keeping the Flask context they depend on.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import as_completed, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from flask import (
+    _request_ctx_stack,
+    current_app,
+    g,
+    has_app_context,
+    has_request_context,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_database_semaphores: Dict[Any, threading.BoundedSemaphore] = {}
+_local = threading.local()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide executor, sized with `MAX_PARALLEL_QUERY_THREADS`.
+
+    Executors are keyed by process id, so that processes forked after the executor
+    was created (Celery/gunicorn workers) don't inherit threads that no longer run.
+    """
+    pid = os.getpid()
+    with _lock:
+        if pid not in _executors:
+            _executors.clear()
+            _database_semaphores.clear()
+            _executors[pid] = ThreadPoolExecutor(
+                max_workers=current_app.config["MAX_PARALLEL_QUERY_THREADS"],
+                thread_name_prefix="superset-query",
+            )
+        return _executors[pid]
+
+
+def _get_held_slots() -> Set[Any]:
+    """Keys of the databases the current thread holds a slot for"""
+    return _local.__dict__.setdefault("database_slots", set())
+
+
+@contextmanager
+def database_slot(database_key: Any) -> Iterator[None]:
+    """
+    Limit the number of units of work running concurrently against a single
+    database to `MAX_PARALLEL_QUERIES_PER_DATABASE` across the process.
+
+    Slots are reentrant: a thread holding the slot of a database doesn't take
+    another one for nested units of work, and `run_concurrently` runs them in that
+    thread rather than waiting on other threads needing a slot of the database.
+    """
+    limit = current_app.config["MAX_PARALLEL_QUERIES_PER_DATABASE"]
+    held_slots = _get_held_slots()
+    if database_key is None or not limit or database_key in held_slots:
+        yield
+        return
+
+    with _lock:
+        semaphore = _database_semaphores.get(database_key)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(limit)
+            _database_semaphores[database_key] = semaphore
+    with semaphore:
+        held_slots.add(database_key)
+        try:
+            yield
+        finally:
+            held_slots.discard(database_key)
+
+
+def with_context(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap a function so that it runs in a copy of the current application and
+    request context, with the same `g.user`, when called from another thread.
+    """
+    if not has_app_context():
+        return func
+
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    user = getattr(g, "user", None)
+    request_ctx = _request_ctx_stack.top.copy() if has_request_context() else None
+
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        with app.app_context():
+            if user is not None:
+                g.user = user
+            if request_ctx is None:
+                return func(*args, **kwargs)
+            with request_ctx:
+                return func(*args, **kwargs)
+
+    return wrapper
+
+
+def run_concurrently(
+    func: Callable[..., T], items: Sequence[Any], database_key: Optional[Any] = None,
+) -> List[T]:
+    """
+    Call `func` on each item, concurrently when `MAX_PARALLEL_QUERY_THREADS` is
+    set, and return the results in the order of `items`. The first exception
+    raised by any call is raised once all calls have completed.
+
+    :param func: function called with each item
+    :param items: items to call the function with
+    :param database_key: key of the database the calls run against, used to cap
+        the number of concurrent calls per database
+    """
+    if (
+        len(items) < 2
+        or not current_app.config["MAX_PARALLEL_QUERY_THREADS"]
+        # nested calls run serially, as waiting on the executor from one of its own
+        # threads could exhaust it, and waiting on calls needing the slot the
+        # current thread holds would never end
+        or getattr(_local, "in_executor", False)
+        or database_key in _get_held_slots()
+    ):
+        return [_run_in_slot(func, item, database_key) for item in items]
+
+    executor = get_executor()
+    futures: List[Future] = [
+        executor.submit(with_context(_run_in_executor), func, item, database_key)
+        for item in items
+    ]
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in futures]
+
+
+def iter_concurrently(
+    func: Callable[..., T], items: Sequence[Any],
+) -> Iterator[Tuple[int, Optional[T], Optional[Exception]]]:
+    """
+    Call `func` on each item, concurrently when `MAX_PARALLEL_QUERY_THREADS` is
+    set, and yield the index of each item along with the result or the exception
+    of its call, in the order the calls complete.
+
+    :param func: function called with each item
+    :param items: items to call the function with
+    """
+    if (
+        len(items) < 2
+        or not current_app.config["MAX_PARALLEL_QUERY_THREADS"]
+        or getattr(_local, "in_executor", False)
+    ):
+        for index, item in enumerate(items):
+            try:
+                yield index, func(item), None
+            except Exception as ex:  # pylint: disable=broad-except
+                yield index, None, ex
+        return
+
+    executor = get_executor()
+    futures: Dict[Future, int] = {
+        executor.submit(with_context(_run_in_executor), func, item): index
+        for index, item in enumerate(items)
+    }
+    for future in as_completed(futures):
+        error = future.exception()
+        if error is None:
+            yield futures[future], future.result(), None
+        else:
+            yield futures[future], None, error  # type: ignore
+
+
+def _run_in_slot(func: Callable[..., T], item: Any, database_key: Optional[Any]) -> T:
+    with database_slot(database_key):
+        return func(item)
+
+
+def _run_in_executor(
+    func: Callable[..., T], item: Any, database_key: Optional[Any] = None
+) -> T:
+    in_executor = getattr(_local, "in_executor", False)
+    _local.in_executor = True
+    try:
+        return _run_in_slot(func, item, database_key)
+    finally:
+        _local.in_executor = in_executor
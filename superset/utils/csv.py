@@ -19,6 +19,7 @@ import urllib.request
 from typing import Any, Dict, Optional
 from urllib.error import URLError
 
+import numpy as np
 import pandas as pd
 import simplejson
 
@@ -58,14 +59,71 @@ def escape_value(value: str) -> str:
     return value
 
 
+def escape_column(series: pd.Series) -> Optional[pd.Series]:
+    """
+    Escapes the strings of a column the same way as `escape_value`, matching the
+    distinct values of the column at once instead of each cell. Columns which can't
+    hold strings, such as numeric and temporal ones, are skipped entirely. Columns
+    holding unhashable values are escaped cell by cell.
+
+    :param series: The column to escape
+    :return: The escaped column, or None if no value needs escaping
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    elif not pd.api.types.is_string_dtype(series.dtype):
+        return None
+
+    try:
+        codes, uniques = pd.factorize(series)
+    except TypeError:
+        # unhashable values, e.g. the lists or dicts of JSON or ARRAY columns
+        return series.map(lambda v: escape_value(v) if isinstance(v, str) else v)
+    uniques = pd.Series(uniques, dtype=series.dtype)
+    try:
+        strings = uniques.str
+    except AttributeError:
+        # the column doesn't hold any string
+        return None
+
+    needs_escaping = strings.match(problematic_chars_re, na=False) & ~strings.match(
+        negative_number_re, na=False
+    )
+    needs_escaping = needs_escaping.to_numpy(bool)
+    if not needs_escaping.any():
+        return None
+
+    escaped_uniques = uniques.to_numpy(dtype=object, copy=True)
+    escaped_uniques[needs_escaping] = (
+        "'" + uniques[needs_escaping].str.replace("|", "\\|", regex=False)
+    ).to_numpy(dtype=object)
+
+    # missing values have a code of -1
+    to_escape = (codes >= 0) & needs_escaping[codes]
+    values = series.to_numpy(dtype=object, copy=True)
+    values[to_escape] = escaped_uniques[codes[to_escape]]
+    return pd.Series(values, index=series.index, name=series.name)
+
+
 def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
     escape_values = lambda v: escape_value(v) if isinstance(v, str) else v
 
     # Escape csv headers
     df = df.rename(columns=escape_values)
 
-    # Escape csv rows
-    df = df.applymap(escape_values)
+    # Escape csv rows, only rebuilding the DataFrame when some values were escaped
+    columns = [df.iloc[:, idx] for idx in range(len(df.columns))]
+    escaped_columns = [escape_column(column) for column in columns]
+    if any(column is not None for column in escaped_columns):
+        escaped_df = pd.DataFrame(
+            {
+                idx: column if escaped is None else escaped
+                for idx, (column, escaped) in enumerate(zip(columns, escaped_columns))
+            },
+            index=df.index,
+        )
+        escaped_df.columns = df.columns
+        df = escaped_df
 
     return df.to_csv(**kwargs)
 
@@ -0,0 +1,235 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Process-wide registry of the SQLAlchemy engines of the analytics databases.
+
+Engines used to be created, along with their connection pool, each time a
+`Database` was asked for one, so that most queries paid for a new connection. The
+registry keeps a single engine per database, effective URL, impersonated user and
+engine parameters, so that their connections are pooled and reused across requests
+and tasks.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from flask import Flask
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import URL
+from sqlalchemy.pool import Pool, QueuePool
+
+from superset.stats_logger import BaseStatsLogger, DummyStatsLogger
+from superset.utils.hashing import md5_sha_from_dict
+
+logger = logging.getLogger(__name__)
+
+
+class _RegisteredEngine:  # pylint: disable=too-few-public-methods
+    def __init__(self, database_id: Optional[int], engine: Engine) -> None:
+        self.database_id = database_id
+        self.engine = engine
+        self.last_used = time.monotonic()
+
+
+class EngineRegistry:
+    """
+    Registry of the engines of the analytics databases, pooling their connections
+    with the `DATABASE_ENGINE_POOL` parameters unless the engine parameters of the
+    database override them.
+
+    Engines are evicted, and their pool disposed, once they haven't been used for
+    `DATABASE_ENGINE_REGISTRY_IDLE_TIMEOUT` seconds, or when the registry holds more
+    than `DATABASE_ENGINE_REGISTRY_MAX_ENGINES` of them. Forked processes, such as
+    Celery or Gunicorn workers, start with an empty registry and never reuse the
+    connections of their parent.
+    """
+
+    def __init__(self) -> None:
+        self._engines: "OrderedDict[str, _RegisteredEngine]" = OrderedDict()
+        self._inherited_engines: List[Engine] = []
+        self._lock = threading.RLock()
+        self._pool_params: Dict[str, Any] = {}
+        self._max_engines: Optional[int] = None
+        self._idle_timeout: Optional[int] = None
+        self._last_eviction = time.monotonic()
+        self._stats_logger: BaseStatsLogger = DummyStatsLogger()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def init_app(self, app: Flask) -> None:
+        self._pool_params = app.config["DATABASE_ENGINE_POOL"]
+        self._max_engines = app.config["DATABASE_ENGINE_REGISTRY_MAX_ENGINES"]
+        self._idle_timeout = app.config["DATABASE_ENGINE_REGISTRY_IDLE_TIMEOUT"]
+        self._stats_logger = app.config["STATS_LOGGER"]
+
+    @staticmethod
+    def get_key(
+        database_id: Optional[int],
+        url: URL,
+        params: Dict[str, Any],
+        effective_username: Optional[str] = None,
+    ) -> str:
+        return md5_sha_from_dict(
+            {
+                "database_id": database_id,
+                # the URL with its password, so that new credentials get a new engine
+                "url": str(url),
+                "effective_username": effective_username,
+                "params": params,
+            },
+            default=repr,
+        )
+
+    def get_engine(
+        self,
+        database_id: Optional[int],
+        url: URL,
+        params: Dict[str, Any],
+        effective_username: Optional[str] = None,
+    ) -> Engine:
+        """
+        Get the engine of a database for a URL and engine parameters, creating it if
+        it isn't registered yet.
+
+        :param database_id: The id of the database
+        :param url: The effective URL of the engine
+        :param params: The parameters of `create_engine`
+        :param effective_username: The impersonated user, if any
+        :return: The engine
+        """
+        key = self.get_key(database_id, url, params, effective_username)
+        with self._lock:
+            self._evict_idle()
+            registered = self._engines.get(key)
+            if registered:
+                self._engines.move_to_end(key)
+                registered.last_used = time.monotonic()
+                self._stats_logger.incr("engine_registry.hit")
+                return registered.engine
+
+            self._stats_logger.incr("engine_registry.miss")
+            engine = create_engine(url, **self.get_engine_params(url, params))
+            self._instrument(engine, database_id)
+            self._engines[key] = _RegisteredEngine(database_id, engine)
+            while self._max_engines and len(self._engines) > self._max_engines:
+                self._evict(next(iter(self._engines)))
+            self._stats_logger.gauge("engine_registry.engines", len(self._engines))
+            return engine
+
+    def get_engine_params(self, url: URL, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        The parameters of `create_engine` for the given ones, with the pool
+        parameters unless another pool class is set or is the default one of the
+        dialect, for instance for SQLite.
+        """
+        if "poolclass" in params:
+            return params
+        pool_class = url.get_dialect().get_pool_class(url)
+        if not issubclass(pool_class, QueuePool):
+            return params
+        return {**self._pool_params, **params}
+
+    def dispose(self, database_id: Optional[int] = None) -> None:
+        """
+        Evict the engines of a database, or all of them, closing their idle
+        connections. Checked out connections are closed once returned.
+        """
+        with self._lock:
+            for key, registered in list(self._engines.items()):
+                if database_id is None or registered.database_id == database_id:
+                    self._evict(key)
+
+    def get_pool_status(self) -> List[Dict[str, Any]]:
+        """The status of the pool of each registered engine, for monitoring"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "database_id": registered.database_id,
+                    "pool": registered.engine.pool.status(),
+                    "idle_seconds": now - registered.last_used,
+                }
+                for registered in self._engines.values()
+            ]
+
+    def _evict(self, key: str) -> None:
+        registered = self._engines.pop(key)
+        registered.engine.dispose()
+        self._stats_logger.incr("engine_registry.evicted")
+        self._stats_logger.gauge("engine_registry.engines", len(self._engines))
+
+    def _evict_idle(self) -> None:
+        if not self._idle_timeout:
+            return
+        now = time.monotonic()
+        # look for idle engines at most every tenth of the timeout
+        if now - self._last_eviction < self._idle_timeout / 10:
+            return
+        self._last_eviction = now
+        for key, registered in list(self._engines.items()):
+            if now - registered.last_used > self._idle_timeout:
+                self._evict(key)
+
+    def _after_fork(self) -> None:
+        # the engines of the parent share its connections: they are neither disposed
+        # nor garbage collected, which would close the connections of the parent, and
+        # the checkout listener keeps them from being used by the child
+        self._inherited_engines.extend(
+            registered.engine for registered in self._engines.values()
+        )
+        self._engines = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _instrument(self, engine: Engine, database_id: Optional[int]) -> None:
+        stats_key = f"database.{database_id}.pool"
+
+        def log_pool_metrics(pool: Pool) -> None:
+            if isinstance(pool, QueuePool):
+                self._stats_logger.gauge(f"{stats_key}.checked_out", pool.checkedout())
+                self._stats_logger.gauge(f"{stats_key}.overflow", pool.overflow())
+
+        @event.listens_for(engine, "connect")
+        def connect(  # pylint: disable=unused-argument
+            dbapi_connection: Any, connection_record: Any
+        ) -> None:
+            connection_record.info["pid"] = os.getpid()
+            self._stats_logger.incr(f"{stats_key}.connect")
+
+        @event.listens_for(engine, "checkout")
+        def checkout(  # pylint: disable=unused-argument
+            dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+        ) -> None:
+            pid = os.getpid()
+            owner_pid = connection_record.info.get("pid", pid)
+            if owner_pid != pid:
+                # never use a connection opened by another process
+                connection_record.connection = connection_proxy.connection = None
+                raise exc.DisconnectionError(
+                    f"Connection record belongs to pid {owner_pid}, "
+                    f"attempting to check out in pid {pid}"
+                )
+            log_pool_metrics(engine.pool)
+
+        @event.listens_for(engine, "checkin")
+        def checkin(  # pylint: disable=unused-argument
+            dbapi_connection: Any, connection_record: Any
+        ) -> None:
+            log_pool_metrics(engine.pool)
@@ -0,0 +1,230 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Streaming exports of query results.
+
+Results are exported chunk after chunk of `DATA_EXPORT_CHUNK_SIZE` rows, as CSV,
+Parquet or Arrow IPC stream, so that the whole file never needs to be held in
+memory. Exports can also be gzipped on the fly. The types of Parquet and Arrow
+exports are unified across chunks before they are exported.
+"""
+import codecs
+import tempfile
+import zlib
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from superset import app
+from superset.result_set import cast_table, unify_schemas
+from superset.utils import csv
+
+config = app.config
+
+EXPORT_FORMATS = ("csv", "parquet", "arrow")
+
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+class _ChunkSink:
+    """Write-only file collecting the bytes written to it until they are taken"""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_df_chunks(
+    df: pd.DataFrame, chunk_size: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """Split a DataFrame in chunks of `DATA_EXPORT_CHUNK_SIZE` rows by default"""
+    chunk_size = chunk_size or config["DATA_EXPORT_CHUNK_SIZE"]
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df.index), chunk_size):
+        yield df.iloc[start : start + chunk_size]
+
+
+def iter_csv(
+    dfs: Iterable[pd.DataFrame], index: bool = False, **kwargs: Any
+) -> Iterator[bytes]:
+    """
+    Export DataFrames with the same columns as a single escaped CSV file, with the
+    `CSV_EXPORT` options by default
+    """
+    kwargs = {**config["CSV_EXPORT"], **kwargs}
+    # a single encoder, so that encodings with a BOM, e.g. utf-8-sig or utf-16, only
+    # write it at the start of the file
+    encoder = codecs.getincrementalencoder(kwargs.pop("encoding", None) or "utf-8")()
+    kwargs.pop("header", None)
+    header = True
+    for df in dfs:
+        data = csv.df_to_escaped_csv(df, index=index, header=header, **kwargs)
+        header = False
+        if data:
+            yield encoder.encode(data)
+    data = encoder.encode("", final=True)
+    if data:
+        yield data
+
+
+def unify_tables(
+    dfs: Iterable[pd.DataFrame], index: bool = False
+) -> Tuple[Optional[pa.Schema], Iterator[pa.Table]]:
+    """
+    Convert DataFrames with the same columns to Arrow tables cast to a common schema.
+
+    The types of the columns of each DataFrame are inferred separately, eg. a column
+    that is all nulls in the first DataFrame, or decimals of a larger scale in a
+    later one, so all the DataFrames are converted before the common schema is
+    known. The tables but the first one are spooled to a temporary file meanwhile,
+    so that conversion errors are raised before any byte is exported while only a
+    table is held in memory at a time.
+
+    :returns: The common schema, None when there are no DataFrames, and the tables
+    """
+    first_table: Optional[pa.Table] = None
+    schema: Optional[pa.Schema] = None
+    spool = tempfile.TemporaryFile()
+    spooled: List[Tuple[int, int]] = []
+    try:
+        for df in dfs:
+            table = pa.Table.from_pandas(df, preserve_index=index)
+            if first_table is None:
+                first_table = table
+                schema = table.schema
+                continue
+            schema = unify_schemas(schema, table.schema)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            data = sink.getvalue()
+            spooled.append((spool.tell(), data.size))
+            spool.write(data)
+    except Exception:
+        spool.close()
+        raise
+
+    def iter_spooled_tables() -> Iterator[pa.Table]:
+        with spool:
+            if first_table is not None:
+                yield cast_table(first_table, schema)
+            for offset, size in spooled:
+                spool.seek(offset)
+                table = pa.ipc.open_stream(spool.read(size)).read_all()
+                yield cast_table(table, schema)
+
+    return schema, iter_spooled_tables()
+
+
+def iter_parquet(
+    schema: Optional[pa.Schema], tables: Iterable[pa.Table]
+) -> Iterator[bytes]:
+    """Export tables of the given schema as a Parquet file, a row group per table"""
+    if schema is None:
+        return iter([])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(
+        sink, schema, compression=config["DATA_EXPORT_COMPRESSION"]
+    )
+
+    def iter_chunks() -> Iterator[bytes]:
+        for table in tables:
+            writer.write_table(table)
+            yield sink.take()
+        writer.close()
+        yield sink.take()
+
+    return iter_chunks()
+
+
+def iter_arrow(
+    schema: Optional[pa.Schema], tables: Iterable[pa.Table]
+) -> Iterator[bytes]:
+    """Export tables of the given schema as an Arrow IPC stream"""
+    if schema is None:
+        return iter([])
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+
+    def iter_chunks() -> Iterator[bytes]:
+        for table in tables:
+            writer.write_table(table)
+            yield sink.take()
+        writer.close()
+        yield sink.take()
+
+    return iter_chunks()
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip chunks of bytes on the fly"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_df(df: pd.DataFrame, export_format: str) -> Iterator[bytes]:
+    """Export a DataFrame chunk after chunk, with its index unless it's a range"""
+    return iter_export(
+        iter_df_chunks(df),
+        export_format,
+        index=not isinstance(df.index, pd.RangeIndex),
+    )
+
+
+def iter_export(
+    dfs: Iterable[pd.DataFrame], export_format: str, index: bool = False
+) -> Iterator[bytes]:
+    """
+    Export DataFrames with the same columns as a single file of the given format.
+    Parquet and Arrow exports convert all the DataFrames up front, see
+    `unify_tables`, so that they fail before any byte is exported.
+    """
+    if export_format == "csv":
+        return iter_csv(dfs, index=index)
+    if export_format == "parquet":
+        return iter_parquet(*unify_tables(dfs, index=index))
+    if export_format == "arrow":
+        return iter_arrow(*unify_tables(dfs, index=index))
+    raise ValueError(f"Unsupported export format: {export_format}")
@@ -15,6 +15,8 @@
 # specific language governing permissions and limitations
 # under the License.
 import hashlib
+import json as std_json
+from decimal import Decimal
 from typing import Any, Callable, Dict, Optional
 
 import simplejson as json
@@ -32,3 +34,30 @@ def md5_sha_from_dict(
     json_data = json.dumps(obj, sort_keys=True, ignore_nan=ignore_nan, default=default)
 
     return md5_sha_from_str(json_data)
+
+
+def canonical_md5_sha_from_dict(
+    obj: Dict[Any, Any], default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """
+    Faster equivalent of `md5_sha_from_dict(obj, ignore_nan=True, default=default)`
+    for dicts of JSON types, other than named tuples, and values handled by
+    `default`. The standard library encoder is used, falling back to
+    `md5_sha_from_dict` for values it serializes differently (NaN, Decimal).
+    """
+    try:
+        json_data = std_json.dumps(
+            obj, sort_keys=True, allow_nan=False, default=_strict_default(default)
+        )
+    except (ValueError, TypeError):
+        return md5_sha_from_dict(obj, ignore_nan=True, default=default)
+    return md5_sha_from_str(json_data)
+
+
+def _strict_default(default: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    def strict_default(value: Any) -> Any:
+        if default is None or isinstance(value, Decimal):
+            raise TypeError(f"Unsupported type {type(value)}")
+        return default(value)
+
+    return strict_default
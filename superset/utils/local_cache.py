@@ -0,0 +1,184 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, TypeVar
+
+from flask import current_app, g, has_request_context
+
+T = TypeVar("T")
+
+
+def get_request_memo(name: str) -> Optional[Dict[Any, Any]]:
+    """
+    Return a dict kept in `g` for the duration of the current request, to memoize
+    values that don't change within a request, or `None` outside of requests.
+    """
+    if not has_request_context():
+        return None
+    attr = f"_request_memo_{name}"
+    if not hasattr(g, attr):
+        setattr(g, attr, {})
+    return getattr(g, attr)
+
+
+def memoize_in_request(name: str, key: Hashable, func: Callable[[], T]) -> T:
+    """Return `func()`, computed once per request for a given memo name and key"""
+    memo = get_request_memo(name)
+    if memo is None:
+        return func()
+    if key not in memo:
+        memo[key] = func()
+    return memo[key]
+
+
+class LocalCacheEntry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: float
+    tag: Optional[str]
+
+
+class LocalCache:
+    """
+    Process-local LRU cache kept in front of a shared cache backend.
+
+    Entries are bounded by their total size, as reported when they are set, and
+    by a per-entry expiry. Within a request, entries are also memoized in `g`,
+    so that a request reading the same key several times always gets the same
+    value, even if it was evicted from the process-local cache in the meantime.
+    """
+
+    def __init__(self, name: str, max_size_key: str, timeout_key: str) -> None:
+        self.name = name
+        self.max_size_key = max_size_key
+        self.timeout_key = timeout_key
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, LocalCacheEntry]" = OrderedDict()
+        self._size = 0
+        self._pid = os.getpid()
+
+    @property
+    def max_size(self) -> int:
+        return current_app.config[self.max_size_key]
+
+    @property
+    def timeout(self) -> int:
+        return current_app.config[self.timeout_key]
+
+    def _request_memo(self) -> Optional[Dict[str, Any]]:
+        return get_request_memo(f"local_cache_{self.name}")
+
+    def _check_fork(self) -> None:
+        # entries and lock state inherited from a parent process are discarded
+        if self._pid != os.getpid():
+            self._lock = threading.Lock()
+            self._entries = OrderedDict()
+            self._size = 0
+            self._pid = os.getpid()
+
+    def get(self, key: str) -> Optional[Any]:
+        memo = self._request_memo()
+        if memo is not None and key in memo:
+            return memo[key]
+        if not self.max_size:
+            return None
+
+        self._check_fork()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+        if memo is not None:
+            memo[key] = entry.value
+        return entry.value
+
+    def set(  # pylint: disable=too-many-arguments
+        self,
+        key: str,
+        value: Any,
+        size: int,
+        timeout: Optional[float] = None,
+        tag: Optional[str] = None,
+    ) -> int:
+        """
+        Set a value, expiring after the smaller of `timeout` and the configured
+        timeout of the cache.
+
+        :returns: the number of entries evicted to make room for the value
+        """
+        memo = self._request_memo()
+        if memo is not None:
+            memo[key] = value
+        max_size = self.max_size
+        if not max_size or size > max_size:
+            return 0
+
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        if timeout <= 0:
+            return 0
+
+        self._check_fork()
+        evicted = 0
+        with self._lock:
+            self._remove(key)
+            while self._entries and self._size + size > max_size:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+            self._entries[key] = LocalCacheEntry(
+                value=value, size=size, expires_at=time.time() + timeout, tag=tag,
+            )
+            self._size += size
+        return evicted
+
+    def delete(self, key: str) -> None:
+        memo = self._request_memo()
+        if memo is not None:
+            memo.pop(key, None)
+        self._check_fork()
+        with self._lock:
+            self._remove(key)
+
+    def delete_tag(self, tag: str) -> None:
+        """Delete all the entries set with the given tag"""
+        self._check_fork()
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry.tag == tag]
+            for key in keys:
+                self._remove(key)
+
+    def clear(self) -> None:
+        self._check_fork()
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+local_data_cache = LocalCache(
+    "data", "DATA_CACHE_LOCAL_MAX_SIZE", "DATA_CACHE_LOCAL_TIMEOUT"
+)
@@ -16,11 +16,16 @@
 # under the License.
 from __future__ import annotations
 
+import atexit
 import functools
 import inspect
 import json
 import logging
+import os
+import queue
 import textwrap
+import threading
+import time
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from datetime import datetime, timedelta
@@ -30,6 +35,7 @@ from typing import (
     cast,
     Dict,
     Iterator,
+    List,
     Optional,
     Type,
     TYPE_CHECKING,
@@ -38,6 +44,7 @@ from typing import (
 
 from flask import current_app, g, request
 from flask_appbuilder.const import API_URI_RIS_KEY
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from typing_extensions import Literal
 
@@ -350,3 +357,178 @@ class DBEventLogger(AbstractEventLogger):
         except SQLAlchemyError as ex:
             logging.error("DBEventLogger failed to log event(s)")
             logging.exception(ex)
+
+
+class BufferedDBEventLogger(DBEventLogger):
+    """
+    Event logger that buffers logs in process and writes them to Superset DB in
+    batches from a background thread, instead of committing them in the session of
+    the request.
+
+    Batches are written once `batch_size` logs are buffered or `flush_interval`
+    seconds after the first buffered log, with a connection of their own. When more
+    than `max_buffer_size` logs are buffered, new ones are dropped, and the number
+    of logs dropped by the process is reported in the `event_logger.dropped` gauge.
+    When the process exits, the background thread is stopped once it wrote the logs
+    it took, and the remaining logs are written.
+    """
+
+    # put in the buffer to wake up the background thread when stopping it
+    _STOP = object()
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_buffer_size: int = 10000,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.dropped = 0
+        self._engine: Optional[Engine] = None
+        self._stats_logger: Optional[BaseStatsLogger] = None
+        self._reset()
+        atexit.register(self.shutdown)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # forked processes start with an empty buffer and their own thread
+        self._buffer: "queue.Queue[Dict[str, Any]]" = queue.Queue(self.max_buffer_size)
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def log(  # pylint: disable=too-many-arguments
+        self,
+        user_id: Optional[int],
+        action: str,
+        dashboard_id: Optional[int],
+        duration_ms: Optional[int],
+        slice_id: Optional[int],
+        referrer: Optional[str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        self._start()
+        dttm = datetime.utcnow()
+        for record in kwargs.get("records", []):
+            json_string: Optional[str]
+            try:
+                json_string = json.dumps(record)
+            except Exception:  # pylint: disable=broad-except
+                json_string = None
+            try:
+                self._buffer.put_nowait(
+                    {
+                        "action": action,
+                        "json": json_string,
+                        "dashboard_id": dashboard_id,
+                        "slice_id": slice_id,
+                        "duration_ms": duration_ms,
+                        "referrer": referrer,
+                        "user_id": user_id,
+                        "dttm": dttm,
+                    }
+                )
+            except queue.Full:
+                self._drop(1)
+
+    def shutdown(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Stop the background thread, waiting at most `timeout` seconds for it to write
+        the logs it took, and write the remaining logs in the calling thread
+        """
+        thread = self._thread
+        if thread is not None:
+            self._stopped.set()
+            try:
+                self._buffer.put_nowait(self._STOP)  # type: ignore
+            except queue.Full:
+                # the thread isn't waiting for logs, it checks the event in between
+                # batches
+                pass
+            thread.join(timeout)
+        self.flush()
+
+    def flush(self) -> None:
+        """Write all the buffered logs in the calling thread"""
+        while True:
+            logs = self._take(block=False)
+            if not logs:
+                return
+            self._write(logs)
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            # the background thread has no app context, bind it to the engine and
+            # the stats logger of the app
+            self._engine = current_app.appbuilder.get_session.get_bind()
+            self._stats_logger = current_app.config["STATS_LOGGER"]
+            self._thread = threading.Thread(
+                target=self._run, name="BufferedDBEventLogger", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            logs = self._take(block=True)
+            if logs:
+                self._write(logs)
+
+    def _take(self, block: bool) -> List[Dict[str, Any]]:
+        """
+        Take a batch of logs from the buffer, waiting for the first one and then
+        for the batch to fill up for at most `flush_interval` seconds if blocking,
+        unless the background thread is being stopped
+        """
+        logs: List[Dict[str, Any]] = []
+        deadline: Optional[float] = None
+        while len(logs) < self.batch_size:
+            try:
+                if not block:
+                    log = self._buffer.get_nowait()
+                elif deadline is None:
+                    log = self._buffer.get()
+                else:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    log = self._buffer.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if log is self._STOP:
+                if block:
+                    break
+                continue
+            logs.append(log)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return logs
+
+    def _write(self, logs: List[Dict[str, Any]]) -> None:
+        # pylint: disable=import-outside-toplevel
+        from superset.models.core import Log
+
+        if self._engine is None:
+            return
+        try:
+            with self._engine.begin() as connection:
+                connection.execute(Log.__table__.insert(), logs)
+        except SQLAlchemyError as ex:
+            logging.error("BufferedDBEventLogger failed to log event(s)")
+            logging.exception(ex)
+            self._drop(len(logs))
+            return
+        if self._stats_logger:
+            self._stats_logger.gauge("event_logger.batch_size", len(logs))
+
+    def _drop(self, count: int) -> None:
+        self.dropped += count
+        if self._stats_logger:
+            self._stats_logger.gauge("event_logger.dropped", self.dropped)
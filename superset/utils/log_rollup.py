@@ -0,0 +1,364 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Incremental rollup of the `logs` table.
+
+The `log_rollup.rollup` task counts the rows added to the `logs` table since it last
+ran into the `logs_rollup` table, per hour and per day, action, user, dashboard and
+chart, and checkpoints the id of the last row it counted. Queries over the activity
+of users read the rollup, along with the raw logs past the checkpoint, instead of
+scanning the whole `logs` table.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, union_all
+from sqlalchemy.orm import Query, Session
+
+from superset import app
+from superset.models.core import Log, LogRollup, LogRollupCheckpoint
+
+config = app.config
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "logs"
+GRANULARITIES = ("hour", "day")
+
+RollupKey = Tuple[
+    str, datetime, Optional[str], Optional[int], Optional[int], Optional[int]
+]
+
+
+def truncate(dttm: datetime, granularity: str) -> datetime:
+    """Start of the hour or day of a datetime"""
+    if granularity == "hour":
+        return dttm.replace(minute=0, second=0, microsecond=0)
+    return dttm.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def get_checkpoint(session: Session) -> int:
+    """Id of the last log counted in the rollup, 0 if the rollup never ran"""
+    last_log_id = (
+        session.query(LogRollupCheckpoint.last_log_id)
+        .filter(LogRollupCheckpoint.name == CHECKPOINT_NAME)
+        .scalar()
+    )
+    return last_log_id or 0
+
+
+def _lock_checkpoint(session: Session) -> LogRollupCheckpoint:
+    """
+    Lock the checkpoint until the end of the transaction, so that concurrent runs
+    of the rollup never count the same logs twice
+    """
+    checkpoint = (
+        session.query(LogRollupCheckpoint)
+        .filter(LogRollupCheckpoint.name == CHECKPOINT_NAME)
+        .with_for_update()
+        .one_or_none()
+    )
+    if checkpoint is None:
+        checkpoint = LogRollupCheckpoint(name=CHECKPOINT_NAME, last_log_id=0)
+        session.add(checkpoint)
+        session.flush()
+    return checkpoint
+
+
+def _count_logs(logs: List[Any]) -> Dict[RollupKey, Dict[str, Any]]:
+    counters: Dict[RollupKey, Dict[str, Any]] = {}
+    for log in logs:
+        if log.dttm is None:
+            continue
+        for granularity in GRANULARITIES:
+            key = (
+                granularity,
+                truncate(log.dttm, granularity),
+                log.action,
+                log.user_id,
+                log.dashboard_id,
+                log.slice_id,
+            )
+            counter = counters.setdefault(
+                key, {"count": 0, "duration_ms": 0, "last_dttm": log.dttm}
+            )
+            counter["count"] += 1
+            counter["duration_ms"] += log.duration_ms or 0
+            counter["last_dttm"] = max(counter["last_dttm"], log.dttm)
+    return counters
+
+
+def _merge_counters(
+    session: Session, counters: Dict[RollupKey, Dict[str, Any]]
+) -> None:
+    """Add counters to the matching rows of the rollup, or insert them"""
+    periods = []
+    for granularity in GRANULARITIES:
+        period_starts = [key[1] for key in counters if key[0] == granularity]
+        if period_starts:
+            periods.append(
+                and_(
+                    LogRollup.granularity == granularity,
+                    LogRollup.period_start.between(
+                        min(period_starts), max(period_starts)
+                    ),
+                )
+            )
+    existing = session.query(
+        LogRollup.id,
+        LogRollup.granularity,
+        LogRollup.period_start,
+        LogRollup.action,
+        LogRollup.user_id,
+        LogRollup.dashboard_id,
+        LogRollup.slice_id,
+        LogRollup.count,
+        LogRollup.duration_ms,
+        LogRollup.last_dttm,
+    ).filter(or_(*periods))
+
+    updates = []
+    for row in existing:
+        key = (
+            row.granularity,
+            row.period_start,
+            row.action,
+            row.user_id,
+            row.dashboard_id,
+            row.slice_id,
+        )
+        counter = counters.pop(key, None)
+        if counter is None:
+            continue
+        updates.append(
+            {
+                "id": row.id,
+                "count": row.count + counter["count"],
+                "duration_ms": row.duration_ms + counter["duration_ms"],
+                "last_dttm": max(
+                    row.last_dttm or counter["last_dttm"], counter["last_dttm"]
+                ),
+            }
+        )
+    inserts = [
+        {
+            "granularity": granularity,
+            "period_start": period_start,
+            "action": action,
+            "user_id": user_id,
+            "dashboard_id": dashboard_id,
+            "slice_id": slice_id,
+            **counter,
+        }
+        for (
+            granularity,
+            period_start,
+            action,
+            user_id,
+            dashboard_id,
+            slice_id,
+        ), counter in counters.items()
+    ]
+    session.bulk_update_mappings(LogRollup, updates)
+    session.bulk_insert_mappings(LogRollup, inserts)
+
+
+def rollup_logs(session: Session) -> int:
+    """
+    Count the logs past the checkpoint into the rollup, `LOG_ROLLUP_BATCH_SIZE` logs
+    per transaction, and return the number of logs counted.
+
+    Logs written in the last `LOG_ROLLUP_LAG` seconds are left for the next run, as
+    logs written concurrently may be committed out of the order of their ids.
+    """
+    batch_size = config["LOG_ROLLUP_BATCH_SIZE"]
+    until = datetime.utcnow() - timedelta(seconds=config["LOG_ROLLUP_LAG"])
+    total = 0
+    while True:
+        checkpoint = _lock_checkpoint(session)
+        logs = (
+            session.query(
+                Log.id,
+                Log.dttm,
+                Log.action,
+                Log.user_id,
+                Log.dashboard_id,
+                Log.slice_id,
+                Log.duration_ms,
+            )
+            .filter(Log.id > checkpoint.last_log_id)
+            .order_by(Log.id)
+            .limit(batch_size)
+            .all()
+        )
+        is_last_batch = len(logs) < batch_size
+        for i, log in enumerate(logs):
+            if log.dttm is not None and log.dttm >= until:
+                logs = logs[:i]
+                is_last_batch = True
+                break
+        if not logs:
+            session.commit()
+            break
+
+        _merge_counters(session, _count_logs(logs))
+        checkpoint.last_log_id = logs[-1].id
+        session.commit()
+        total += len(logs)
+        logger.info("Counted logs up to id %i in the rollup", checkpoint.last_log_id)
+        if is_last_batch:
+            break
+    return total
+
+
+def prune_logs(session: Session) -> int:
+    """
+    Delete the raw logs older than `LOG_RETENTION_DAYS` days that were counted in the
+    rollup, `LOG_ROLLUP_BATCH_SIZE` logs per transaction, and return the number of
+    logs deleted.
+    """
+    if config["LOG_RETENTION_DAYS"] is None:
+        return 0
+    batch_size = config["LOG_ROLLUP_BATCH_SIZE"]
+    cutoff = datetime.utcnow() - timedelta(days=config["LOG_RETENTION_DAYS"])
+    checkpoint = get_checkpoint(session)
+    total = 0
+    while True:
+        # logs are scanned in the order of their ids, which is roughly the order of
+        # their times, up to the first recent one, rather than filtered on their time,
+        # which would scan the whole table once all old logs are deleted
+        logs = (
+            session.query(Log.id, Log.dttm)
+            .filter(Log.id <= checkpoint)
+            .order_by(Log.id)
+            .limit(batch_size)
+            .all()
+        )
+        log_ids = []
+        for log in logs:
+            if log.dttm is not None and log.dttm >= cutoff:
+                break
+            log_ids.append(log.id)
+        if log_ids:
+            session.query(Log).filter(Log.id.in_(log_ids)).delete(
+                synchronize_session=False
+            )
+            session.commit()
+            total += len(log_ids)
+        if len(log_ids) < batch_size:
+            break
+    return total
+
+
+def prune_rollup(session: Session) -> int:
+    """
+    Delete the hourly counters older than `LOG_ROLLUP_HOURLY_RETENTION_DAYS` days and
+    return the number of counters deleted. Daily counters are kept.
+    """
+    cutoff = datetime.utcnow() - timedelta(
+        days=config["LOG_ROLLUP_HOURLY_RETENTION_DAYS"]
+    )
+    row_count = (
+        session.query(LogRollup)
+        .filter(LogRollup.granularity == "hour", LogRollup.period_start < cutoff)
+        .delete(synchronize_session=False)
+    )
+    session.commit()
+    return row_count
+
+
+def get_top_dashboard_ids(
+    session: Session, since: Optional[datetime], limit: int
+) -> List[int]:
+    """
+    Ids of the dashboards with the most logged actions since a given time, counted
+    to the hour when hourly counters are still kept for that time, to the day
+    otherwise.
+    """
+    hourly_since = datetime.utcnow() - timedelta(
+        days=config["LOG_ROLLUP_HOURLY_RETENTION_DAYS"]
+    )
+    granularity = "hour" if since and since >= hourly_since else "day"
+    rollup_filters = [
+        LogRollup.granularity == granularity,
+        LogRollup.dashboard_id.isnot(None),
+    ]
+    log_filters = [Log.id > get_checkpoint(session), Log.dashboard_id.isnot(None)]
+    if since:
+        rollup_filters.append(LogRollup.period_start >= truncate(since, granularity))
+        log_filters.append(Log.dttm >= since)
+
+    activity = union_all(
+        select([LogRollup.dashboard_id.label("dashboard_id"), LogRollup.count]).where(
+            and_(*rollup_filters)
+        ),
+        select([Log.dashboard_id.label("dashboard_id"), func.count().label("count")])
+        .where(and_(*log_filters))
+        .group_by(Log.dashboard_id),
+    ).alias("activity")
+    records = (
+        session.query(activity.c.dashboard_id)
+        .group_by(activity.c.dashboard_id)
+        .order_by(func.sum(activity.c.count).desc())
+        .limit(limit)
+        .all()
+    )
+    return [record.dashboard_id for record in records]
+
+
+def get_recent_activity(
+    session: Session, user_id: int, actions: List[str], since: datetime
+) -> Query:
+    """
+    Last time since a given time each dashboard or chart was subject to each of the
+    given actions of a user, as a query of `dashboard_id`, `slice_id`, `action` and
+    `dttm` columns.
+    """
+    has_subject = [LogRollup.dashboard_id.isnot(None), LogRollup.slice_id.isnot(None)]
+    rollup = select(
+        [
+            LogRollup.dashboard_id,
+            LogRollup.slice_id,
+            LogRollup.action,
+            LogRollup.last_dttm.label("dttm"),
+        ]
+    ).where(
+        and_(
+            LogRollup.granularity == "day",
+            LogRollup.user_id == user_id,
+            LogRollup.action.in_(actions),
+            LogRollup.period_start >= truncate(since, "day"),
+            LogRollup.last_dttm > since,
+            or_(*has_subject),
+        )
+    )
+    logs = select([Log.dashboard_id, Log.slice_id, Log.action, Log.dttm]).where(
+        and_(
+            Log.id > get_checkpoint(session),
+            Log.user_id == user_id,
+            Log.action.in_(actions),
+            Log.dttm > since,
+            or_(Log.dashboard_id.isnot(None), Log.slice_id.isnot(None)),
+        )
+    )
+    activity = union_all(rollup, logs).alias("activity")
+    return session.query(
+        activity.c.dashboard_id,
+        activity.c.slice_id,
+        activity.c.action,
+        func.max(activity.c.dttm).label("dttm"),
+    ).group_by(activity.c.dashboard_id, activity.c.slice_id, activity.c.action)
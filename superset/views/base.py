@@ -19,7 +19,17 @@ import functools
 import logging
 import traceback
 from datetime import datetime
-from typing import Any, Callable, cast, Dict, List, Optional, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Union,
+)
 
 import simplejson as json
 import yaml
@@ -33,6 +43,7 @@ from flask import (
     Response,
     send_file,
     session,
+    stream_with_context,
 )
 from flask_appbuilder import BaseView, Model, ModelView
 from flask_appbuilder.actions import action
@@ -76,6 +87,7 @@ from superset.models.reports import ReportRecipientType
 from superset.translations.utils import get_language_pack
 from superset.typing import FlaskResponse
 from superset.utils import core as utils
+from superset.utils.export import EXPORT_MIMETYPES, iter_gzip
 
 from .utils import bootstrap_user_data
 
@@ -639,6 +651,28 @@ class CsvResponse(Response):  # pylint: disable=too-many-ancestors
     default_mimetype = "text/csv"
 
 
+def stream_export_response(
+    chunks: Iterator[bytes], export_format: str, filename: Optional[str] = None
+) -> Response:
+    """
+    Stream the chunks of an export as a file download, gzipped on the fly when
+    `DATA_EXPORT_GZIP` is set and the client accepts it.
+    """
+    headers = generate_download_headers(export_format, filename)
+    if conf["DATA_EXPORT_GZIP"] and "gzip" in request.accept_encodings:
+        chunks = iter_gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+    content_type = EXPORT_MIMETYPES[export_format]
+    if export_format == "csv":
+        content_type += f"; charset={CsvResponse.charset}"
+    return Response(
+        stream_with_context(chunks),
+        headers=headers,
+        content_type=content_type,
+        direct_passthrough=True,
+    )
+
+
 def check_ownership(obj: Any, raise_if_false: bool = True) -> bool:
     """Meant to be used in `pre_update` hooks on models to enforce ownership
 
@@ -21,7 +21,7 @@ import logging
 import re
 from contextlib import closing
 from datetime import datetime, timedelta
-from typing import Any, Callable, cast, Dict, List, Optional, Union
+from typing import Any, Callable, cast, Dict, Iterator, List, Optional, Union
 from urllib import parse
 
 import backoff
@@ -101,6 +101,7 @@ from superset.security.analytics_db_safety import check_sqlalchemy_uri
 from superset.sql_lab import get_sql_results
 from superset.sql_parse import ParsedQuery, Table
 from superset.sql_validators import get_validator_by_name
+from superset.sqllab.arrow_results import is_arrow_results, iter_arrow_results
 from superset.sqllab.command import CommandResult, ExecuteSqlCommand
 from superset.sqllab.command_status import SqlJsonExecutionStatus
 from superset.sqllab.exceptions import (
@@ -120,12 +121,14 @@ from superset.sqllab.utils import apply_display_max_row_configuration_if_require
 from superset.sqllab.validators import CanAccessQueryValidatorImpl
 from superset.tasks.async_queries import load_explore_json_into_cache
 from superset.typing import FlaskResponse
-from superset.utils import core as utils, csv
+from superset.utils import core as utils
 from superset.utils.async_query_manager import AsyncQueryTokenException
 from superset.utils.cache import etag_cache
 from superset.utils.core import apply_max_row_limit, ReservedUrlParameters
 from superset.utils.dates import now_as_float
+from superset.utils.export import EXPORT_FORMATS, iter_df_chunks, iter_export
 from superset.utils.decorators import check_dashboard_access
+from superset.utils.log_rollup import get_recent_activity
 from superset.views.base import (
     api,
     BaseSupersetView,
@@ -140,9 +143,11 @@ from superset.views.base import (
     json_error_response,
     json_errors_response,
     json_success,
+    stream_export_response,
     validate_sqlatable,
 )
 from superset.views.utils import (
+    _deserialize_arrow_results,
     _deserialize_results_payload,
     bootstrap_user_data,
     check_datasource_perms,
@@ -1355,7 +1360,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             username = (
                 g.user.username if g.user and hasattr(g.user, "username") else None
             )
-            engine = database.get_sqla_engine(user_name=username)
+            engine = database.get_sqla_engine(nullpool=True, user_name=username)
 
             with closing(engine.raw_connection()) as conn:
                 if engine.dialect.do_ping(conn):
@@ -1432,25 +1437,9 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
 
         if distinct:
             one_year_ago = datetime.today() - timedelta(days=365)
-            subqry = (
-                db.session.query(
-                    Log.dashboard_id,
-                    Log.slice_id,
-                    Log.action,
-                    func.max(Log.dttm).label("dttm"),
-                )
-                .group_by(Log.dashboard_id, Log.slice_id, Log.action)
-                .filter(
-                    and_(
-                        Log.action.in_(actions),
-                        Log.user_id == user_id,
-                        # limit to one year of data to improve performance
-                        Log.dttm > one_year_ago,
-                        or_(Log.dashboard_id.isnot(None), Log.slice_id.isnot(None)),
-                    )
-                )
-                .subquery()
-            )
+            subqry = get_recent_activity(
+                db.session, user_id, actions, since=one_year_ago
+            ).subquery()
             qry = (
                 db.session.query(
                     subqry,
@@ -2321,25 +2310,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 status=403,
             ) from ex
 
-        payload = utils.zlib_decompress(blob, decode=not results_backend_use_msgpack)
-        try:
-            obj = _deserialize_results_payload(
-                payload, query, cast(bool, results_backend_use_msgpack)
-            )
-        except SerializationError as ex:
-            raise SupersetErrorException(
-                SupersetError(
-                    message=__(
-                        "Data could not be deserialized from the results backend. The "
-                        "storage format might have changed, rendering the old data "
-                        "stake. You need to re-run the original query."
-                    ),
-                    error_type=SupersetErrorType.RESULTS_BACKEND_ERROR,
-                    level=ErrorLevel.ERROR,
-                ),
-                status=404,
-            ) from ex
-
+        rows: Optional[int] = None
         if "rows" in request.args:
             try:
                 rows = int(request.args["rows"])
@@ -2355,6 +2326,32 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                     status=400,
                 ) from ex
 
+        try:
+            if is_arrow_results(blob):
+                # only the displayed rows are read
+                obj = _deserialize_arrow_results(key, blob, query, row_limit=rows)
+            else:
+                payload = utils.zlib_decompress(
+                    blob, decode=not results_backend_use_msgpack
+                )
+                obj = _deserialize_results_payload(
+                    payload, query, cast(bool, results_backend_use_msgpack)
+                )
+        except SerializationError as ex:
+            raise SupersetErrorException(
+                SupersetError(
+                    message=__(
+                        "Data could not be deserialized from the results backend. The "
+                        "storage format might have changed, rendering the old data "
+                        "stake. You need to re-run the original query."
+                    ),
+                    error_type=SupersetErrorType.RESULTS_BACKEND_ERROR,
+                    level=ErrorLevel.ERROR,
+                ),
+                status=404,
+            ) from ex
+
+        if rows is not None:
             obj = apply_display_max_row_configuration_if_require(obj, rows)
 
         return json_success(
@@ -2546,8 +2543,17 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
     def csv(  # pylint: disable=no-self-use,too-many-locals
         self, client_id: str
     ) -> FlaskResponse:
-        """Download the query results as csv."""
-        logger.info("Exporting CSV file [%s]", client_id)
+        """
+        Download the query results as csv, or as Parquet or Arrow IPC stream with the
+        `format` argument. The results are streamed chunk after chunk.
+        """
+        export_format = request.args.get("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return json_error_response(
+                __("Unsupported export format: %(format)s", format=export_format),
+                status=400,
+            )
+        logger.info("Exporting %s file [%s]", export_format, client_id)
         query = db.session.query(Query).filter_by(client_id=client_id).one()
 
         try:
@@ -2558,21 +2564,33 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
 
         blob = None
         if results_backend and query.results_key:
-            logger.info("Fetching CSV from results backend [%s]", query.results_key)
+            logger.info("Fetching results from results backend [%s]", query.results_key)
             blob = results_backend.get(query.results_key)
-        if blob:
-            logger.info("Decompressing")
-            payload = utils.zlib_decompress(
-                blob, decode=not results_backend_use_msgpack
-            )
-            obj = _deserialize_results_payload(
-                payload, query, cast(bool, results_backend_use_msgpack)
-            )
+        dfs: Iterator[pd.DataFrame]
+        if (
+            blob
+            and is_arrow_results(blob)
+            and not is_feature_enabled("PRESTO_EXPAND_DATA")
+        ):
+            logger.info("Streaming the pages of the results")
+            dfs = iter_arrow_results(results_backend, query.results_key, blob)
+        elif blob:
+            if is_arrow_results(blob):
+                obj = _deserialize_arrow_results(query.results_key, blob, query)
+            else:
+                logger.info("Decompressing")
+                payload = utils.zlib_decompress(
+                    blob, decode=not results_backend_use_msgpack
+                )
+                obj = _deserialize_results_payload(
+                    payload, query, cast(bool, results_backend_use_msgpack)
+                )
             columns = [c["name"] for c in obj["columns"]]
-            df = pd.DataFrame.from_records(obj["data"], columns=columns)
-            logger.info("Using pandas to convert to CSV")
+            dfs = iter_df_chunks(
+                pd.DataFrame.from_records(obj["data"], columns=columns)
+            )
         else:
-            logger.info("Running a query to turn into CSV")
+            logger.info("Running a query to export")
             if query.select_sql:
                 sql = query.select_sql
                 limit = None
@@ -2586,27 +2604,41 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             }:
                 # remove extra row from `increased_limit`
                 limit -= 1
-            df = query.database.get_df(sql, query.schema)[:limit]
-
-        csv_data = csv.df_to_escaped_csv(df, index=False, **config["CSV_EXPORT"])
-        quoted_csv_name = parse.quote(query.name)
-        response = CsvResponse(
-            csv_data, headers=generate_download_headers("csv", quoted_csv_name)
-        )
-        event_info = {
-            "event_type": "data_export",
-            "client_id": client_id,
-            "row_count": len(df.index),
-            "database": query.database.name,
-            "schema": query.schema,
-            "sql": query.sql,
-            "exported_format": "csv",
-        }
-        event_rep = repr(event_info)
-        logger.debug(
-            "CSV exported: %s", event_rep, extra={"superset_event": event_info}
+            # the SQL Lab queries only share connections when they are allowed to
+            dfs = query.database.iter_df(
+                sql,
+                query.schema,
+                limit=limit,
+                nullpool=not config["SQLLAB_POOL_CONNECTIONS"],
+            )
+
+        def log_export(dfs: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+            row_count = 0
+            for df in dfs:
+                row_count += len(df.index)
+                yield df
+            event_info = {
+                "event_type": "data_export",
+                "client_id": client_id,
+                "row_count": row_count,
+                "database": query.database.name,
+                "schema": query.schema,
+                "sql": query.sql,
+                "exported_format": export_format,
+            }
+            event_rep = repr(event_info)
+            logger.debug(
+                "%s exported: %s",
+                export_format.upper(),
+                event_rep,
+                extra={"superset_event": event_info},
+            )
+
+        return stream_export_response(
+            iter_export(log_export(dfs), export_format),
+            export_format,
+            parse.quote(query.name),
         )
-        return response
 
     @api
     @handle_api_exception
@@ -18,9 +18,11 @@ import io
 import os
 import tempfile
 import zipfile
-from typing import TYPE_CHECKING
+from typing import Any, Iterator, List, Optional, TYPE_CHECKING
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from flask import flash, g, redirect
 from flask_appbuilder import expose, SimpleFormView
 from flask_appbuilder.models.sqla.interface import SQLAInterface
@@ -39,6 +41,7 @@ from superset.extensions import event_logger
 from superset.sql_parse import Table
 from superset.typing import FlaskResponse
 from superset.utils import core as utils
+from superset.utils.export import iter_df_chunks
 from superset.views.base import DeleteMixin, SupersetModelView, YamlExportMixin
 
 from .forms import ColumnarToDatabaseForm, CsvToDatabaseForm, ExcelToDatabaseForm
@@ -81,6 +84,21 @@ def upload_stream_write(form_file_field: "FileStorage", path: str) -> None:
             file_description.write(chunk)
 
 
+def iter_parquet_files(
+    files: List[Any], columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read Parquet files in chunks of `DATA_UPLOAD_CHUNK_SIZE` rows, restoring their
+    pandas index if any
+    """
+    for file in files:
+        parquet_file = pq.ParquetFile(file)
+        for batch in parquet_file.iter_batches(
+            batch_size=config["DATA_UPLOAD_CHUNK_SIZE"], columns=columns
+        ):
+            yield pa.Table.from_batches([batch]).to_pandas()
+
+
 class DatabaseView(
     DatabaseMixin, SupersetModelView, DeleteMixin, YamlExportMixin
 ):  # pylint: disable=too-many-ancestors
@@ -143,26 +161,24 @@ class CsvToDatabaseView(SimpleFormView):
             return redirect("/csvtodatabaseview/form")
 
         try:
-            df = pd.concat(
-                pd.read_csv(
-                    chunksize=1000,
-                    encoding="utf-8",
-                    filepath_or_buffer=form.csv_file.data,
-                    header=form.header.data if form.header.data else 0,
-                    index_col=form.index_col.data,
-                    infer_datetime_format=form.infer_datetime_format.data,
-                    iterator=True,
-                    keep_default_na=not form.null_values.data,
-                    mangle_dupe_cols=form.mangle_dupe_cols.data,
-                    usecols=form.usecols.data if form.usecols.data else None,
-                    na_values=form.null_values.data if form.null_values.data else None,
-                    nrows=form.nrows.data,
-                    parse_dates=form.parse_dates.data,
-                    sep=form.sep.data,
-                    skip_blank_lines=form.skip_blank_lines.data,
-                    skipinitialspace=form.skipinitialspace.data,
-                    skiprows=form.skiprows.data,
-                )
+            dfs = pd.read_csv(
+                chunksize=config["DATA_UPLOAD_CHUNK_SIZE"],
+                encoding="utf-8",
+                filepath_or_buffer=form.csv_file.data,
+                header=form.header.data if form.header.data else 0,
+                index_col=form.index_col.data,
+                infer_datetime_format=form.infer_datetime_format.data,
+                iterator=True,
+                keep_default_na=not form.null_values.data,
+                mangle_dupe_cols=form.mangle_dupe_cols.data,
+                usecols=form.usecols.data if form.usecols.data else None,
+                na_values=form.null_values.data if form.null_values.data else None,
+                nrows=form.nrows.data,
+                parse_dates=form.parse_dates.data,
+                sep=form.sep.data,
+                skip_blank_lines=form.skip_blank_lines.data,
+                skipinitialspace=form.skipinitialspace.data,
+                skiprows=form.skiprows.data,
             )
 
             database = (
@@ -171,12 +187,11 @@ class CsvToDatabaseView(SimpleFormView):
                 .one()
             )
 
-            database.db_engine_spec.df_to_sql(
+            row_count = database.db_engine_spec.dfs_to_sql(
                 database,
                 csv_table,
-                df,
+                dfs,
                 to_sql_kwargs={
-                    "chunksize": 1000,
                     "if_exists": form.if_exists.data,
                     "index": form.index.data,
                     "index_label": form.index_label.data,
@@ -247,6 +262,7 @@ class CsvToDatabaseView(SimpleFormView):
             database=form.con.data.name,
             schema=form.schema.data,
             table=form.name.data,
+            row_count=row_count,
         )
         return redirect("/tablemodelview/list/")
 
@@ -306,12 +322,11 @@ class ExcelToDatabaseView(SimpleFormView):
                 .one()
             )
 
-            database.db_engine_spec.df_to_sql(
+            row_count = database.db_engine_spec.dfs_to_sql(
                 database,
                 excel_table,
-                df,
+                iter_df_chunks(df, config["DATA_UPLOAD_CHUNK_SIZE"]),
                 to_sql_kwargs={
-                    "chunksize": 1000,
                     "if_exists": form.if_exists.data,
                     "index": form.index.data,
                     "index_label": form.index_label.data,
@@ -382,6 +397,7 @@ class ExcelToDatabaseView(SimpleFormView):
             database=form.con.data.name,
             schema=form.schema.data,
             table=form.name.data,
+            row_count=row_count,
         )
         return redirect("/tablemodelview/list/")
 
@@ -421,11 +437,6 @@ class ColumnarToDatabaseView(SimpleFormView):
             flash(message, "danger")
             return redirect("/columnartodatabaseview/form")
 
-        read = pd.read_parquet
-        kwargs = {
-            "columns": form.usecols.data if form.usecols.data else None,
-        }
-
         if not schema_allows_file_upload(database, columnar_table.schema):
             message = _(
                 'Database "%(database_name)s" schema "%(schema_name)s" '
@@ -438,21 +449,17 @@ class ColumnarToDatabaseView(SimpleFormView):
             return redirect("/columnartodatabaseview/form")
 
         try:
-            chunks = [read(file, **kwargs) for file in files]
-            df = pd.concat(chunks)
-
             database = (
                 db.session.query(models.Database)
                 .filter_by(id=form.data.get("con").data.get("id"))
                 .one()
             )
 
-            database.db_engine_spec.df_to_sql(
+            row_count = database.db_engine_spec.dfs_to_sql(
                 database,
                 columnar_table,
-                df,
+                iter_parquet_files(files, columns=form.usecols.data or None),
                 to_sql_kwargs={
-                    "chunksize": 1000,
                     "if_exists": form.if_exists.data,
                     "index": form.index.data,
                     "index_label": form.index_label.data,
@@ -523,5 +530,6 @@ class ColumnarToDatabaseView(SimpleFormView):
             database=form.con.data.name,
             schema=form.schema.data,
             table=form.name.data,
+            row_count=row_count,
         )
         return redirect("/tablemodelview/list/")
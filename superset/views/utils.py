@@ -30,7 +30,7 @@ from flask_babel import _
 from sqlalchemy.orm.exc import NoResultFound
 
 import superset.models.core as models
-from superset import app, dataframe, db, result_set, viz
+from superset import app, dataframe, db, result_set, results_backend, viz
 from superset.common.db_query_status import QueryStatus
 from superset.connectors.connector_registry import ConnectorRegistry
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
@@ -46,6 +46,7 @@ from superset.models.core import Database
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.models.sql_lab import Query
+from superset.sqllab.arrow_results import read_arrow_results
 from superset.typing import FormData
 from superset.utils.decorators import stats_timing
 from superset.viz import BaseViz
@@ -575,6 +576,31 @@ def _deserialize_results_payload(
         return json.loads(payload)
 
 
+def _deserialize_arrow_results(
+    key: str, value: Dict[str, Any], query: Query, row_limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Load the payload of query results stored as Arrow record batches, with only
+    their first `row_limit` rows if specified
+    """
+    with stats_timing("sqllab.query.results_backend_arrow_deserialize", stats_logger):
+        df = read_arrow_results(results_backend, key, value, row_limit=row_limit)
+
+    payload = {
+        name: item
+        for name, item in value.items()
+        if name not in ("format", "schema", "page_rows")
+    }
+    db_engine_spec = query.database.db_engine_spec
+    all_columns, data, expanded_columns = db_engine_spec.expand_data(
+        payload["selected_columns"], dataframe.df_to_records(df) or []
+    )
+    payload.update(
+        {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
+    )
+    return payload
+
+
 def get_cta_schema_name(
     database: Database, user: ab_models.User, schema: str, sql: str
 ) -> Optional[str]:
@@ -57,6 +57,7 @@ from pandas.tseries.frequencies import to_offset
 
 from superset import app, is_feature_enabled
 from superset.common.db_query_status import QueryStatus
+from superset.common.utils.cache_codec import decode_df, encode_df
 from superset.constants import NULL_STRING
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import (
@@ -529,7 +530,7 @@ class BaseViz:  # pylint: disable=too-many-public-methods
             if cache_value:
                 stats_logger.incr("loading_from_cache")
                 try:
-                    df = cache_value["df"]
+                    df = decode_df(cache_value["df"])
                     self.query = cache_value["query"]
                     self.applied_template_filters = cache_value.get(
                         "applied_template_filters", []
@@ -606,7 +607,7 @@ class BaseViz:  # pylint: disable=too-many-public-methods
                 set_and_log_cache(
                     cache_manager.data_cache,
                     cache_key,
-                    {"df": df, "query": self.query},
+                    {"df": encode_df(df), "query": self.query},
                     self.cache_timeout,
                     self.datasource.uid,
                 )
@@ -0,0 +1,64 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel,protected-access
+from pytest_mock import MockFixture
+
+
+def test_get_raw_query_result_cache_key(mocker: MockFixture) -> None:
+    """
+    Test that the raw result of a query object with post-processing is cached under
+    a key of its own, and not under the key of the same query object without
+    post-processing, whose cached payload also holds its annotation data.
+    """
+    from superset.common.db_query_status import QueryStatus
+    from superset.common.query_context_processor import QueryContextProcessor
+    from superset.common.query_object import QueryObject
+    from superset.common.utils.query_cache_manager import QueryCacheManager
+
+    processor = QueryContextProcessor(mocker.MagicMock())
+    processor._qc_datasource.get_extra_cache_keys.return_value = []
+    mocker.patch.object(
+        processor,
+        "get_datasource_fingerprint",
+        return_value={"datasource": "1__table"},
+    )
+    mocker.patch.object(processor, "get_cache_timeout", return_value=60)
+    mocker.patch.object(
+        processor,
+        "run_query_object",
+        return_value=mocker.MagicMock(status=QueryStatus.SUCCESS),
+    )
+    get = mocker.patch.object(QueryCacheManager, "get")
+    get.return_value.is_loaded = False
+    set_ = mocker.patch.object(QueryCacheManager, "set")
+
+    processor.get_raw_query_result(
+        QueryObject(
+            columns=["gender"],
+            metrics=["count"],
+            row_limit=10,
+            post_processing=[
+                {"operation": "sort", "options": {"columns": {"gender": True}}}
+            ],
+        )
+    )
+
+    query_object = QueryObject(columns=["gender"], metrics=["count"], row_limit=10)
+    raw_cache_key = set_.call_args[1]["key"]
+    assert get.call_args[0][0] == raw_cache_key
+    assert raw_cache_key == processor.query_cache_key(query_object, raw=True)
+    assert raw_cache_key != processor.query_cache_key(query_object)
@@ -0,0 +1,39 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel,protected-access
+from pytest_mock import MockFixture
+
+
+def test_get_cache_values_counts_round_trips_saved(mocker: MockFixture) -> None:
+    """
+    Test that the values of many keys are looked up with a single call to the cache
+    backend, recorded with a single stats call.
+    """
+    from superset.common.utils import query_cache_manager
+    from superset.common.utils.query_cache_manager import QueryCacheManager
+    from superset.constants import CacheRegion
+
+    cache = mocker.MagicMock()
+    cache.get_many.return_value = [{"value": "a"}, None, {"value": "c"}]
+    mocker.patch.dict(query_cache_manager._cache, {CacheRegion.DEFAULT: cache})
+    stats_logger = mocker.patch.object(query_cache_manager, "stats_logger")
+
+    cache_values = QueryCacheManager.get_cache_values(["a", "b", None, "a", "c"])
+
+    assert cache_values == {"a": {"value": "a"}, "b": None, "c": {"value": "c"}}
+    cache.get_many.assert_called_once_with("a", "b", "c")
+    stats_logger.counter.assert_called_once_with("cache.round_trips_saved", count=2)
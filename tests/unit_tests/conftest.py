@@ -0,0 +1,64 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=redefined-outer-name
+import os
+from typing import Iterator
+
+import pytest
+from _pytest.fixtures import SubRequest
+
+from superset.app import SupersetApp
+from superset.extensions import appbuilder
+from superset.initialization import SupersetAppInitializer
+
+
+@pytest.fixture
+def app(request: SubRequest) -> Iterator[SupersetApp]:
+    """
+    A Superset app backed by an in-memory SQLite metadata database, with the config
+    overrides passed as the parameter of the fixture, if any.
+    """
+    app = SupersetApp(__name__)
+
+    app.config.from_object("superset.config")
+    app.config["SQLALCHEMY_DATABASE_URI"] = (
+        os.environ.get("SUPERSET__SQLALCHEMY_DATABASE_URI") or "sqlite://"
+    )
+    app.config["WTF_CSRF_ENABLED"] = False
+    app.config["PREVENT_UNSAFE_DB_CONNECTIONS"] = False
+    app.config["TESTING"] = True
+
+    for key, value in getattr(request, "param", {}).items():
+        app.config[key] = value
+
+    # ``superset.extensions.appbuilder`` is a singleton, and won't rebuild the
+    # SQLAlchemy session unless its app is reset
+    appbuilder.app = None
+
+    app_initializer = SupersetAppInitializer(app)
+    app_initializer.init_app()
+
+    yield app
+
+
+@pytest.fixture(autouse=True)
+def app_context(app: SupersetApp) -> Iterator[None]:
+    """
+    A fixture that yields an application context for each test.
+    """
+    with app.app_context():
+        yield
@@ -0,0 +1,53 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from pytest_mock import MockFixture
+
+
+def test_get_df_pools_single_statements(mocker: MockFixture) -> None:
+    """
+    Test that the statements that may change the state of the session don't run on
+    pooled connections.
+    """
+    from superset.models.core import Database
+
+    database = Database(database_name="my_database", sqlalchemy_uri="sqlite://")
+    get_sqla_engine = mocker.spy(database, "get_sqla_engine")
+
+    df = database.get_df("SELECT 1 AS a")
+    assert df["a"].tolist() == [1]
+    assert get_sqla_engine.call_args[1]["nullpool"] is False
+
+    df = database.get_df("CREATE TEMP TABLE t AS SELECT 2 AS a;\nSELECT a FROM t")
+    assert df["a"].tolist() == [2]
+    assert get_sqla_engine.call_args[1]["nullpool"] is True
+
+    database.get_df("SELECT 1 AS a", nullpool=True)
+    assert get_sqla_engine.call_args[1]["nullpool"] is True
+
+
+def test_iter_df_pools_single_statements(mocker: MockFixture) -> None:
+    from superset.models.core import Database
+
+    database = Database(database_name="my_database", sqlalchemy_uri="sqlite://")
+    get_sqla_engine = mocker.spy(database, "get_sqla_engine")
+
+    dfs = list(database.iter_df("SELECT 1 AS a UNION ALL SELECT 2", batch_size=1))
+    assert [df["a"].tolist() for df in dfs] == [[1], [2]]
+    assert get_sqla_engine.call_args[1]["nullpool"] is False
+
+    list(database.iter_df("SELECT 1 AS a", nullpool=True))
+    assert get_sqla_engine.call_args[1]["nullpool"] is True
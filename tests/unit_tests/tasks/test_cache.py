@@ -0,0 +1,75 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel
+
+
+def test_apply_extra_filters() -> None:
+    """
+    Test that the legacy extra filters targeting time options set the fields of the
+    query object, as on dashboards, and only the filters on columns are appended.
+    """
+    from superset.tasks.cache import apply_extra_filters
+
+    query = {
+        "filters": [{"col": "gender", "op": "==", "val": "boy"}],
+        "extras": {"having": ""},
+    }
+    apply_extra_filters(
+        query,
+        [
+            {"col": "__time_range", "op": "==", "val": "Last week"},
+            {"col": "__time_col", "op": "==", "val": "ds"},
+            {"col": "__time_grain", "op": "==", "val": "P1D"},
+            {"col": "name", "op": "in", "val": ["Aaron", "Amy"]},
+            {"col": "state", "op": "in", "val": []},
+        ],
+    )
+
+    assert query == {
+        "filters": [
+            {"col": "gender", "op": "==", "val": "boy"},
+            {"col": "name", "op": "IN", "val": ["Aaron", "Amy"]},
+        ],
+        "extras": {"having": "", "time_grain_sqla": "P1D"},
+        "time_range": "Last week",
+        "granularity": "ds",
+        "applied_time_extras": {
+            "__time_range": "Last week",
+            "__time_col": "ds",
+            "__time_grain": "P1D",
+        },
+    }
+
+
+def test_apply_extra_filters_no_time_range() -> None:
+    from superset.tasks.cache import apply_extra_filters
+
+    query = {"time_range": "Last day", "extras": None}
+    apply_extra_filters(
+        query,
+        [
+            {"col": "__time_range", "op": "==", "val": "No filter"},
+            {"col": "__time_origin", "op": "==", "val": "now"},
+        ],
+    )
+
+    assert query == {
+        "time_range": "Last day",
+        "extras": {"druid_time_origin": "now"},
+        "filters": [],
+        "applied_time_extras": {"__time_origin": "now"},
+    }
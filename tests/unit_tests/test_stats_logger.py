@@ -0,0 +1,116 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel,redefined-outer-name
+from typing import Any, List, Tuple
+
+import pytest
+
+from superset.stats_logger import BaseStatsLogger
+
+
+class RecordingStatsLogger(BaseStatsLogger):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: List[Tuple[str, str, float]] = []
+
+    def incr(self, key: str) -> None:
+        self.calls.append(("incr", key, 1))
+
+    def decr(self, key: str) -> None:
+        self.calls.append(("decr", key, 1))
+
+    def timing(self, key: str, value: float) -> None:
+        self.calls.append(("timing", key, value))
+
+    def gauge(self, key: str, value: float) -> None:
+        self.calls.append(("gauge", key, value))
+
+
+def test_base_fallbacks() -> None:
+    stats_logger = RecordingStatsLogger()
+
+    stats_logger.counter("hits", {"cache": "hit"}, count=2)
+    stats_logger.histogram("rows", 10, {"database": "1"})
+    stats_logger.duration("execute", 250, {"database": "1"})
+
+    assert stats_logger.calls == [
+        ("incr", "hits", 1),
+        ("incr", "hits", 1),
+        ("gauge", "rows", 10),
+        ("timing", "execute", 250),
+    ]
+
+
+@pytest.fixture
+def registry() -> Any:
+    prometheus_client = pytest.importorskip("prometheus_client")
+    return prometheus_client.CollectorRegistry()
+
+
+def test_prometheus_durations_in_seconds(registry: Any) -> None:
+    from superset.stats_logger import PrometheusStatsLogger
+
+    stats_logger = PrometheusStatsLogger(registry=registry)
+
+    stats_logger.duration("execute", 250, {"database": "1"})
+    stats_logger.timing("fetch", 1500)
+    with stats_logger.timer("compile", {"database": "1"}):
+        pass
+
+    assert (
+        registry.get_sample_value("superset_execute_seconds_sum", {"database": "1"})
+        == 0.25
+    )
+    assert registry.get_sample_value("superset_fetch_seconds_sum") == 1.5
+    assert (
+        registry.get_sample_value("superset_compile_seconds_count", {"database": "1"})
+        == 1
+    )
+
+
+def test_prometheus_histograms_are_unitless(registry: Any) -> None:
+    from superset.stats_logger import PrometheusStatsLogger
+
+    stats_logger = PrometheusStatsLogger(registry=registry)
+
+    stats_logger.histogram("rows", 1000, {"database": "1"})
+
+    assert registry.get_sample_value("superset_rows_sum", {"database": "1"}) == 1000
+    assert registry.get_sample_value("superset_rows_seconds_sum") is None
+
+
+def test_prometheus_counter(registry: Any) -> None:
+    from superset.stats_logger import PrometheusStatsLogger
+
+    stats_logger = PrometheusStatsLogger(registry=registry)
+
+    stats_logger.counter("hits", {"cache": "hit"})
+    stats_logger.counter("hits", {"cache": "hit"}, count=3)
+
+    assert registry.get_sample_value("superset_hits_total", {"cache": "hit"}) == 4
+
+
+def test_prometheus_incr_decr_share_a_gauge(registry: Any) -> None:
+    from superset.stats_logger import PrometheusStatsLogger
+
+    stats_logger = PrometheusStatsLogger(registry=registry)
+
+    stats_logger.incr("in_flight")
+    stats_logger.incr("in_flight")
+    stats_logger.decr("in_flight")
+
+    assert registry.get_sample_value("superset_in_flight") == 1
@@ -0,0 +1,82 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import pandas as pd
+import pytest
+
+from superset.utils.csv import df_to_escaped_csv, escape_column, escape_value
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("=10+2", "'=10+2"),
+        ("-10", "-10"),
+        ("-a|b", "'-a\\|b"),
+        ("  @SUM(1)", "'  @SUM(1)"),
+        ("normal", "normal"),
+    ],
+)
+def test_escape_value(value: str, expected: str) -> None:
+    assert escape_value(value) == expected
+
+
+def test_escape_column_mixed_values() -> None:
+    series = pd.Series(["=1+1", "ok", None, 3, "=1+1", "-5"], name="col")
+
+    escaped = escape_column(series)
+
+    assert escaped is not None
+    assert escaped.tolist() == ["'=1+1", "ok", None, 3, "'=1+1", "-5"]
+    assert escaped.name == "col"
+
+
+def test_escape_column_unhashable_values() -> None:
+    """
+    Test that columns holding lists or dicts, e.g. JSON or ARRAY columns, are
+    escaped cell by cell.
+    """
+    series = pd.Series([[1, 2], {"a": "=1"}, "=1+1", None])
+
+    escaped = escape_column(series)
+
+    assert escaped is not None
+    assert escaped.tolist() == [[1, 2], {"a": "=1"}, "'=1+1", None]
+
+
+def test_escape_column_nothing_to_escape() -> None:
+    assert escape_column(pd.Series(["a", "b", None])) is None
+    assert escape_column(pd.Series([1, 2, 3])) is None
+    assert escape_column(pd.Series([None, None], dtype=object)) is None
+
+
+def test_escape_column_categorical() -> None:
+    series = pd.Series(["=1", "a", "=1"], dtype="category")
+
+    escaped = escape_column(series)
+
+    assert escaped is not None
+    assert escaped.tolist() == ["'=1", "a", "'=1"]
+
+
+def test_df_to_escaped_csv() -> None:
+    df = pd.DataFrame(
+        {"=header": ["=1+1", "ok"], "number": [1, 2], "json": [[1], {"a": 1}]}
+    )
+
+    assert df_to_escaped_csv(df, index=False) == (
+        "'=header,number,json\n'=1+1,1,[1]\nok,2,{'a': 1}\n"
+    )
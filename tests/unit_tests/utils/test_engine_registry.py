@@ -0,0 +1,110 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=protected-access
+import os
+from pathlib import Path
+
+from flask import Flask
+from pytest_mock import MockFixture
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+from superset.utils.engine_registry import EngineRegistry
+
+
+def get_registry(app: Flask, **config: int) -> EngineRegistry:
+    registry = EngineRegistry()
+    app.config.update(config)
+    registry.init_app(app)
+    return registry
+
+
+def test_get_engine_reuses_engine(app: Flask, tmp_path: Path) -> None:
+    registry = get_registry(app)
+    url = make_url(f"sqlite:///{tmp_path / 'db.sqlite'}")
+
+    engine = registry.get_engine(1, url, {})
+    assert registry.get_engine(1, url, {}) is engine
+    assert registry.get_engine(2, url, {}) is not engine
+    assert registry.get_engine(1, url, {"poolclass": NullPool}) is not engine
+
+
+def test_get_engine_evicts_least_recently_used(app: Flask, tmp_path: Path) -> None:
+    registry = get_registry(app, DATABASE_ENGINE_REGISTRY_MAX_ENGINES=2)
+    url = make_url(f"sqlite:///{tmp_path / 'db.sqlite'}")
+
+    first = registry.get_engine(1, url, {})
+    registry.get_engine(2, url, {})
+    registry.get_engine(1, url, {})
+    registry.get_engine(3, url, {})
+
+    assert [status["database_id"] for status in registry.get_pool_status()] == [1, 3]
+    assert registry.get_engine(1, url, {}) is first
+
+
+def test_get_engine_evicts_idle_engines(
+    app: Flask, mocker: MockFixture, tmp_path: Path
+) -> None:
+    time = mocker.patch("superset.utils.engine_registry.time")
+    time.monotonic.return_value = 1000
+    registry = get_registry(app, DATABASE_ENGINE_REGISTRY_IDLE_TIMEOUT=60)
+    url = make_url(f"sqlite:///{tmp_path / 'db.sqlite'}")
+
+    idle = registry.get_engine(1, url, {})
+    time.monotonic.return_value = 1050
+    registry.get_engine(2, url, {})
+    time.monotonic.return_value = 1070
+    registry.get_engine(3, url, {})
+
+    assert [status["database_id"] for status in registry.get_pool_status()] == [2, 3]
+    assert registry.get_engine(1, url, {}) is not idle
+
+
+def test_dispose_database(app: Flask, tmp_path: Path) -> None:
+    registry = get_registry(app)
+    url = make_url(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    registry.get_engine(1, url, {})
+    registry.get_engine(2, url, {})
+
+    registry.dispose(1)
+
+    assert [status["database_id"] for status in registry.get_pool_status()] == [2]
+
+
+def test_after_fork_keeps_parent_engines(
+    app: Flask, mocker: MockFixture, tmp_path: Path
+) -> None:
+    registry = get_registry(app)
+    url = make_url(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    engine = registry.get_engine(1, url, {"poolclass": QueuePool})
+    with engine.connect() as connection:
+        parent_connection = connection.connection.connection
+
+    registry._after_fork()
+
+    # the child starts with an empty registry, but keeps the engines of the parent
+    # referenced so that their connections aren't closed
+    assert registry.get_pool_status() == []
+    assert registry._inherited_engines == [engine]
+    assert registry.get_engine(1, url, {"poolclass": QueuePool}) is not engine
+
+    # a connection opened by the parent is never checked out by the child
+    mocker.patch(
+        "superset.utils.engine_registry.os.getpid", return_value=os.getpid() + 1
+    )
+    with engine.connect() as connection:
+        assert connection.connection.connection is not parent_connection
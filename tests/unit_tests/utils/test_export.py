@@ -0,0 +1,69 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from decimal import Decimal
+from io import BytesIO
+from typing import Any, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from superset.utils.export import iter_csv, iter_df_chunks, iter_export
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16"])
+def test_iter_csv_encodes_chunks_as_a_single_file(encoding: str) -> None:
+    """
+    Test that encodings with a byte order mark only write it at the start of the
+    file, and not at the start of each chunk.
+    """
+    df = pd.DataFrame({"name": ["é", "ü", "ø", "å", "ß"], "value": range(5)})
+
+    data = b"".join(iter_csv(iter_df_chunks(df, chunk_size=2), encoding=encoding))
+
+    assert data == df.to_csv(index=False).encode(encoding)
+
+
+@pytest.mark.parametrize(
+    "chunks,expected",
+    [
+        ([[None, None], ["a", "b"]], [None, None, "a", "b"]),
+        (
+            [[Decimal("1.5")], [Decimal("1234.25")]],
+            [Decimal("1.5"), Decimal("1234.25")],
+        ),
+        ([[1, 2], [1.5]], [1.0, 2.0, 1.5]),
+    ],
+)
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_iter_export_unifies_chunk_types(
+    export_format: str, chunks: List[List[Any]], expected: List[Any]
+) -> None:
+    """
+    Test that chunks whose types were inferred differently are exported with a
+    common type.
+    """
+    dfs = [pd.DataFrame({"value": chunk}) for chunk in chunks]
+
+    data = BytesIO(b"".join(iter_export(dfs, export_format)))
+
+    if export_format == "parquet":
+        table = pq.read_table(data)
+    else:
+        table = pa.ipc.open_stream(data).read_all()
+    assert table.column("value").to_pylist() == expected
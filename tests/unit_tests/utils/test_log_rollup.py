@@ -0,0 +1,127 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Tuple
+
+import pytest
+from pytest_mock import MockFixture
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture
+def session(mocker: MockFixture) -> Iterator[Session]:
+    """
+    A session with the tables of the logs and their rollup, counting two logs per
+    transaction.
+    """
+    from superset import db
+    from superset.models.core import Log, LogRollup, LogRollupCheckpoint
+    from superset.utils import log_rollup
+
+    mocker.patch.dict(
+        log_rollup.config, {"LOG_ROLLUP_BATCH_SIZE": 2, "LOG_ROLLUP_LAG": 60}
+    )
+    tables = [model.__table__ for model in (Log, LogRollup, LogRollupCheckpoint)]
+    engine = db.session.get_bind()
+    Log.metadata.create_all(engine, tables=tables)
+
+    yield db.session
+
+    db.session.rollback()
+    Log.metadata.drop_all(engine, tables=tables)
+
+
+def add_logs(session: Session, *dashboard_ids: int, dttm: datetime) -> None:
+    from superset.models.core import Log
+
+    session.add_all(
+        [
+            Log(action="log", user_id=1, dashboard_id=dashboard_id, dttm=dttm)
+            for dashboard_id in dashboard_ids
+        ]
+    )
+    session.commit()
+
+
+def get_counts(session: Session, granularity: str) -> Dict[Tuple[datetime, int], int]:
+    from superset.models.core import LogRollup
+
+    return {
+        (row.period_start, row.dashboard_id): row.count
+        for row in session.query(LogRollup).filter(LogRollup.granularity == granularity)
+    }
+
+
+def test_rollup_logs_checkpoint(session: Session) -> None:
+    """
+    Test that each run counts the logs past the checkpoint once, in batches, adding
+    to the counters of earlier runs, and leaves the logs of the last seconds for the
+    next run.
+    """
+    from superset.models.core import Log
+    from superset.utils.log_rollup import get_checkpoint, rollup_logs
+
+    day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    past = day - timedelta(days=1) + timedelta(hours=3, minutes=20)
+    add_logs(session, 1, 1, 2, dttm=past)
+    add_logs(session, 1, dttm=datetime.utcnow())
+
+    assert get_checkpoint(session) == 0
+    assert rollup_logs(session) == 3
+    last_log_id = session.query(Log.id).filter(Log.dttm == past).all()[-1].id
+    assert get_checkpoint(session) == last_log_id
+    assert get_counts(session, "hour") == {
+        (past.replace(minute=0), 1): 2,
+        (past.replace(minute=0), 2): 1,
+    }
+    assert get_counts(session, "day") == {
+        (day - timedelta(days=1), 1): 2,
+        (day - timedelta(days=1), 2): 1,
+    }
+
+    # nothing new to count
+    assert rollup_logs(session) == 0
+    assert get_checkpoint(session) == last_log_id
+
+    # the recent log is counted along with the logs past it once older than the lag
+    session.query(Log).filter(Log.dttm > past).update(
+        {"dttm": past + timedelta(minutes=10)}, synchronize_session=False
+    )
+    add_logs(session, 3, dttm=past + timedelta(minutes=20))
+    assert rollup_logs(session) == 2
+    assert get_counts(session, "hour") == {
+        (past.replace(minute=0), 1): 3,
+        (past.replace(minute=0), 2): 1,
+        (past.replace(minute=0), 3): 1,
+    }
+
+
+def test_get_top_dashboard_ids(session: Session) -> None:
+    """
+    Test that the activity on dashboards adds the counters of the rollup to the logs
+    past the checkpoint.
+    """
+    from superset.utils.log_rollup import get_top_dashboard_ids, rollup_logs
+
+    past = datetime.utcnow() - timedelta(hours=2)
+    add_logs(session, 1, 1, 2, dttm=past)
+    rollup_logs(session)
+    add_logs(session, 2, 2, 3, dttm=past)
+
+    assert get_top_dashboard_ids(session, None, 2) == [2, 1]
+    assert get_top_dashboard_ids(session, past - timedelta(hours=1), 3) == [2, 1, 3]